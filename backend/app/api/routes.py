@@ -1,7 +1,7 @@
 """API routes for Kevin AI."""
 
 from typing import Any, Dict, List, Optional
-from fastapi import APIRouter, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, HTTPException, Response, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
 
 from app.services.llm import LLMService
@@ -375,39 +375,39 @@ async def mcp_marketplace_list(
     category: Optional[str] = None,
     page: int = 1,
     per_page: int = 20,
-) -> Dict[str, Any]:
+) -> Response:
     """List all MCP servers in the marketplace."""
-    result = await agent_service.mcp_tool.execute(
+    content = await agent_service.mcp_tool.execute_json(
         command="marketplace_list",
         category=category,
         page=page,
         per_page=per_page,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/mcp/marketplace/search")
-async def mcp_marketplace_search(query: str) -> Dict[str, Any]:
+async def mcp_marketplace_search(query: str) -> Response:
     """Search the MCP marketplace."""
-    result = await agent_service.mcp_tool.execute(
+    content = await agent_service.mcp_tool.execute_json(
         command="marketplace_search",
         query=query,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/mcp/marketplace/categories")
-async def mcp_marketplace_categories() -> Dict[str, Any]:
+async def mcp_marketplace_categories() -> Response:
     """List all MCP marketplace categories."""
-    result = await agent_service.mcp_tool.execute(command="marketplace_categories")
-    return result
+    content = await agent_service.mcp_tool.execute_json(command="marketplace_categories")
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/mcp/marketplace/featured")
-async def mcp_marketplace_featured() -> Dict[str, Any]:
+async def mcp_marketplace_featured() -> Response:
     """Get featured MCP servers."""
-    result = await agent_service.mcp_tool.execute(command="marketplace_featured")
-    return result
+    content = await agent_service.mcp_tool.execute_json(command="marketplace_featured")
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/mcp/marketplace/{server_id}")
@@ -487,22 +487,19 @@ async def mcp_get_server_config(server_id: str) -> Dict[str, Any]:
 
 
 @router.get("/mcp/servers")
-async def mcp_list_installed() -> Dict[str, Any]:
+async def mcp_list_installed() -> Response:
     """List all installed MCP servers."""
-    result = await agent_service.mcp_tool.execute(command="list_installed")
-    return result
+    content = await agent_service.mcp_tool.execute_json(command="list_installed")
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/mcp/servers/{server_id}/tools")
-async def mcp_list_tools(server_id: str) -> Dict[str, Any]:
+async def mcp_list_tools(server_id: str) -> Response:
     """List tools available on an MCP server."""
-    result = await agent_service.mcp_tool.execute(
-        command="list_tools",
-        server=server_id,
-    )
-    if "error" in result:
-        raise HTTPException(status_code=404, detail=result["error"])
-    return result
+    content = agent_service.mcp_tool.list_tools_raw(server_id)
+    if content is None:
+        raise HTTPException(status_code=404, detail=f"Server not found: {server_id}")
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/mcp/servers/{server_id}/connect")
@@ -561,65 +558,65 @@ class KnowledgeSuggestRequest(BaseModel):
 async def list_knowledge(
     page: int = 1,
     per_page: int = 20,
-) -> Dict[str, Any]:
+) -> Response:
     """List all knowledge entries."""
-    result = await agent_service.knowledge_tool.execute(
+    content = await agent_service.knowledge_tool.execute_json(
         command="list",
         page=page,
         per_page=per_page,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/knowledge/search")
-async def search_knowledge(query: str) -> Dict[str, Any]:
+async def search_knowledge(query: str) -> Response:
     """Search knowledge entries."""
-    result = await agent_service.knowledge_tool.execute(
+    content = await agent_service.knowledge_tool.execute_json(
         command="search",
         query=query,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/knowledge/tags")
-async def get_knowledge_tags() -> Dict[str, Any]:
+async def get_knowledge_tags() -> Response:
     """Get all available knowledge tags."""
-    result = await agent_service.knowledge_tool.execute(command="get_tags")
-    return result
+    content = await agent_service.knowledge_tool.execute_json(command="get_tags")
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/knowledge/relevant")
 async def get_relevant_knowledge(
     context: str,
     repo: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> Response:
     """Get knowledge relevant to a context."""
-    result = await agent_service.knowledge_tool.execute(
+    content = await agent_service.knowledge_tool.execute_json(
         command="get_relevant",
         context=context,
         repo=repo,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/knowledge/repo/{repo}")
-async def get_knowledge_by_repo(repo: str) -> Dict[str, Any]:
+async def get_knowledge_by_repo(repo: str) -> Response:
     """Get knowledge for a specific repository."""
-    result = await agent_service.knowledge_tool.execute(
+    content = await agent_service.knowledge_tool.execute_json(
         command="get_by_repo",
         repo=repo,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/knowledge/tag/{tag}")
-async def get_knowledge_by_tag(tag: str) -> Dict[str, Any]:
+async def get_knowledge_by_tag(tag: str) -> Response:
     """Get knowledge by tag."""
-    result = await agent_service.knowledge_tool.execute(
+    content = await agent_service.knowledge_tool.execute_json(
         command="get_by_tag",
         tag=tag,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/knowledge/{entry_id}")
@@ -689,13 +686,13 @@ async def delete_knowledge(entry_id: str) -> Dict[str, Any]:
 @router.get("/knowledge/suggestions")
 async def list_knowledge_suggestions(
     status: Optional[str] = None,
-) -> Dict[str, Any]:
+) -> Response:
     """List all knowledge suggestions."""
-    result = await agent_service.knowledge_tool.execute(
+    content = await agent_service.knowledge_tool.execute_json(
         command="list_suggestions",
         status=status,
     )
-    return result
+    return Response(content=content, media_type="application/json")
 
 
 @router.post("/knowledge/suggestions")
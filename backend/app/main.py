@@ -1,5 +1,6 @@
 """Kevin AI - Virtual AI Software Engineer Backend."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncGenerator
 
@@ -15,6 +16,9 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """Application lifespan handler."""
     # Startup
     print("Kevin AI Backend starting...")
+    # uvicorn picks uvloop when it is installed (uvicorn[standard] ships it);
+    # report the loop so a fallback to the default asyncio loop is visible
+    print(f"Event loop: {type(asyncio.get_running_loop()).__module__}")
     yield
     # Shutdown
     print("Kevin AI Backend shutting down...")
@@ -60,4 +64,6 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        # uvloop where available, the default asyncio loop elsewhere (e.g. Windows)
+        loop="auto",
     )
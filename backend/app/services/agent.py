@@ -331,3 +331,7 @@ class AgentService:
         """Cleanup resources."""
         await self.browser_tool.close()
         await self.web_tool.close()
+        await self.github_api_tool.close()
+        await self.lsp_tool.close()
+        await self.mcp_tool.close()
+        await self.search_tool.close()
@@ -11,6 +11,9 @@ class BaseTool(ABC):
     name: str = "base_tool"
     description: str = "Base tool"
 
+    # Lets subclasses that declare __slots__ drop the per-instance __dict__
+    __slots__ = ()
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> Dict[str, Any]:
         """Execute the tool with given parameters."""
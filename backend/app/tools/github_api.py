@@ -1,12 +1,344 @@
 """GitHub API tool for PR management and CI checks."""
 
+import asyncio
 import os
-from typing import Any, Dict, List, Optional
+import re
+import time
+from collections import OrderedDict
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from operator import itemgetter
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Tuple
 
 import httpx
+import msgspec
+import orjson
 
 from app.tools.base import BaseTool
 
+# How long a PR's head SHA is trusted for speculative check-run fetches
+HEAD_SHA_TTL_SECONDS = 60.0
+
+# Maximum number of GET responses kept for ETag revalidation
+ETAG_CACHE_MAX_ENTRIES = 512
+
+# Retry policy for rate limits (429/403) and transient server errors
+MAX_REQUEST_ATTEMPTS = 5
+MAX_RETRY_DELAY_SECONDS = 60.0
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "PUT", "DELETE", "OPTIONS"})
+
+# Upper bound on concurrent page requests when auto-paginating
+MAX_CONCURRENT_PAGE_FETCHES = 10
+
+_LAST_PAGE_RE = re.compile(r'<[^>]*[?&]page=(\d+)[^>]*>;\s*rel="last"')
+
+# Request bodies are encoded with orjson and sent as raw content
+JSON_CONTENT_HEADERS = {"Content-Type": "application/json"}
+
+# Head SHA plus every check run on the head commit, in one request
+PR_CHECKS_QUERY = """
+query($owner: String!, $name: String!, $number: Int!) {
+  repository(owner: $owner, name: $name) {
+    pullRequest(number: $number) {
+      headRefOid
+      commits(last: 1) {
+        nodes {
+          commit {
+            checkSuites(first: 20) {
+              nodes {
+                checkRuns(first: 100) {
+                  nodes {
+                    databaseId
+                    name
+                    status
+                    conclusion
+                    startedAt
+                    completedAt
+                    permalink
+                  }
+                }
+              }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Size caps for large text downloads
+MAX_DIFF_BYTES = 100_000
+MAX_LOG_BYTES = 50_000
+
+
+# Typed views of the GitHub responses we read. Decoding straight into these
+# skips the dozens of fields we never look at.
+
+
+class _User(msgspec.Struct):
+    login: str
+
+
+class _Label(msgspec.Struct):
+    name: str
+
+
+class _GitRef(msgspec.Struct):
+    ref: str
+    sha: str
+
+
+class PullRequest(msgspec.Struct):
+    number: int
+    title: str
+    state: str
+    html_url: str
+    created_at: str
+    user: _User
+    head: _GitRef
+    base: _GitRef
+    body: Optional[str] = None
+    updated_at: Optional[str] = None
+    merged: bool = False
+    mergeable: Optional[bool] = None
+    additions: int = 0
+    deletions: int = 0
+    changed_files: int = 0
+
+
+class Issue(msgspec.Struct):
+    number: int
+    title: str
+    state: str
+    html_url: str
+    created_at: str
+    user: _User
+    labels: List[_Label] = msgspec.field(default_factory=list)
+    pull_request: Optional[Dict[str, Any]] = None
+
+
+class Repository(msgspec.Struct):
+    name: str
+    full_name: str
+    html_url: str
+    private: bool
+    description: Optional[str] = None
+    default_branch: Optional[str] = None
+    clone_url: Optional[str] = None
+    ssh_url: Optional[str] = None
+    language: Optional[str] = None
+    stargazers_count: int = 0
+    forks_count: int = 0
+    open_issues_count: int = 0
+
+
+class CheckRun(msgspec.Struct):
+    id: int
+    name: str
+    status: str
+    conclusion: Optional[str] = None
+    started_at: Optional[str] = None
+    completed_at: Optional[str] = None
+    html_url: Optional[str] = None
+
+
+class CheckRunsResponse(msgspec.Struct):
+    check_runs: List[CheckRun] = msgspec.field(default_factory=list)
+
+
+PULL_REQUEST_DECODER = msgspec.json.Decoder(PullRequest)
+PULL_REQUEST_LIST_DECODER = msgspec.json.Decoder(List[PullRequest])
+ISSUE_DECODER = msgspec.json.Decoder(Issue)
+ISSUE_LIST_DECODER = msgspec.json.Decoder(List[Issue])
+REPOSITORY_DECODER = msgspec.json.Decoder(Repository)
+REPOSITORY_LIST_DECODER = msgspec.json.Decoder(List[Repository])
+CHECK_RUNS_DECODER = msgspec.json.Decoder(CheckRunsResponse)
+
+
+# Projections from decoded responses to the dicts each operation returns
+
+
+def _project_created_pr(pr: PullRequest) -> Dict[str, Any]:
+    return {
+        "pr_number": pr.number,
+        "url": pr.html_url,
+        "state": pr.state,
+        "title": pr.title,
+        "created_at": pr.created_at,
+    }
+
+
+def _project_updated_pr(pr: PullRequest) -> Dict[str, Any]:
+    return {
+        "pr_number": pr.number,
+        "url": pr.html_url,
+        "state": pr.state,
+        "title": pr.title,
+    }
+
+
+def _project_pr_details(pr: PullRequest) -> Dict[str, Any]:
+    return {
+        "pr_number": pr.number,
+        "title": pr.title,
+        "body": pr.body,
+        "state": pr.state,
+        "url": pr.html_url,
+        "head_branch": pr.head.ref,
+        "base_branch": pr.base.ref,
+        "author": pr.user.login,
+        "created_at": pr.created_at,
+        "updated_at": pr.updated_at,
+        "merged": pr.merged,
+        "mergeable": pr.mergeable,
+        "additions": pr.additions,
+        "deletions": pr.deletions,
+        "changed_files": pr.changed_files,
+    }
+
+
+def _project_pr_list(prs: List[PullRequest]) -> Dict[str, Any]:
+    pull_requests = [
+        {
+            "number": pr.number,
+            "title": pr.title,
+            "state": pr.state,
+            "author": pr.user.login,
+            "url": pr.html_url,
+            "created_at": pr.created_at,
+            "head_branch": pr.head.ref,
+            "base_branch": pr.base.ref,
+        }
+        for pr in prs
+    ]
+    return {"pull_requests": pull_requests, "count": len(pull_requests)}
+
+
+def _project_merge(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "merged": data.get("merged", True),
+        "message": data.get("message", "PR merged successfully"),
+        "sha": data.get("sha"),
+    }
+
+
+def _project_created_comment(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "comment_id": data["id"],
+        "url": data["html_url"],
+        "created_at": data["created_at"],
+    }
+
+
+def _project_repo_list(repos: List[Repository]) -> Dict[str, Any]:
+    repositories = [
+        {
+            "name": repo.name,
+            "full_name": repo.full_name,
+            "description": repo.description,
+            "url": repo.html_url,
+            "private": repo.private,
+            "default_branch": repo.default_branch,
+        }
+        for repo in repos
+    ]
+    return {"repositories": repositories, "count": len(repositories)}
+
+
+def _project_repo_details(repo: Repository) -> Dict[str, Any]:
+    return {
+        "name": repo.name,
+        "full_name": repo.full_name,
+        "description": repo.description,
+        "url": repo.html_url,
+        "clone_url": repo.clone_url,
+        "ssh_url": repo.ssh_url,
+        "private": repo.private,
+        "default_branch": repo.default_branch,
+        "language": repo.language,
+        "stars": repo.stargazers_count,
+        "forks": repo.forks_count,
+        "open_issues": repo.open_issues_count,
+    }
+
+
+def _project_created_issue(issue: Issue) -> Dict[str, Any]:
+    return {
+        "issue_number": issue.number,
+        "url": issue.html_url,
+        "title": issue.title,
+        "state": issue.state,
+    }
+
+
+def _project_issue_list(issues: List[Issue]) -> Dict[str, Any]:
+    projected = [
+        {
+            "number": issue.number,
+            "title": issue.title,
+            "state": issue.state,
+            "author": issue.user.login,
+            "url": issue.html_url,
+            "created_at": issue.created_at,
+            "labels": [label.name for label in issue.labels],
+        }
+        for issue in issues
+        if issue.pull_request is None  # Exclude PRs
+    ]
+    return {"issues": projected, "count": len(projected)}
+
+
+def _parse_retry_after(value: str) -> Optional[float]:
+    """Get the seconds to wait from a Retry-After value (delay-seconds or HTTP-date)."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return retry_at.timestamp() - time.time()
+
+
+def _retry_delay(response: httpx.Response, method: str, attempt: int) -> Optional[float]:
+    """Get how long to wait before retrying a response, or None to give up."""
+    status_code = response.status_code
+    headers = response.headers
+    rate_limited = status_code == 429 or (
+        status_code == 403
+        and (headers.get("retry-after") or headers.get("x-ratelimit-remaining") == "0")
+    )
+
+    if rate_limited:
+        retry_after = headers.get("retry-after")
+        delay = _parse_retry_after(retry_after) if retry_after else None
+        if delay is None:
+            if headers.get("x-ratelimit-reset"):
+                delay = float(headers["x-ratelimit-reset"]) - time.time()
+            else:
+                delay = 2.0**attempt
+        # Waiting longer than the cap would just stall the agent
+        return max(delay, 0.0) if delay <= MAX_RETRY_DELAY_SECONDS else None
+
+    if status_code >= 500 and method in IDEMPOTENT_METHODS:
+        return 2.0**attempt
+
+    return None
+
+
+def _parse_last_page(link_header: Optional[str]) -> int:
+    """Get the last page number from a GitHub ``Link`` header (1 if absent)."""
+    if link_header:
+        match = _LAST_PAGE_RE.search(link_header)
+        if match:
+            return int(match.group(1))
+    return 1
+
 
 class GitHubAPITool(BaseTool):
     """Tool for GitHub API operations like PR management and CI checks."""
@@ -14,23 +346,39 @@ class GitHubAPITool(BaseTool):
     name = "github_api"
     description = "Interact with GitHub API for PR management, CI checks, and comments"
 
+    __slots__ = (
+        "base_url",
+        "token",
+        "_headers",
+        "_client",
+        "_etag_cache",
+        "_inflight",
+        "_sha_cache",
+        "_operations",
+    )
+
     def __init__(self):
         self.base_url = "https://api.github.com"
         self.token = os.environ.get("GITHUB_TOKEN")
-
-    def _get_headers(self) -> Dict[str, str]:
-        """Get headers for GitHub API requests."""
         headers = {
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28",
         }
         if self.token:
             headers["Authorization"] = f"Bearer {self.token}"
-        return headers
-
-    async def execute(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
-        """Execute a GitHub API operation."""
-        operations = {
+        # The token never changes after init, so build the headers once
+        self._headers: Mapping[str, str] = MappingProxyType(headers)
+        self._client: Optional[httpx.AsyncClient] = None
+        # (url, params) -> (etag, parsed body, last page), least recently used first
+        self._etag_cache: OrderedDict[Tuple[str, Tuple[Any, ...]], Tuple[str, Any, int]] = (
+            OrderedDict()
+        )
+        # Same keys as _etag_cache, for GETs currently on the wire
+        self._inflight: Dict[Tuple[str, Tuple[Any, ...]], asyncio.Future[Tuple[int, Any, int]]] = {}
+        # (repo, pull_number) -> (head_sha, expires_at)
+        self._sha_cache: Dict[Tuple[str, int], Tuple[str, float]] = {}
+        # Bound handlers, built once rather than on every execute() call
+        self._operations: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
             "create_pr": self.create_pr,
             "view_pr": self.view_pr,
             "update_pr": self.update_pr,
@@ -38,6 +386,7 @@ class GitHubAPITool(BaseTool):
             "list_prs": self.list_prs,
             "pr_checks": self.get_pr_checks,
             "ci_job_logs": self.get_ci_job_logs,
+            "ci_job_logs_batch": self.get_ci_job_logs_batch,
             "comment_on_pr": self.comment_on_pr,
             "list_pr_comments": self.list_pr_comments,
             "get_pr_diff": self.get_pr_diff,
@@ -47,7 +396,231 @@ class GitHubAPITool(BaseTool):
             "list_issues": self.list_issues,
         }
 
-        if operation not in operations:
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use.
+
+        Reusing one pooled client keeps connections to api.github.com alive
+        across operations instead of paying a TCP+TLS handshake per call.
+        HTTP/2 lets concurrent requests share a single connection.
+        """
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self._headers,
+                http2=True,
+                limits=httpx.Limits(max_keepalive_connections=20, max_connections=40),
+                timeout=httpx.Timeout(30.0),
+                event_hooks={"request": [self._strip_foreign_auth]},
+            )
+        return self._client
+
+    async def _strip_foreign_auth(self, request: httpx.Request) -> None:
+        """Keep the token off redirects to other hosts, e.g. CI log storage."""
+        if request.url.host != self._client.base_url.host:
+            request.headers.pop("Authorization", None)
+
+    async def close(self) -> None:
+        """Close the shared HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, waiting out rate limits and retrying server errors.
+
+        Rate-limited requests were never processed, so they are retried for
+        every method; 5xx responses are only retried for idempotent methods
+        so a POST that may have succeeded is not sent twice.
+        """
+        client = self._get_client()
+        for attempt in range(MAX_REQUEST_ATTEMPTS):
+            response = await client.request(method, url, **kwargs)
+            delay = _retry_delay(response, method, attempt)
+            if delay is None or attempt == MAX_REQUEST_ATTEMPTS - 1:
+                break
+            await asyncio.sleep(delay)
+        return response
+
+    async def _call(
+        self,
+        method: str,
+        url: str,
+        action: str,
+        project: Callable[[Any], Dict[str, Any]],
+        *,
+        json_body: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        ok: Tuple[int, ...] = (200,),
+        max_pages: int = 1,
+        decoder: Optional[msgspec.json.Decoder] = None,
+    ) -> Dict[str, Any]:
+        """Run a single-request operation and shape its result.
+
+        GETs go through the ETag cache (and pagination); other methods send
+        ``json_body``. An ``ok`` status returns ``project(body)`` merged into
+        a success dict, anything else an error naming ``action``.
+        """
+        try:
+            if method == "GET":
+                status_code, data = await self._get_all_pages(
+                    url, params or {}, max_pages, decoder
+                )
+            else:
+                response = await self._request(
+                    method,
+                    url,
+                    params=params,
+                    content=orjson.dumps(json_body),
+                    headers=JSON_CONTENT_HEADERS,
+                )
+                status_code = response.status_code
+                if status_code in ok and decoder is not None:
+                    data = decoder.decode(response.content)
+                else:
+                    data = orjson.loads(response.content)
+
+            if status_code in ok:
+                return {"success": True, **project(data)}
+            return {
+                "error": f"Failed to {action}: {status_code}",
+                "details": data,
+            }
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def _cached_get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        decoder: Optional[msgspec.json.Decoder] = None,
+    ) -> Tuple[int, Any]:
+        """GET a resource, revalidating any cached copy with its ETag.
+
+        GitHub does not count 304 responses against the rate limit, so a
+        repeated read of an unchanged resource costs only a round-trip.
+        Successful bodies are decoded with ``decoder`` when given, else as
+        plain JSON. Returns the status code and the parsed body.
+        """
+        status_code, data, _ = await self._cached_get_page(url, params, decoder)
+        return status_code, data
+
+    async def _cached_get_page(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        decoder: Optional[msgspec.json.Decoder] = None,
+    ) -> Tuple[int, Any, int]:
+        """Like ``_cached_get`` but also return the last page number from ``Link``.
+
+        Concurrent calls for the same URL and params share one request.
+        """
+        key = (url, tuple(sorted(params.items())) if params else ())
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_cached(key, url, params, decoder))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    async def _fetch_cached(
+        self,
+        key: Tuple[str, Tuple[Any, ...]],
+        url: str,
+        params: Optional[Dict[str, Any]],
+        decoder: Optional[msgspec.json.Decoder],
+    ) -> Tuple[int, Any, int]:
+        """Send the (conditional) GET behind ``_cached_get_page``."""
+        cached = self._etag_cache.get(key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = await self._request("GET", url, params=params, headers=headers)
+
+        if response.status_code == 304 and cached:
+            self._etag_cache.move_to_end(key)
+            return 200, cached[1], cached[2]
+
+        if response.status_code == 200 and decoder is not None:
+            data = decoder.decode(response.content)
+        else:
+            data = orjson.loads(response.content)
+        last_page = _parse_last_page(response.headers.get("Link"))
+        etag = response.headers.get("ETag")
+        if response.status_code == 200 and etag:
+            self._etag_cache[key] = (etag, data, last_page)
+            self._etag_cache.move_to_end(key)
+            if len(self._etag_cache) > ETAG_CACHE_MAX_ENTRIES:
+                self._etag_cache.popitem(last=False)
+        return response.status_code, data, last_page
+
+    async def _get_all_pages(
+        self,
+        url: str,
+        params: Dict[str, Any],
+        max_pages: int = 1,
+        decoder: Optional[msgspec.json.Decoder] = None,
+    ) -> Tuple[int, Any]:
+        """GET a list endpoint, following up to ``max_pages`` pages.
+
+        The first page's ``Link`` header tells us how many pages exist, so
+        the remaining pages are fetched concurrently rather than one by one.
+        """
+        status_code, data, last_page = await self._cached_get_page(url, params, decoder)
+        if status_code != 200 or max_pages <= 1 or last_page <= 1:
+            return status_code, data
+
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PAGE_FETCHES)
+
+        async def fetch_page(page: int) -> Tuple[int, Any, int]:
+            async with semaphore:
+                return await self._cached_get_page(url, {**params, "page": page}, decoder)
+
+        pages = await asyncio.gather(
+            *(fetch_page(page) for page in range(2, min(last_page, max_pages) + 1))
+        )
+
+        items = list(data)
+        for page_status, page_data, _ in pages:
+            if page_status != 200:
+                return page_status, page_data
+            items.extend(page_data)
+        return 200, items
+
+    async def _graphql(self, query: str, variables: Dict[str, Any]) -> Tuple[int, Any]:
+        """Run a GraphQL query and return the status code and parsed body."""
+        response = await self._request(
+            "POST",
+            "/graphql",
+            content=orjson.dumps({"query": query, "variables": variables}),
+            headers=JSON_CONTENT_HEADERS,
+        )
+        return response.status_code, orjson.loads(response.content)
+
+    async def _get_bounded(
+        self, url: str, limit: int, headers: Optional[Dict[str, str]] = None, **kwargs: Any
+    ) -> Tuple[int, str]:
+        """Stream a text body, stopping once ``limit`` bytes have arrived.
+
+        Large diffs and CI logs can be many megabytes; reading only the
+        prefix we return avoids buffering the rest. Returns the status code
+        and the decoded (possibly truncated) body.
+        """
+        buf = bytearray()
+        client = self._get_client()
+        async with client.stream("GET", url, headers=headers, **kwargs) as response:
+            status_code = response.status_code
+            if status_code in (200, 206):
+                async for chunk in response.aiter_bytes(chunk_size=8192):
+                    buf += chunk
+                    if len(buf) >= limit:
+                        break
+        # Trim and decode in place rather than copying the buffer twice
+        del buf[limit:]
+        return status_code, buf.decode("utf-8", errors="replace")
+
+    async def execute(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
+        """Execute a GitHub API operation."""
+        handler = self._operations.get(operation)
+        if handler is None:
             return {"error": f"Unknown operation: {operation}"}
 
         if not self.token:
@@ -55,7 +628,7 @@ class GitHubAPITool(BaseTool):
                 "error": "GITHUB_TOKEN environment variable not set. Please set it to use GitHub API features."
             }
 
-        return await operations[operation](**kwargs)
+        return await handler(**kwargs)
 
     async def create_pr(
         self,
@@ -77,38 +650,21 @@ class GitHubAPITool(BaseTool):
             body: PR description
             draft: Whether to create as draft PR
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/repos/{repo}/pulls",
-                    headers=self._get_headers(),
-                    json={
-                        "title": title,
-                        "head": head_branch,
-                        "base": base_branch,
-                        "body": body or "",
-                        "draft": draft,
-                    },
-                    timeout=30.0,
-                )
-
-                if response.status_code == 201:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "pr_number": data["number"],
-                        "url": data["html_url"],
-                        "state": data["state"],
-                        "title": data["title"],
-                        "created_at": data["created_at"],
-                    }
-                else:
-                    return {
-                        "error": f"Failed to create PR: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "POST",
+            f"/repos/{repo}/pulls",
+            "create PR",
+            _project_created_pr,
+            json_body={
+                "title": title,
+                "head": head_branch,
+                "base": base_branch,
+                "body": body or "",
+                "draft": draft,
+            },
+            ok=(201,),
+            decoder=PULL_REQUEST_DECODER,
+        )
 
     async def view_pr(
         self,
@@ -122,41 +678,13 @@ class GitHubAPITool(BaseTool):
             repo: Repository in owner/repo format
             pull_number: PR number
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/repos/{repo}/pulls/{pull_number}",
-                    headers=self._get_headers(),
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "pr_number": data["number"],
-                        "title": data["title"],
-                        "body": data["body"],
-                        "state": data["state"],
-                        "url": data["html_url"],
-                        "head_branch": data["head"]["ref"],
-                        "base_branch": data["base"]["ref"],
-                        "author": data["user"]["login"],
-                        "created_at": data["created_at"],
-                        "updated_at": data["updated_at"],
-                        "merged": data.get("merged", False),
-                        "mergeable": data.get("mergeable"),
-                        "additions": data.get("additions", 0),
-                        "deletions": data.get("deletions", 0),
-                        "changed_files": data.get("changed_files", 0),
-                    }
-                else:
-                    return {
-                        "error": f"Failed to get PR: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "GET",
+            f"/repos/{repo}/pulls/{pull_number}",
+            "get PR",
+            _project_pr_details,
+            decoder=PULL_REQUEST_DECODER,
+        )
 
     async def update_pr(
         self,
@@ -176,42 +704,25 @@ class GitHubAPITool(BaseTool):
             body: New description (optional)
             state: New state - 'open' or 'closed' (optional)
         """
-        try:
-            update_data: Dict[str, Any] = {}
-            if title:
-                update_data["title"] = title
-            if body:
-                update_data["body"] = body
-            if state:
-                update_data["state"] = state
-
-            if not update_data:
-                return {"error": "No update parameters provided"}
-
-            async with httpx.AsyncClient() as client:
-                response = await client.patch(
-                    f"{self.base_url}/repos/{repo}/pulls/{pull_number}",
-                    headers=self._get_headers(),
-                    json=update_data,
-                    timeout=30.0,
-                )
+        update_data: Dict[str, Any] = {}
+        if title:
+            update_data["title"] = title
+        if body:
+            update_data["body"] = body
+        if state:
+            update_data["state"] = state
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "pr_number": data["number"],
-                        "url": data["html_url"],
-                        "state": data["state"],
-                        "title": data["title"],
-                    }
-                else:
-                    return {
-                        "error": f"Failed to update PR: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        if not update_data:
+            return {"error": "No update parameters provided"}
+
+        return await self._call(
+            "PATCH",
+            f"/repos/{repo}/pulls/{pull_number}",
+            "update PR",
+            _project_updated_pr,
+            json_body=update_data,
+            decoder=PULL_REQUEST_DECODER,
+        )
 
     async def merge_pr(
         self,
@@ -231,42 +742,26 @@ class GitHubAPITool(BaseTool):
             commit_message: Message for merge commit
             merge_method: 'merge', 'squash', or 'rebase'
         """
-        try:
-            merge_data: Dict[str, Any] = {"merge_method": merge_method}
-            if commit_title:
-                merge_data["commit_title"] = commit_title
-            if commit_message:
-                merge_data["commit_message"] = commit_message
-
-            async with httpx.AsyncClient() as client:
-                response = await client.put(
-                    f"{self.base_url}/repos/{repo}/pulls/{pull_number}/merge",
-                    headers=self._get_headers(),
-                    json=merge_data,
-                    timeout=30.0,
-                )
+        merge_data: Dict[str, Any] = {"merge_method": merge_method}
+        if commit_title:
+            merge_data["commit_title"] = commit_title
+        if commit_message:
+            merge_data["commit_message"] = commit_message
 
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "merged": data.get("merged", True),
-                        "message": data.get("message", "PR merged successfully"),
-                        "sha": data.get("sha"),
-                    }
-                else:
-                    return {
-                        "error": f"Failed to merge PR: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "PUT",
+            f"/repos/{repo}/pulls/{pull_number}/merge",
+            "merge PR",
+            _project_merge,
+            json_body=merge_data,
+        )
 
     async def list_prs(
         self,
         repo: str,
         state: str = "open",
         per_page: int = 30,
+        max_pages: int = 1,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """List pull requests for a repository.
@@ -275,43 +770,17 @@ class GitHubAPITool(BaseTool):
             repo: Repository in owner/repo format
             state: 'open', 'closed', or 'all'
             per_page: Number of results per page (max 100)
+            max_pages: Maximum number of pages to fetch
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/repos/{repo}/pulls",
-                    headers=self._get_headers(),
-                    params={"state": state, "per_page": min(per_page, 100)},
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    prs = [
-                        {
-                            "number": pr["number"],
-                            "title": pr["title"],
-                            "state": pr["state"],
-                            "author": pr["user"]["login"],
-                            "url": pr["html_url"],
-                            "created_at": pr["created_at"],
-                            "head_branch": pr["head"]["ref"],
-                            "base_branch": pr["base"]["ref"],
-                        }
-                        for pr in data
-                    ]
-                    return {
-                        "success": True,
-                        "pull_requests": prs,
-                        "count": len(prs),
-                    }
-                else:
-                    return {
-                        "error": f"Failed to list PRs: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "GET",
+            f"/repos/{repo}/pulls",
+            "list PRs",
+            _project_pr_list,
+            params={"state": state, "per_page": min(per_page, 100)},
+            max_pages=max_pages,
+            decoder=PULL_REQUEST_LIST_DECODER,
+        )
 
     async def get_pr_checks(
         self,
@@ -326,64 +795,120 @@ class GitHubAPITool(BaseTool):
             pull_number: PR number
         """
         try:
-            async with httpx.AsyncClient() as client:
-                # First get the PR to get the head SHA
-                pr_response = await client.get(
-                    f"{self.base_url}/repos/{repo}/pulls/{pull_number}",
-                    headers=self._get_headers(),
-                    timeout=30.0,
-                )
+            # One GraphQL round-trip covers the head SHA and every check run;
+            # fall back to REST if the query is rejected
+            checks = await self._get_check_runs_graphql(repo, pull_number)
+            if checks is None:
+                checks = await self._get_check_runs_rest(repo, pull_number)
+                if "error" in checks:
+                    return checks
 
-                if pr_response.status_code != 200:
-                    return {
-                        "error": f"Failed to get PR: {pr_response.status_code}",
-                        "details": pr_response.json(),
-                    }
+            head_sha = checks["head_sha"]
+            check_runs = checks["check_runs"]
 
-                pr_data = pr_response.json()
-                head_sha = pr_data["head"]["sha"]
+            # Determine overall status
+            all_completed = all(c["status"] == "completed" for c in check_runs)
+            all_passed = all(c["conclusion"] == "success" for c in check_runs if c["conclusion"])
 
-                # Get check runs for the commit
-                checks_response = await client.get(
-                    f"{self.base_url}/repos/{repo}/commits/{head_sha}/check-runs",
-                    headers=self._get_headers(),
-                    timeout=30.0,
-                )
+            return {
+                "success": True,
+                "head_sha": head_sha,
+                "check_runs": check_runs,
+                "total_count": len(check_runs),
+                "all_completed": all_completed,
+                "all_passed": all_passed if all_completed else None,
+            }
+        except Exception as e:
+            return {"error": str(e)}
 
-                if checks_response.status_code != 200:
-                    return {
-                        "error": f"Failed to get checks: {checks_response.status_code}",
-                        "details": checks_response.json(),
-                    }
+    async def _get_check_runs_graphql(
+        self, repo: str, pull_number: int
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch a PR's head SHA and check runs with a single GraphQL query.
 
-                checks_data = checks_response.json()
-                check_runs = [
+        Returns None if the query fails so the caller can fall back to REST.
+        """
+        owner, _, name = repo.partition("/")
+        status_code, data = await self._graphql(
+            PR_CHECKS_QUERY, {"owner": owner, "name": name, "number": pull_number}
+        )
+        if status_code != 200 or data.get("errors"):
+            return None
+
+        pull_request = ((data.get("data") or {}).get("repository") or {}).get("pullRequest")
+        if not pull_request:
+            return None
+
+        check_runs: List[Dict[str, Any]] = []
+        for commit_node in pull_request["commits"]["nodes"]:
+            for suite in commit_node["commit"]["checkSuites"]["nodes"]:
+                check_runs.extend(
                     {
-                        "id": check["id"],
+                        "id": check["databaseId"],
                         "name": check["name"],
-                        "status": check["status"],
-                        "conclusion": check.get("conclusion"),
-                        "started_at": check.get("started_at"),
-                        "completed_at": check.get("completed_at"),
-                        "url": check.get("html_url"),
+                        "status": check["status"].lower(),
+                        "conclusion": (check.get("conclusion") or "").lower() or None,
+                        "started_at": check.get("startedAt"),
+                        "completed_at": check.get("completedAt"),
+                        "url": check.get("permalink"),
                     }
-                    for check in checks_data.get("check_runs", [])
-                ]
+                    for check in suite["checkRuns"]["nodes"]
+                )
 
-                # Determine overall status
-                all_completed = all(c["status"] == "completed" for c in check_runs)
-                all_passed = all(c["conclusion"] == "success" for c in check_runs if c["conclusion"])
+        return {"head_sha": pull_request["headRefOid"], "check_runs": check_runs}
 
-                return {
-                    "success": True,
-                    "head_sha": head_sha,
-                    "check_runs": check_runs,
-                    "total_count": len(check_runs),
-                    "all_completed": all_completed,
-                    "all_passed": all_passed if all_completed else None,
-                }
-        except Exception as e:
-            return {"error": str(e)}
+    async def _get_check_runs_rest(self, repo: str, pull_number: int) -> Dict[str, Any]:
+        """Fetch a PR's head SHA and check runs through the REST API."""
+        pr_url = f"/repos/{repo}/pulls/{pull_number}"
+        cache_key = (repo, pull_number)
+        cached = self._sha_cache.get(cache_key)
+        cached_sha = cached[0] if cached and cached[1] > time.monotonic() else None
+
+        checks_response: Optional[httpx.Response] = None
+        if cached_sha:
+            # Revalidate the PR while speculatively fetching checks for
+            # the head SHA we saw last time; it is usually unchanged
+            (status_code, pr_data), checks_response = await asyncio.gather(
+                self._cached_get(pr_url, decoder=PULL_REQUEST_DECODER),
+                self._request("GET", f"/repos/{repo}/commits/{cached_sha}/check-runs"),
+            )
+        else:
+            status_code, pr_data = await self._cached_get(pr_url, decoder=PULL_REQUEST_DECODER)
+
+        if status_code != 200:
+            return {
+                "error": f"Failed to get PR: {status_code}",
+                "details": pr_data,
+            }
+
+        head_sha = pr_data.head.sha
+        self._sha_cache[cache_key] = (head_sha, time.monotonic() + HEAD_SHA_TTL_SECONDS)
+
+        # Get check runs for the commit, unless the speculative fetch hit
+        if checks_response is None or head_sha != cached_sha:
+            checks_response = await self._request(
+                "GET", f"/repos/{repo}/commits/{head_sha}/check-runs"
+            )
+
+        if checks_response.status_code != 200:
+            return {
+                "error": f"Failed to get checks: {checks_response.status_code}",
+                "details": orjson.loads(checks_response.content),
+            }
+
+        check_runs = [
+            {
+                "id": check.id,
+                "name": check.name,
+                "status": check.status,
+                "conclusion": check.conclusion,
+                "started_at": check.started_at,
+                "completed_at": check.completed_at,
+                "url": check.html_url,
+            }
+            for check in CHECK_RUNS_DECODER.decode(checks_response.content).check_runs
+        ]
+        return {"head_sha": head_sha, "check_runs": check_runs}
 
     async def get_ci_job_logs(
         self,
@@ -398,56 +923,66 @@ class GitHubAPITool(BaseTool):
             job_id: The job ID from check runs
         """
         try:
-            async with httpx.AsyncClient() as client:
-                # Get job details
-                job_response = await client.get(
-                    f"{self.base_url}/repos/{repo}/actions/jobs/{job_id}",
-                    headers=self._get_headers(),
-                    timeout=30.0,
-                )
+            # Get job details
+            job_response = await self._request("GET", f"/repos/{repo}/actions/jobs/{job_id}")
 
-                if job_response.status_code != 200:
-                    return {
-                        "error": f"Failed to get job: {job_response.status_code}",
-                        "details": job_response.json(),
-                    }
-
-                job_data = job_response.json()
+            if job_response.status_code != 200:
+                return {
+                    "error": f"Failed to get job: {job_response.status_code}",
+                    "details": orjson.loads(job_response.content),
+                }
 
-                # Get job logs
-                logs_headers = self._get_headers()
-                logs_headers["Accept"] = "application/vnd.github+json"
+            job_data = orjson.loads(job_response.content)
 
-                logs_response = await client.get(
-                    f"{self.base_url}/repos/{repo}/actions/jobs/{job_id}/logs",
-                    headers=logs_headers,
-                    timeout=60.0,
-                    follow_redirects=True,
-                )
+            # Get job logs; the blob storage behind the redirect honours Range
+            _, logs = await self._get_bounded(
+                f"/repos/{repo}/actions/jobs/{job_id}/logs",
+                MAX_LOG_BYTES,
+                headers={"Range": f"bytes=0-{MAX_LOG_BYTES - 1}"},
+                timeout=60.0,
+                follow_redirects=True,
+            )
 
-                logs = ""
-                if logs_response.status_code == 200:
-                    logs = logs_response.text
-                elif logs_response.status_code == 302:
-                    # Follow redirect for logs
-                    redirect_url = logs_response.headers.get("Location")
-                    if redirect_url:
-                        redirect_response = await client.get(redirect_url, timeout=60.0)
-                        logs = redirect_response.text
-
-                return {
-                    "success": True,
-                    "job_id": job_id,
-                    "name": job_data.get("name"),
-                    "status": job_data.get("status"),
-                    "conclusion": job_data.get("conclusion"),
-                    "started_at": job_data.get("started_at"),
-                    "completed_at": job_data.get("completed_at"),
-                    "logs": logs[:50000] if logs else "No logs available",
-                }
+            return {
+                "success": True,
+                "job_id": job_id,
+                "name": job_data.get("name"),
+                "status": job_data.get("status"),
+                "conclusion": job_data.get("conclusion"),
+                "started_at": job_data.get("started_at"),
+                "completed_at": job_data.get("completed_at"),
+                "logs": logs or "No logs available",
+            }
         except Exception as e:
             return {"error": str(e)}
 
+    async def get_ci_job_logs_batch(
+        self,
+        repo: str,
+        job_ids: List[int],
+        max_concurrent: int = 8,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Get logs for several CI jobs concurrently.
+        
+        Args:
+            repo: Repository in owner/repo format
+            job_ids: Job IDs from check runs
+            max_concurrent: Maximum number of jobs fetched at once
+        """
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def fetch_logs(job_id: int) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.get_ci_job_logs(repo=repo, job_id=job_id)
+
+        results = await asyncio.gather(*(fetch_logs(job_id) for job_id in job_ids))
+        return {
+            "success": True,
+            "results": list(results),
+            "count": len(results),
+        }
+
     async def comment_on_pr(
         self,
         repo: str,
@@ -468,50 +1003,29 @@ class GitHubAPITool(BaseTool):
             line: Line number for inline comment (optional)
             commit_id: Commit SHA for inline comment (optional)
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                if path and line and commit_id:
-                    # Create a review comment (inline)
-                    response = await client.post(
-                        f"{self.base_url}/repos/{repo}/pulls/{pull_number}/comments",
-                        headers=self._get_headers(),
-                        json={
-                            "body": body,
-                            "path": path,
-                            "line": line,
-                            "commit_id": commit_id,
-                        },
-                        timeout=30.0,
-                    )
-                else:
-                    # Create an issue comment (general)
-                    response = await client.post(
-                        f"{self.base_url}/repos/{repo}/issues/{pull_number}/comments",
-                        headers=self._get_headers(),
-                        json={"body": body},
-                        timeout=30.0,
-                    )
-
-                if response.status_code == 201:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "comment_id": data["id"],
-                        "url": data["html_url"],
-                        "created_at": data["created_at"],
-                    }
-                else:
-                    return {
-                        "error": f"Failed to create comment: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        if path and line and commit_id:
+            # Create a review comment (inline)
+            url = f"/repos/{repo}/pulls/{pull_number}/comments"
+            comment_data = {"body": body, "path": path, "line": line, "commit_id": commit_id}
+        else:
+            # Create an issue comment (general)
+            url = f"/repos/{repo}/issues/{pull_number}/comments"
+            comment_data = {"body": body}
+
+        return await self._call(
+            "POST",
+            url,
+            "create comment",
+            _project_created_comment,
+            json_body=comment_data,
+            ok=(201,),
+        )
 
     async def list_pr_comments(
         self,
         repo: str,
         pull_number: int,
+        max_pages: int = 1,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """List comments on a pull request.
@@ -519,57 +1033,59 @@ class GitHubAPITool(BaseTool):
         Args:
             repo: Repository in owner/repo format
             pull_number: PR number
+            max_pages: Maximum number of pages to fetch per comment type
         """
         try:
-            async with httpx.AsyncClient() as client:
-                # Get issue comments (general comments)
-                issue_comments_response = await client.get(
-                    f"{self.base_url}/repos/{repo}/issues/{pull_number}/comments",
-                    headers=self._get_headers(),
-                    timeout=30.0,
+            # Issue comments (general) and review comments (inline) are
+            # independent, so fetch them concurrently
+            params = {"per_page": 100}
+            (issue_status, issue_comments), (review_status, review_comments) = await asyncio.gather(
+                self._get_all_pages(
+                    f"/repos/{repo}/issues/{pull_number}/comments", params, max_pages
+                ),
+                self._get_all_pages(
+                    f"/repos/{repo}/pulls/{pull_number}/comments", params, max_pages
+                ),
+            )
+
+            comments: List[Dict[str, Any]] = []
+
+            if issue_status == 200:
+                comments.extend(
+                    {
+                        "id": comment["id"],
+                        "type": "issue_comment",
+                        "author": comment["user"]["login"],
+                        "body": comment["body"],
+                        "created_at": comment["created_at"],
+                        "url": comment["html_url"],
+                    }
+                    for comment in issue_comments
                 )
 
-                # Get review comments (inline comments)
-                review_comments_response = await client.get(
-                    f"{self.base_url}/repos/{repo}/pulls/{pull_number}/comments",
-                    headers=self._get_headers(),
-                    timeout=30.0,
+            if review_status == 200:
+                comments.extend(
+                    {
+                        "id": comment["id"],
+                        "type": "review_comment",
+                        "author": comment["user"]["login"],
+                        "body": comment["body"],
+                        "path": comment.get("path"),
+                        "line": comment.get("line"),
+                        "created_at": comment["created_at"],
+                        "url": comment["html_url"],
+                    }
+                    for comment in review_comments
                 )
 
-                comments: List[Dict[str, Any]] = []
-
-                if issue_comments_response.status_code == 200:
-                    for comment in issue_comments_response.json():
-                        comments.append({
-                            "id": comment["id"],
-                            "type": "issue_comment",
-                            "author": comment["user"]["login"],
-                            "body": comment["body"],
-                            "created_at": comment["created_at"],
-                            "url": comment["html_url"],
-                        })
-
-                if review_comments_response.status_code == 200:
-                    for comment in review_comments_response.json():
-                        comments.append({
-                            "id": comment["id"],
-                            "type": "review_comment",
-                            "author": comment["user"]["login"],
-                            "body": comment["body"],
-                            "path": comment.get("path"),
-                            "line": comment.get("line"),
-                            "created_at": comment["created_at"],
-                            "url": comment["html_url"],
-                        })
-
-                # Sort by created_at
-                comments.sort(key=lambda x: x["created_at"])
+            # Sort by created_at
+            comments.sort(key=itemgetter("created_at"))
 
-                return {
-                    "success": True,
-                    "comments": comments,
-                    "count": len(comments),
-                }
+            return {
+                "success": True,
+                "comments": comments,
+                "count": len(comments),
+            }
         except Exception as e:
             return {"error": str(e)}
 
@@ -586,25 +1102,21 @@ class GitHubAPITool(BaseTool):
             pull_number: PR number
         """
         try:
-            async with httpx.AsyncClient() as client:
-                headers = self._get_headers()
-                headers["Accept"] = "application/vnd.github.diff"
-
-                response = await client.get(
-                    f"{self.base_url}/repos/{repo}/pulls/{pull_number}",
-                    headers=headers,
-                    timeout=30.0,
-                )
+            status_code, diff = await self._get_bounded(
+                f"/repos/{repo}/pulls/{pull_number}",
+                MAX_DIFF_BYTES,
+                headers={"Accept": "application/vnd.github.diff"},
+            )
 
-                if response.status_code == 200:
-                    return {
-                        "success": True,
-                        "diff": response.text[:100000],
-                    }
-                else:
-                    return {
-                        "error": f"Failed to get diff: {response.status_code}",
-                    }
+            if status_code == 200:
+                return {
+                    "success": True,
+                    "diff": diff,
+                }
+            else:
+                return {
+                    "error": f"Failed to get diff: {status_code}",
+                }
         except Exception as e:
             return {"error": str(e)}
 
@@ -613,6 +1125,7 @@ class GitHubAPITool(BaseTool):
         user: Optional[str] = None,
         org: Optional[str] = None,
         per_page: int = 30,
+        max_pages: int = 1,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """List repositories for a user or organization.
@@ -621,48 +1134,24 @@ class GitHubAPITool(BaseTool):
             user: GitHub username (optional, defaults to authenticated user)
             org: Organization name (optional)
             per_page: Number of results per page
+            max_pages: Maximum number of pages to fetch
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                if org:
-                    url = f"{self.base_url}/orgs/{org}/repos"
-                elif user:
-                    url = f"{self.base_url}/users/{user}/repos"
-                else:
-                    url = f"{self.base_url}/user/repos"
+        if org:
+            url = f"/orgs/{org}/repos"
+        elif user:
+            url = f"/users/{user}/repos"
+        else:
+            url = "/user/repos"
 
-                response = await client.get(
-                    url,
-                    headers=self._get_headers(),
-                    params={"per_page": min(per_page, 100)},
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    repos = [
-                        {
-                            "name": repo["name"],
-                            "full_name": repo["full_name"],
-                            "description": repo.get("description"),
-                            "url": repo["html_url"],
-                            "private": repo["private"],
-                            "default_branch": repo.get("default_branch"),
-                        }
-                        for repo in data
-                    ]
-                    return {
-                        "success": True,
-                        "repositories": repos,
-                        "count": len(repos),
-                    }
-                else:
-                    return {
-                        "error": f"Failed to list repos: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "GET",
+            url,
+            "list repos",
+            _project_repo_list,
+            params={"per_page": min(per_page, 100)},
+            max_pages=max_pages,
+            decoder=REPOSITORY_LIST_DECODER,
+        )
 
     async def get_repo(
         self,
@@ -674,38 +1163,13 @@ class GitHubAPITool(BaseTool):
         Args:
             repo: Repository in owner/repo format
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/repos/{repo}",
-                    headers=self._get_headers(),
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "name": data["name"],
-                        "full_name": data["full_name"],
-                        "description": data.get("description"),
-                        "url": data["html_url"],
-                        "clone_url": data["clone_url"],
-                        "ssh_url": data["ssh_url"],
-                        "private": data["private"],
-                        "default_branch": data.get("default_branch"),
-                        "language": data.get("language"),
-                        "stars": data.get("stargazers_count", 0),
-                        "forks": data.get("forks_count", 0),
-                        "open_issues": data.get("open_issues_count", 0),
-                    }
-                else:
-                    return {
-                        "error": f"Failed to get repo: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "GET",
+            f"/repos/{repo}",
+            "get repo",
+            _project_repo_details,
+            decoder=REPOSITORY_DECODER,
+        )
 
     async def create_issue(
         self,
@@ -725,45 +1189,30 @@ class GitHubAPITool(BaseTool):
             labels: List of label names (optional)
             assignees: List of usernames to assign (optional)
         """
-        try:
-            issue_data: Dict[str, Any] = {"title": title}
-            if body:
-                issue_data["body"] = body
-            if labels:
-                issue_data["labels"] = labels
-            if assignees:
-                issue_data["assignees"] = assignees
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.base_url}/repos/{repo}/issues",
-                    headers=self._get_headers(),
-                    json=issue_data,
-                    timeout=30.0,
-                )
+        issue_data: Dict[str, Any] = {"title": title}
+        if body:
+            issue_data["body"] = body
+        if labels:
+            issue_data["labels"] = labels
+        if assignees:
+            issue_data["assignees"] = assignees
 
-                if response.status_code == 201:
-                    data = response.json()
-                    return {
-                        "success": True,
-                        "issue_number": data["number"],
-                        "url": data["html_url"],
-                        "title": data["title"],
-                        "state": data["state"],
-                    }
-                else:
-                    return {
-                        "error": f"Failed to create issue: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "POST",
+            f"/repos/{repo}/issues",
+            "create issue",
+            _project_created_issue,
+            json_body=issue_data,
+            ok=(201,),
+            decoder=ISSUE_DECODER,
+        )
 
     async def list_issues(
         self,
         repo: str,
         state: str = "open",
         per_page: int = 30,
+        max_pages: int = 1,
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """List issues for a repository.
@@ -772,40 +1221,14 @@ class GitHubAPITool(BaseTool):
             repo: Repository in owner/repo format
             state: 'open', 'closed', or 'all'
             per_page: Number of results per page
+            max_pages: Maximum number of pages to fetch
         """
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/repos/{repo}/issues",
-                    headers=self._get_headers(),
-                    params={"state": state, "per_page": min(per_page, 100)},
-                    timeout=30.0,
-                )
-
-                if response.status_code == 200:
-                    data = response.json()
-                    issues = [
-                        {
-                            "number": issue["number"],
-                            "title": issue["title"],
-                            "state": issue["state"],
-                            "author": issue["user"]["login"],
-                            "url": issue["html_url"],
-                            "created_at": issue["created_at"],
-                            "labels": [label["name"] for label in issue.get("labels", [])],
-                        }
-                        for issue in data
-                        if "pull_request" not in issue  # Exclude PRs
-                    ]
-                    return {
-                        "success": True,
-                        "issues": issues,
-                        "count": len(issues),
-                    }
-                else:
-                    return {
-                        "error": f"Failed to list issues: {response.status_code}",
-                        "details": response.json(),
-                    }
-        except Exception as e:
-            return {"error": str(e)}
+        return await self._call(
+            "GET",
+            f"/repos/{repo}/issues",
+            "list issues",
+            _project_issue_list,
+            params={"state": state, "per_page": min(per_page, 100)},
+            max_pages=max_pages,
+            decoder=ISSUE_LIST_DECODER,
+        )
@@ -1,32 +1,189 @@
 """Knowledge tool for storing and retrieving organizational knowledge."""
 
+from collections import Counter
 from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict, List, Optional
-import uuid
+from itertools import chain, islice
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+import heapq
+import re
+import secrets
+import sys
+
+import orjson
 
 from app.tools.base import BaseTool
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+_TOKEN_RE = re.compile(r"\w+")
+MAX_RELEVANT_ENTRIES = 5
+STRING_POOL_MAX_ENTRIES = 4096
+
+
+def _tokenize(*texts: str) -> Set[str]:
+    """Split text into the set of lowercased word tokens used by the indexes."""
+    tokens: Set[str] = set()
+    for text in texts:
+        tokens.update(_TOKEN_RE.findall(text.lower()))
+    return tokens
+
+
+def _intern_all(values: Iterable[str]) -> List[str]:
+    """Intern repeated short strings such as tags and repo names."""
+    return [sys.intern(value) for value in values]
+
 
-class KnowledgeScope(str, Enum):
-    """Scope of knowledge application."""
+def _update_postings(
+    index: Dict[str, Set[str]],
+    entry_id: str,
+    old: Iterable[str],
+    new: Iterable[str],
+) -> None:
+    """Move an entry's postings in an inverted index from old keys to new keys."""
+    old_keys, new_keys = set(old), set(new)
+    for key in old_keys - new_keys:
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(entry_id)
+            if not ids:
+                del index[key]
+    for key in new_keys - old_keys:
+        index.setdefault(key, set()).add(entry_id)
+
+
+class KnowledgeScope:
+    """Scope of knowledge application (plain string constants)."""
     
-    NO_REPOS = "no_repos"
-    SPECIFIC_REPOS = "specific_repos"
-    ALL_REPOS = "all_repos"
+    NO_REPOS: Final[str] = "no_repos"
+    SPECIFIC_REPOS: Final[str] = "specific_repos"
+    ALL_REPOS: Final[str] = "all_repos"
 
 
-class KnowledgeSource(str, Enum):
-    """Source of knowledge entry."""
+class KnowledgeSource:
+    """Source of knowledge entry (plain string constants)."""
     
-    USER = "user"
-    AUTO_GENERATED = "auto_generated"
-    SUGGESTED = "suggested"
-    IMPORTED = "imported"
+    USER: Final[str] = "user"
+    AUTO_GENERATED: Final[str] = "auto_generated"
+    SUGGESTED: Final[str] = "suggested"
+    IMPORTED: Final[str] = "imported"
+
+
+_VALID_SCOPES: FrozenSet[str] = frozenset(
+    (KnowledgeScope.NO_REPOS, KnowledgeScope.SPECIFIC_REPOS, KnowledgeScope.ALL_REPOS)
+)
+_VALID_SOURCES: FrozenSet[str] = frozenset(
+    (
+        KnowledgeSource.USER,
+        KnowledgeSource.AUTO_GENERATED,
+        KnowledgeSource.SUGGESTED,
+        KnowledgeSource.IMPORTED,
+    )
+)
+
+
+# (title, trigger_description, content, scope, pinned_repos, tags) in
+# KnowledgeEntry field order; seeded by KnowledgeStore on first use.
+_SAMPLE_ENTRIES: Tuple[Tuple[str, str, str, str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    (
+        "Python Code Style",
+        "When writing Python code, formatting, or reviewing Python files",
+        "Follow PEP 8 style guidelines. Use type hints for function parameters and return values. Prefer f-strings over .format() or % formatting. Use descriptive variable names. Keep functions small and focused on a single task.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("python", "code-style", "best-practices"),
+    ),
+    (
+        "Git Commit Messages",
+        "When creating git commits or writing commit messages",
+        "Use conventional commit format: type(scope): description. Types include feat, fix, docs, style, refactor, test, chore. Keep the subject line under 50 characters. Use imperative mood (Add feature, not Added feature). Include a body for complex changes explaining the why.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("git", "commits", "conventions"),
+    ),
+    (
+        "PR Review Guidelines",
+        "When creating pull requests or reviewing code",
+        "PRs should have a clear title and description. Include screenshots for UI changes. Link related issues. Keep PRs focused and small when possible. Ensure all tests pass before requesting review. Address all review comments before merging.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("pr", "code-review", "github"),
+    ),
+    (
+        "Testing Best Practices",
+        "When writing tests, unit tests, or integration tests",
+        "Write tests for all new features and bug fixes. Follow the Arrange-Act-Assert pattern. Use descriptive test names that explain what is being tested. Mock external dependencies. Aim for high coverage but prioritize critical paths.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("testing", "unit-tests", "quality"),
+    ),
+    (
+        "Error Handling",
+        "When handling errors, exceptions, or error messages",
+        "Always handle errors gracefully. Provide meaningful error messages to users. Log errors with sufficient context for debugging. Use specific exception types rather than generic ones. Don't swallow exceptions silently.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("errors", "exceptions", "debugging"),
+    ),
+    (
+        "API Design",
+        "When designing APIs, REST endpoints, or backend routes",
+        "Use RESTful conventions. Use appropriate HTTP methods (GET, POST, PUT, DELETE). Return consistent response formats. Include proper status codes. Document all endpoints. Version your APIs.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("api", "rest", "backend"),
+    ),
+    (
+        "Security Practices",
+        "When handling security, authentication, or sensitive data",
+        "Never commit secrets or credentials. Use environment variables for sensitive configuration. Validate and sanitize all user input. Use HTTPS for all communications. Implement proper authentication and authorization. Follow the principle of least privilege.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("security", "authentication", "secrets"),
+    ),
+    (
+        "React Component Guidelines",
+        "When writing React components or frontend code",
+        "Use functional components with hooks. Keep components small and focused. Use TypeScript for type safety. Extract reusable logic into custom hooks. Use proper state management. Follow the component composition pattern.",
+        KnowledgeScope.SPECIFIC_REPOS,
+        ("frontend", "web-app"),
+        ("react", "frontend", "components"),
+    ),
+    (
+        "Database Queries",
+        "When writing database queries or working with databases",
+        "Use parameterized queries to prevent SQL injection. Index frequently queried columns. Avoid N+1 query problems. Use transactions for related operations. Optimize queries for performance. Use appropriate data types.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("database", "sql", "performance"),
+    ),
+    (
+        "Documentation Standards",
+        "When writing documentation, README files, or code comments",
+        "Keep documentation up to date with code changes. Include setup instructions in README. Document public APIs and interfaces. Use clear and concise language. Include examples where helpful. Document edge cases and limitations.",
+        KnowledgeScope.ALL_REPOS,
+        (),
+        ("documentation", "readme", "comments"),
+    ),
+)
 
 
-@dataclass
+@dataclass(slots=True)
 class KnowledgeEntry:
     """A single knowledge entry."""
     
@@ -34,9 +191,9 @@ class KnowledgeEntry:
     title: str
     trigger_description: str
     content: str
-    scope: KnowledgeScope
+    scope: str
     pinned_repos: List[str]
-    source: KnowledgeSource
+    source: str
     created_at: datetime
     updated_at: datetime
     created_by: str
@@ -44,28 +201,69 @@ class KnowledgeEntry:
     is_active: bool = True
     access_count: int = 0
     last_accessed: Optional[datetime] = None
+    _title_lc: str = field(init=False, repr=False, compare=False)
+    _content_lc: str = field(init=False, repr=False, compare=False)
+    _trigger_lc: str = field(init=False, repr=False, compare=False)
+    _trigger_tokens: FrozenSet[str] = field(init=False, repr=False, compare=False)
+    _tags_lc: Tuple[str, ...] = field(init=False, repr=False, compare=False)
+    _search_lc: str = field(init=False, repr=False, compare=False)
+    _created_at_iso: str = field(init=False, repr=False, compare=False)
+    _updated_at_iso: str = field(init=False, repr=False, compare=False)
+    _last_accessed_iso: Optional[str] = field(init=False, repr=False, compare=False)
+    _dict_template: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    def __post_init__(self) -> None:
+        self._refresh_search_fields()
+        self._created_at_iso = self.created_at.isoformat()
+        self._updated_at_iso = self.updated_at.isoformat()
+        self._last_accessed_iso = self.last_accessed.isoformat() if self.last_accessed else None
+    
+    def _refresh_search_fields(self) -> None:
+        """Recompute the lowercased copies of the searchable fields."""
+        self._title_lc = self.title.lower()
+        self._content_lc = self.content.lower()
+        self._trigger_lc = self.trigger_description.lower()
+        self._trigger_tokens = frozenset(_TOKEN_RE.findall(self._trigger_lc))
+        self._tags_lc = tuple(sys.intern(tag.lower()) for tag in self.tags)
+        # NUL-joined so a single scan covers every field without matches
+        # spanning two of them.
+        self._search_lc = "\x00".join(
+            (self._title_lc, self._trigger_lc, self._content_lc, *self._tags_lc)
+        )
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary."""
-        return {
-            "id": self.id,
-            "title": self.title,
-            "trigger_description": self.trigger_description,
-            "content": self.content,
-            "scope": self.scope.value,
-            "pinned_repos": self.pinned_repos,
-            "source": self.source.value,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "created_by": self.created_by,
-            "tags": self.tags,
-            "is_active": self.is_active,
-            "access_count": self.access_count,
-            "last_accessed": self.last_accessed.isoformat() if self.last_accessed else None,
-        }
+        """Convert to dictionary.
+        
+        Everything except the access stats comes from a template that is
+        built once and dropped by KnowledgeStore.update.
+        """
+        template = self._dict_template
+        if template is None:
+            template = self._dict_template = {
+                "id": self.id,
+                "title": self.title,
+                "trigger_description": self.trigger_description,
+                "content": self.content,
+                "scope": self.scope,
+                "pinned_repos": self.pinned_repos,
+                "source": self.source,
+                "created_at": self._created_at_iso,
+                "updated_at": self._updated_at_iso,
+                "created_by": self.created_by,
+                "tags": self.tags,
+                "is_active": self.is_active,
+                "access_count": 0,
+                "last_accessed": None,
+            }
+        data = template.copy()
+        data["access_count"] = self.access_count
+        data["last_accessed"] = self._last_accessed_iso
+        return data
 
 
-@dataclass
+@dataclass(slots=True)
 class KnowledgeSuggestion:
     """A suggested knowledge entry from AI."""
     
@@ -73,7 +271,7 @@ class KnowledgeSuggestion:
     title: str
     trigger_description: str
     content: str
-    suggested_scope: KnowledgeScope
+    suggested_scope: str
     suggested_repos: List[str]
     source_session_id: str
     source_message: str
@@ -87,7 +285,7 @@ class KnowledgeSuggestion:
             "title": self.title,
             "trigger_description": self.trigger_description,
             "content": self.content,
-            "suggested_scope": self.suggested_scope.value,
+            "suggested_scope": self.suggested_scope,
             "suggested_repos": self.suggested_repos,
             "source_session_id": self.source_session_id,
             "source_message": self.source_message,
@@ -101,118 +299,203 @@ class KnowledgeStore:
     
     def __init__(self) -> None:
         self._entries: Dict[str, KnowledgeEntry] = {}
+        # Active subset of _entries; queries intersect their index hits with it
+        # instead of checking is_active entry by entry.
+        self._active: Dict[str, KnowledgeEntry] = {}
         self._suggestions: Dict[str, KnowledgeSuggestion] = {}
-        self._populate_sample_knowledge()
+        # Inverted indexes (token -> entry ids) kept in sync on every write so
+        # queries only touch entries sharing a token with the query.
+        self._token_index: Dict[str, Set[str]] = {}
+        self._entry_tokens: Dict[str, Set[str]] = {}
+        self._trigger_index: Dict[str, Set[str]] = {}
+        self._entry_trigger_tokens: Dict[str, FrozenSet[str]] = {}
+        # Scope buckets: ALL_REPOS entry ids, and repo -> SPECIFIC_REPOS entry ids.
+        self._all_repo_ids: Set[str] = set()
+        self._repo_index: Dict[str, Set[str]] = {}
+        self._entry_repos: Dict[str, Set[str]] = {}
+        # Lowercased tag -> entry ids, plus how many entries use each tag.
+        self._tag_to_ids: Dict[str, Set[str]] = {}
+        self._tag_counts: Counter[str] = Counter()
+        self._entry_tags: Dict[str, Tuple[str, ...]] = {}
+        self._sorted_tags: Optional[List[str]] = None
+        # Column layout for full scans: row i holds one entry's id, NUL-joined
+        # search text and active flag. Deleted rows are tombstoned (id None)
+        # and compacted away once they make up half of the table.
+        self._row_ids: List[Optional[str]] = []
+        self._row_text: List[str] = []
+        self._row_active: List[bool] = []
+        self._id_to_row: Dict[str, int] = {}
+        self._dead_rows = 0
+        # Sample entries are seeded on first use rather than at import time.
+        self._populated = False
+        # Shared copies of title/trigger/content text so identical imported
+        # boilerplate is stored once.
+        self._strpool: Dict[str, str] = {}
+        self._strpool_limit = STRING_POOL_MAX_ENTRIES
+    
+    def _ensure_populated(self) -> None:
+        """Seed the sample knowledge the first time entries are touched."""
+        if not self._populated:
+            self._populated = True
+            self._populate_sample_knowledge()
+    
+    def _intern(self, value: str) -> str:
+        """Return the pooled copy of a text value, adding it if new."""
+        pooled = self._strpool.setdefault(value, value)
+        if len(self._strpool) > self._strpool_limit:
+            self._rebuild_strpool()
+            self._strpool.setdefault(pooled, pooled)
+        return pooled
+    
+    def _rebuild_strpool(self) -> None:
+        """Drop pooled strings no longer referenced by any entry or suggestion."""
+        pool: Dict[str, str] = {}
+        for item in (*self._entries.values(), *self._suggestions.values()):
+            for value in (item.title, item.trigger_description, item.content):
+                pool.setdefault(value, value)
+        self._strpool = pool
+        # Leave headroom so a large live pool doesn't rebuild on every write.
+        self._strpool_limit = max(STRING_POOL_MAX_ENTRIES, 2 * len(pool))
     
     def _populate_sample_knowledge(self) -> None:
         """Populate with sample knowledge entries."""
-        sample_entries = [
-            {
-                "title": "Python Code Style",
-                "trigger_description": "When writing Python code, formatting, or reviewing Python files",
-                "content": "Follow PEP 8 style guidelines. Use type hints for function parameters and return values. Prefer f-strings over .format() or % formatting. Use descriptive variable names. Keep functions small and focused on a single task.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["python", "code-style", "best-practices"],
-            },
-            {
-                "title": "Git Commit Messages",
-                "trigger_description": "When creating git commits or writing commit messages",
-                "content": "Use conventional commit format: type(scope): description. Types include feat, fix, docs, style, refactor, test, chore. Keep the subject line under 50 characters. Use imperative mood (Add feature, not Added feature). Include a body for complex changes explaining the why.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["git", "commits", "conventions"],
-            },
-            {
-                "title": "PR Review Guidelines",
-                "trigger_description": "When creating pull requests or reviewing code",
-                "content": "PRs should have a clear title and description. Include screenshots for UI changes. Link related issues. Keep PRs focused and small when possible. Ensure all tests pass before requesting review. Address all review comments before merging.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["pr", "code-review", "github"],
-            },
-            {
-                "title": "Testing Best Practices",
-                "trigger_description": "When writing tests, unit tests, or integration tests",
-                "content": "Write tests for all new features and bug fixes. Follow the Arrange-Act-Assert pattern. Use descriptive test names that explain what is being tested. Mock external dependencies. Aim for high coverage but prioritize critical paths.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["testing", "unit-tests", "quality"],
-            },
-            {
-                "title": "Error Handling",
-                "trigger_description": "When handling errors, exceptions, or error messages",
-                "content": "Always handle errors gracefully. Provide meaningful error messages to users. Log errors with sufficient context for debugging. Use specific exception types rather than generic ones. Don't swallow exceptions silently.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["errors", "exceptions", "debugging"],
-            },
-            {
-                "title": "API Design",
-                "trigger_description": "When designing APIs, REST endpoints, or backend routes",
-                "content": "Use RESTful conventions. Use appropriate HTTP methods (GET, POST, PUT, DELETE). Return consistent response formats. Include proper status codes. Document all endpoints. Version your APIs.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["api", "rest", "backend"],
-            },
-            {
-                "title": "Security Practices",
-                "trigger_description": "When handling security, authentication, or sensitive data",
-                "content": "Never commit secrets or credentials. Use environment variables for sensitive configuration. Validate and sanitize all user input. Use HTTPS for all communications. Implement proper authentication and authorization. Follow the principle of least privilege.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["security", "authentication", "secrets"],
-            },
-            {
-                "title": "React Component Guidelines",
-                "trigger_description": "When writing React components or frontend code",
-                "content": "Use functional components with hooks. Keep components small and focused. Use TypeScript for type safety. Extract reusable logic into custom hooks. Use proper state management. Follow the component composition pattern.",
-                "scope": KnowledgeScope.SPECIFIC_REPOS,
-                "pinned_repos": ["frontend", "web-app"],
-                "tags": ["react", "frontend", "components"],
-            },
-            {
-                "title": "Database Queries",
-                "trigger_description": "When writing database queries or working with databases",
-                "content": "Use parameterized queries to prevent SQL injection. Index frequently queried columns. Avoid N+1 query problems. Use transactions for related operations. Optimize queries for performance. Use appropriate data types.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["database", "sql", "performance"],
-            },
-            {
-                "title": "Documentation Standards",
-                "trigger_description": "When writing documentation, README files, or code comments",
-                "content": "Keep documentation up to date with code changes. Include setup instructions in README. Document public APIs and interfaces. Use clear and concise language. Include examples where helpful. Document edge cases and limitations.",
-                "scope": KnowledgeScope.ALL_REPOS,
-                "pinned_repos": [],
-                "tags": ["documentation", "readme", "comments"],
-            },
-        ]
-        
-        for entry_data in sample_entries:
-            entry_id = str(uuid.uuid4())
-            now = datetime.utcnow()
+        now = datetime.utcnow()
+        for title, trigger_description, content, scope, pinned_repos, tags in _SAMPLE_ENTRIES:
             entry = KnowledgeEntry(
-                id=entry_id,
-                title=entry_data["title"],
-                trigger_description=entry_data["trigger_description"],
-                content=entry_data["content"],
-                scope=entry_data["scope"],
-                pinned_repos=entry_data["pinned_repos"],
-                source=KnowledgeSource.AUTO_GENERATED,
-                created_at=now,
-                updated_at=now,
-                created_by="system",
-                tags=entry_data["tags"],
+                secrets.token_hex(16),
+                self._intern(title),
+                self._intern(trigger_description),
+                self._intern(content),
+                scope,
+                _intern_all(pinned_repos),
+                KnowledgeSource.AUTO_GENERATED,
+                now,
+                now,
+                "system",
+                _intern_all(tags),
             )
-            self._entries[entry_id] = entry
+            self._entries[entry.id] = entry
+            self._index_entry(entry)
+    
+    def _index_entry(self, entry: KnowledgeEntry) -> None:
+        """Bring the inverted indexes and columns in line with the entry's fields."""
+        if entry.is_active:
+            self._active[entry.id] = entry
+        else:
+            self._active.pop(entry.id, None)
+        
+        row = self._id_to_row.get(entry.id)
+        if row is None:
+            self._id_to_row[entry.id] = len(self._row_ids)
+            self._row_ids.append(entry.id)
+            self._row_text.append(entry._search_lc)
+            self._row_active.append(entry.is_active)
+        else:
+            self._row_text[row] = entry._search_lc
+            self._row_active[row] = entry.is_active
+        
+        tokens = set(entry._trigger_tokens)
+        for text in (entry._title_lc, entry._content_lc, *entry._tags_lc):
+            tokens.update(_TOKEN_RE.findall(text))
+        _update_postings(
+            self._token_index, entry.id, self._entry_tokens.get(entry.id, ()), tokens
+        )
+        self._entry_tokens[entry.id] = tokens
+        
+        trigger_tokens = entry._trigger_tokens
+        _update_postings(
+            self._trigger_index,
+            entry.id,
+            self._entry_trigger_tokens.get(entry.id, ()),
+            trigger_tokens,
+        )
+        self._entry_trigger_tokens[entry.id] = trigger_tokens
+        
+        if entry.scope == KnowledgeScope.ALL_REPOS:
+            self._all_repo_ids.add(entry.id)
+        else:
+            self._all_repo_ids.discard(entry.id)
+        repos = (
+            set(entry.pinned_repos) if entry.scope == KnowledgeScope.SPECIFIC_REPOS else set()
+        )
+        _update_postings(self._repo_index, entry.id, self._entry_repos.get(entry.id, ()), repos)
+        self._entry_repos[entry.id] = repos
+        
+        old_tags = self._entry_tags.get(entry.id, ())
+        new_tags = tuple(dict.fromkeys(entry.tags))
+        if old_tags != new_tags:
+            self._retag(entry.id, old_tags, new_tags)
+    
+    def _retag(self, entry_id: str, old_tags: Tuple[str, ...], new_tags: Tuple[str, ...]) -> None:
+        """Move an entry from its old tags to new ones in the tag index and counts."""
+        _update_postings(
+            self._tag_to_ids,
+            entry_id,
+            (sys.intern(tag.lower()) for tag in old_tags),
+            (sys.intern(tag.lower()) for tag in new_tags),
+        )
+        self._tag_counts.subtract(old_tags)
+        self._tag_counts.update(new_tags)
+        for tag in old_tags:
+            if self._tag_counts[tag] <= 0:
+                del self._tag_counts[tag]
+        if new_tags:
+            self._entry_tags[entry_id] = new_tags
+        else:
+            self._entry_tags.pop(entry_id, None)
+        self._sorted_tags = None
+    
+    def _unindex_entry(self, entry_id: str) -> None:
+        """Drop an entry from the inverted indexes and columns."""
+        self._active.pop(entry_id, None)
+        row = self._id_to_row.pop(entry_id, None)
+        if row is not None:
+            self._row_ids[row] = None
+            self._row_text[row] = ""
+            self._row_active[row] = False
+            self._dead_rows += 1
+            if self._dead_rows * 2 > len(self._row_ids):
+                self._compact_rows()
+        _update_postings(self._token_index, entry_id, self._entry_tokens.pop(entry_id, ()), ())
+        _update_postings(
+            self._trigger_index, entry_id, self._entry_trigger_tokens.pop(entry_id, ()), ()
+        )
+        self._all_repo_ids.discard(entry_id)
+        _update_postings(self._repo_index, entry_id, self._entry_repos.pop(entry_id, ()), ())
+        self._retag(entry_id, self._entry_tags.get(entry_id, ()), ())
+    
+    def _compact_rows(self) -> None:
+        """Rebuild the columns without tombstoned rows."""
+        live = [row for row, entry_id in enumerate(self._row_ids) if entry_id is not None]
+        self._row_ids = [self._row_ids[row] for row in live]
+        self._row_text = [self._row_text[row] for row in live]
+        self._row_active = [self._row_active[row] for row in live]
+        self._id_to_row = {
+            entry_id: row for row, entry_id in enumerate(self._row_ids) if entry_id is not None
+        }
+        self._dead_rows = 0
+    
+    def _in_row_order(self, entry_ids: Iterable[str]) -> List[KnowledgeEntry]:
+        """Resolve entry ids to entries in insertion order."""
+        return [
+            self._entries[entry_id]
+            for entry_id in sorted(entry_ids, key=self._id_to_row.__getitem__)
+        ]
     
     def get_all(self) -> List[KnowledgeEntry]:
         """Get all knowledge entries."""
+        self._ensure_populated()
         return list(self._entries.values())
     
+    def get_page(self, start: int, end: int) -> Tuple[List[KnowledgeEntry], int]:
+        """Get entries in the range [start, end) along with the total count."""
+        self._ensure_populated()
+        page = list(islice(self._entries.values(), max(start, 0), max(end, 0)))
+        return page, len(self._entries)
+    
     def get_by_id(self, entry_id: str) -> Optional[KnowledgeEntry]:
         """Get a knowledge entry by ID."""
+        self._ensure_populated()
         return self._entries.get(entry_id)
     
     def create(
@@ -220,29 +503,35 @@ class KnowledgeStore:
         title: str,
         trigger_description: str,
         content: str,
-        scope: KnowledgeScope = KnowledgeScope.NO_REPOS,
+        scope: str = KnowledgeScope.NO_REPOS,
         pinned_repos: Optional[List[str]] = None,
         tags: Optional[List[str]] = None,
         created_by: str = "user",
-        source: KnowledgeSource = KnowledgeSource.USER,
+        source: str = KnowledgeSource.USER,
     ) -> KnowledgeEntry:
         """Create a new knowledge entry."""
-        entry_id = str(uuid.uuid4())
+        self._ensure_populated()
+        if scope not in _VALID_SCOPES:
+            raise ValueError(f"Invalid scope: {scope}")
+        if source not in _VALID_SOURCES:
+            raise ValueError(f"Invalid source: {source}")
+        entry_id = secrets.token_hex(16)
         now = datetime.utcnow()
         entry = KnowledgeEntry(
             id=entry_id,
-            title=title,
-            trigger_description=trigger_description,
-            content=content,
+            title=self._intern(title),
+            trigger_description=self._intern(trigger_description),
+            content=self._intern(content),
             scope=scope,
-            pinned_repos=pinned_repos or [],
+            pinned_repos=_intern_all(pinned_repos or ()),
             source=source,
             created_at=now,
             updated_at=now,
             created_by=created_by,
-            tags=tags or [],
+            tags=_intern_all(tags or ()),
         )
         self._entries[entry_id] = entry
+        self._index_entry(entry)
         return entry
     
     def update(
@@ -251,77 +540,154 @@ class KnowledgeStore:
         title: Optional[str] = None,
         trigger_description: Optional[str] = None,
         content: Optional[str] = None,
-        scope: Optional[KnowledgeScope] = None,
+        scope: Optional[str] = None,
         pinned_repos: Optional[List[str]] = None,
         tags: Optional[List[str]] = None,
         is_active: Optional[bool] = None,
     ) -> Optional[KnowledgeEntry]:
         """Update a knowledge entry."""
+        self._ensure_populated()
+        if scope is not None and scope not in _VALID_SCOPES:
+            raise ValueError(f"Invalid scope: {scope}")
         entry = self._entries.get(entry_id)
         if not entry:
             return None
         
         if title is not None:
-            entry.title = title
+            entry.title = self._intern(title)
         if trigger_description is not None:
-            entry.trigger_description = trigger_description
+            entry.trigger_description = self._intern(trigger_description)
         if content is not None:
-            entry.content = content
+            entry.content = self._intern(content)
         if scope is not None:
             entry.scope = scope
         if pinned_repos is not None:
-            entry.pinned_repos = pinned_repos
+            entry.pinned_repos = _intern_all(pinned_repos)
         if tags is not None:
-            entry.tags = tags
+            entry.tags = _intern_all(tags)
         if is_active is not None:
             entry.is_active = is_active
+        if any(value is not None for value in (title, trigger_description, content, tags)):
+            entry._refresh_search_fields()
         
         entry.updated_at = datetime.utcnow()
+        entry._updated_at_iso = entry.updated_at.isoformat()
+        entry._dict_template = None
+        self._index_entry(entry)
         return entry
     
     def delete(self, entry_id: str) -> bool:
         """Delete a knowledge entry."""
+        self._ensure_populated()
         if entry_id in self._entries:
             del self._entries[entry_id]
+            self._unindex_entry(entry_id)
             return True
         return False
     
     def search(self, query: str) -> List[KnowledgeEntry]:
         """Search knowledge entries by query."""
+        self._ensure_populated()
         query_lower = query.lower()
+        query_tokens = _tokenize(query)
+        if query_tokens:
+            # A substring hit means every query token sits inside some token of
+            # the entry, so narrow to entries matching all tokens via the index.
+            candidate_ids: Optional[Set[str]] = None
+            for query_token in query_tokens:
+                matching: Set[str] = set()
+                for token, ids in self._token_index.items():
+                    if query_token in token:
+                        matching |= ids
+                candidate_ids = matching if candidate_ids is None else candidate_ids & matching
+                if not candidate_ids:
+                    return []
+            candidates: Iterable[KnowledgeEntry] = self._in_row_order(
+                (candidate_ids or set()) & self._active.keys()
+            )
+        elif "\x00" not in query_lower:
+            # Nothing to narrow on, so scan the search text column directly.
+            return [
+                self._entries[entry_id]
+                for entry_id, text, active in zip(
+                    self._row_ids, self._row_text, self._row_active
+                )
+                if active and entry_id is not None and query_lower in text
+            ]
+        else:
+            candidates = self._active.values()
+        
         results = []
-        for entry in self._entries.values():
-            if not entry.is_active:
-                continue
+        for entry in candidates:
             if (
-                query_lower in entry.title.lower()
-                or query_lower in entry.trigger_description.lower()
-                or query_lower in entry.content.lower()
-                or any(query_lower in tag.lower() for tag in entry.tags)
+                query_lower in entry._title_lc
+                or query_lower in entry._trigger_lc
+                or query_lower in entry._content_lc
+                or any(query_lower in tag for tag in entry._tags_lc)
             ):
                 results.append(entry)
         return results
     
-    def get_by_repo(self, repo: str) -> List[KnowledgeEntry]:
-        """Get knowledge entries applicable to a specific repo."""
-        results = []
-        for entry in self._entries.values():
-            if not entry.is_active:
+    def search_many(self, queries: List[str]) -> Dict[str, List[KnowledgeEntry]]:
+        """Search knowledge entries for several queries at once.
+        
+        With pyahocorasick installed the queries are compiled into one
+        automaton and each active entry is scanned a single time, instead of
+        once per query.
+        """
+        self._ensure_populated()
+        results: Dict[str, List[KnowledgeEntry]] = {query: [] for query in queries}
+        if ahocorasick is None or any(not query or "\x00" in query for query in results):
+            for query in results:
+                results[query] = self.search(query)
+            return results
+        
+        automaton = ahocorasick.Automaton()
+        patterns: Dict[str, List[str]] = {}
+        for query in results:
+            patterns.setdefault(query.lower(), []).append(query)
+        for pattern, pattern_queries in patterns.items():
+            automaton.add_word(pattern, pattern_queries)
+        automaton.make_automaton()
+        
+        for entry_id, text, active in zip(self._row_ids, self._row_text, self._row_active):
+            if not active or entry_id is None:
                 continue
-            if entry.scope == KnowledgeScope.ALL_REPOS:
-                results.append(entry)
-            elif entry.scope == KnowledgeScope.SPECIFIC_REPOS:
-                if repo in entry.pinned_repos:
-                    results.append(entry)
+            matched: Set[str] = set()
+            for _, pattern_queries in automaton.iter(text):
+                matched.update(pattern_queries)
+            if matched:
+                entry = self._entries[entry_id]
+                for query in matched:
+                    results[query].append(entry)
         return results
     
+    def get_by_repo(self, repo: str) -> List[KnowledgeEntry]:
+        """Get knowledge entries applicable to a specific repo."""
+        self._ensure_populated()
+        entry_ids = self._all_repo_ids | self._repo_index.get(repo, set())
+        return self._in_row_order(entry_ids & self._active.keys())
+    
     def get_relevant(self, context: str, repo: Optional[str] = None) -> List[KnowledgeEntry]:
         """Get knowledge entries relevant to the given context."""
-        context_lower = context.lower()
-        results = []
+        self._ensure_populated()
+        # One Counter pass over the postings of the context tokens that occur in
+        # any trigger: each entry's count is its trigger/context token overlap.
+        trigger_index = self._trigger_index
+        scores: Counter[str] = Counter(
+            chain.from_iterable(
+                map(trigger_index.__getitem__, _tokenize(context) & trigger_index.keys())
+            )
+        )
         
-        for entry in self._entries.values():
-            if not entry.is_active:
+        now = datetime.utcnow()
+        now_iso = now.isoformat()
+        # Min-heap of the best (score, -row, entry) seen so far; the negated row
+        # makes earlier entries win ties, as the old stable sort did.
+        top: List[Tuple[int, int, KnowledgeEntry]] = []
+        for entry_id, relevance_score in scores.items():
+            entry = self._active.get(entry_id)
+            if entry is None:
                 continue
             
             if repo:
@@ -329,49 +695,47 @@ class KnowledgeStore:
                     if repo not in entry.pinned_repos:
                         continue
             
-            trigger_words = entry.trigger_description.lower().split()
-            relevance_score = sum(1 for word in trigger_words if word in context_lower)
-            
-            if relevance_score > 0:
-                entry.access_count += 1
-                entry.last_accessed = datetime.utcnow()
-                results.append((entry, relevance_score))
+            entry.access_count += 1
+            entry.last_accessed = now
+            entry._last_accessed_iso = now_iso
+            candidate = (relevance_score, -self._id_to_row[entry_id], entry)
+            if len(top) < MAX_RELEVANT_ENTRIES:
+                heapq.heappush(top, candidate)
+            elif candidate[:2] > top[0][:2]:
+                heapq.heapreplace(top, candidate)
         
-        results.sort(key=lambda x: x[1], reverse=True)
-        return [entry for entry, _ in results[:5]]
+        return [entry for _, _, entry in sorted(top, key=lambda x: x[:2], reverse=True)]
     
     def get_by_tag(self, tag: str) -> List[KnowledgeEntry]:
         """Get knowledge entries by tag."""
-        tag_lower = tag.lower()
-        return [
-            entry for entry in self._entries.values()
-            if entry.is_active and any(tag_lower == t.lower() for t in entry.tags)
-        ]
+        self._ensure_populated()
+        entry_ids = self._tag_to_ids.get(sys.intern(tag.lower()), set())
+        return self._in_row_order(entry_ids & self._active.keys())
     
     def get_all_tags(self) -> List[str]:
         """Get all unique tags."""
-        tags = set()
-        for entry in self._entries.values():
-            tags.update(entry.tags)
-        return sorted(tags)
+        self._ensure_populated()
+        if self._sorted_tags is None:
+            self._sorted_tags = sorted(self._tag_counts)
+        return self._sorted_tags
     
     def add_suggestion(
         self,
         title: str,
         trigger_description: str,
         content: str,
-        suggested_scope: KnowledgeScope,
+        suggested_scope: str,
         suggested_repos: List[str],
         source_session_id: str,
         source_message: str,
     ) -> KnowledgeSuggestion:
         """Add a knowledge suggestion."""
-        suggestion_id = str(uuid.uuid4())
+        suggestion_id = secrets.token_hex(16)
         suggestion = KnowledgeSuggestion(
             id=suggestion_id,
-            title=title,
-            trigger_description=trigger_description,
-            content=content,
+            title=self._intern(title),
+            trigger_description=self._intern(trigger_description),
+            content=self._intern(content),
             suggested_scope=suggested_scope,
             suggested_repos=suggested_repos,
             source_session_id=source_session_id,
@@ -429,6 +793,13 @@ class KnowledgeStore:
 knowledge_store = KnowledgeStore()
 
 
+def _entry_default(obj: Any) -> Dict[str, Any]:
+    """orjson fallback that renders knowledge entries and suggestions."""
+    if isinstance(obj, (KnowledgeEntry, KnowledgeSuggestion)):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
 class KnowledgeTool(BaseTool):
     """Tool for managing organizational knowledge."""
     
@@ -452,40 +823,50 @@ class KnowledgeTool(BaseTool):
     - dismiss_suggestion: Dismiss a suggestion
     """
     
+    def __init__(self) -> None:
+        self._commands: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
+            "list": self._list_knowledge,
+            "get": self._get_knowledge,
+            "create": self._create_knowledge,
+            "update": self._update_knowledge,
+            "delete": self._delete_knowledge,
+            "search": self._search_knowledge,
+            "get_relevant": self._get_relevant_knowledge,
+            "get_by_repo": self._get_by_repo,
+            "get_by_tag": self._get_by_tag,
+            "get_tags": self._get_tags,
+            "suggest": self._suggest_knowledge,
+            "list_suggestions": self._list_suggestions,
+            "accept_suggestion": self._accept_suggestion,
+            "dismiss_suggestion": self._dismiss_suggestion,
+        }
+    
+    async def _run_command(self, **kwargs: Any) -> Dict[str, Any]:
+        """Run a command; entries and suggestions are left as objects."""
+        command = kwargs.get("command", "list")
+        handler = self._commands.get(command)
+        if handler is None:
+            return {"error": f"Unknown command: {command}"}
+        return await handler(**kwargs)
+    
     async def execute(self, **kwargs: Any) -> Dict[str, Any]:
         """Execute knowledge operations."""
-        command = kwargs.get("command", "list")
+        result = await self._run_command(**kwargs)
+        for key in ("entries", "suggestions"):
+            if key in result:
+                result[key] = [item.to_dict() for item in result[key]]
+        for key in ("entry", "suggestion"):
+            if key in result:
+                result[key] = result[key].to_dict()
+        return result
+    
+    async def execute_json(self, **kwargs: Any) -> bytes:
+        """Execute a knowledge operation and return the result as JSON bytes.
         
-        if command == "list":
-            return await self._list_knowledge(**kwargs)
-        elif command == "get":
-            return await self._get_knowledge(**kwargs)
-        elif command == "create":
-            return await self._create_knowledge(**kwargs)
-        elif command == "update":
-            return await self._update_knowledge(**kwargs)
-        elif command == "delete":
-            return await self._delete_knowledge(**kwargs)
-        elif command == "search":
-            return await self._search_knowledge(**kwargs)
-        elif command == "get_relevant":
-            return await self._get_relevant_knowledge(**kwargs)
-        elif command == "get_by_repo":
-            return await self._get_by_repo(**kwargs)
-        elif command == "get_by_tag":
-            return await self._get_by_tag(**kwargs)
-        elif command == "get_tags":
-            return await self._get_tags()
-        elif command == "suggest":
-            return await self._suggest_knowledge(**kwargs)
-        elif command == "list_suggestions":
-            return await self._list_suggestions(**kwargs)
-        elif command == "accept_suggestion":
-            return await self._accept_suggestion(**kwargs)
-        elif command == "dismiss_suggestion":
-            return await self._dismiss_suggestion(**kwargs)
-        else:
-            return {"error": f"Unknown command: {command}"}
+        Entries are serialized by orjson in the same pass as the envelope,
+        without building the intermediate list of dicts.
+        """
+        return orjson.dumps(await self._run_command(**kwargs), default=_entry_default)
     
     async def _list_knowledge(
         self,
@@ -494,15 +875,12 @@ class KnowledgeTool(BaseTool):
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """List all knowledge entries with pagination."""
-        entries = knowledge_store.get_all()
-        total = len(entries)
-        
         start = (page - 1) * per_page
         end = start + per_page
-        paginated = entries[start:end]
+        paginated, total = knowledge_store.get_page(start, end)
         
         return {
-            "entries": [e.to_dict() for e in paginated],
+            "entries": paginated,
             "total": total,
             "page": page,
             "per_page": per_page,
@@ -514,7 +892,7 @@ class KnowledgeTool(BaseTool):
         entry = knowledge_store.get_by_id(entry_id)
         if not entry:
             return {"error": f"Knowledge entry not found: {entry_id}"}
-        return {"entry": entry.to_dict()}
+        return {"entry": entry}
     
     async def _create_knowledge(
         self,
@@ -527,20 +905,18 @@ class KnowledgeTool(BaseTool):
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """Create a new knowledge entry."""
-        try:
-            scope_enum = KnowledgeScope(scope)
-        except ValueError:
+        if scope not in _VALID_SCOPES:
             return {"error": f"Invalid scope: {scope}"}
         
         entry = knowledge_store.create(
             title=title,
             trigger_description=trigger_description,
             content=content,
-            scope=scope_enum,
+            scope=scope,
             pinned_repos=pinned_repos,
             tags=tags,
         )
-        return {"entry": entry.to_dict(), "message": "Knowledge entry created successfully"}
+        return {"entry": entry, "message": "Knowledge entry created successfully"}
     
     async def _update_knowledge(
         self,
@@ -555,19 +931,15 @@ class KnowledgeTool(BaseTool):
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """Update a knowledge entry."""
-        scope_enum = None
-        if scope:
-            try:
-                scope_enum = KnowledgeScope(scope)
-            except ValueError:
-                return {"error": f"Invalid scope: {scope}"}
+        if scope and scope not in _VALID_SCOPES:
+            return {"error": f"Invalid scope: {scope}"}
         
         entry = knowledge_store.update(
             entry_id=entry_id,
             title=title,
             trigger_description=trigger_description,
             content=content,
-            scope=scope_enum,
+            scope=scope or None,
             pinned_repos=pinned_repos,
             tags=tags,
             is_active=is_active,
@@ -576,7 +948,7 @@ class KnowledgeTool(BaseTool):
         if not entry:
             return {"error": f"Knowledge entry not found: {entry_id}"}
         
-        return {"entry": entry.to_dict(), "message": "Knowledge entry updated successfully"}
+        return {"entry": entry, "message": "Knowledge entry updated successfully"}
     
     async def _delete_knowledge(self, entry_id: str, **kwargs: Any) -> Dict[str, Any]:
         """Delete a knowledge entry."""
@@ -588,7 +960,7 @@ class KnowledgeTool(BaseTool):
         """Search knowledge entries."""
         entries = knowledge_store.search(query)
         return {
-            "entries": [e.to_dict() for e in entries],
+            "entries": entries,
             "total": len(entries),
             "query": query,
         }
@@ -602,7 +974,7 @@ class KnowledgeTool(BaseTool):
         """Get knowledge relevant to a context."""
         entries = knowledge_store.get_relevant(context, repo)
         return {
-            "entries": [e.to_dict() for e in entries],
+            "entries": entries,
             "total": len(entries),
             "context": context,
             "repo": repo,
@@ -612,7 +984,7 @@ class KnowledgeTool(BaseTool):
         """Get knowledge for a specific repository."""
         entries = knowledge_store.get_by_repo(repo)
         return {
-            "entries": [e.to_dict() for e in entries],
+            "entries": entries,
             "total": len(entries),
             "repo": repo,
         }
@@ -621,12 +993,12 @@ class KnowledgeTool(BaseTool):
         """Get knowledge by tag."""
         entries = knowledge_store.get_by_tag(tag)
         return {
-            "entries": [e.to_dict() for e in entries],
+            "entries": entries,
             "total": len(entries),
             "tag": tag,
         }
     
-    async def _get_tags(self) -> Dict[str, Any]:
+    async def _get_tags(self, **kwargs: Any) -> Dict[str, Any]:
         """Get all available tags."""
         tags = knowledge_store.get_all_tags()
         return {"tags": tags, "total": len(tags)}
@@ -643,22 +1015,20 @@ class KnowledgeTool(BaseTool):
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """Create a knowledge suggestion."""
-        try:
-            scope_enum = KnowledgeScope(suggested_scope)
-        except ValueError:
+        if suggested_scope not in _VALID_SCOPES:
             return {"error": f"Invalid scope: {suggested_scope}"}
         
         suggestion = knowledge_store.add_suggestion(
             title=title,
             trigger_description=trigger_description,
             content=content,
-            suggested_scope=scope_enum,
+            suggested_scope=suggested_scope,
             suggested_repos=suggested_repos or [],
             source_session_id=source_session_id,
             source_message=source_message,
         )
         return {
-            "suggestion": suggestion.to_dict(),
+            "suggestion": suggestion,
             "message": "Knowledge suggestion created successfully",
         }
     
@@ -670,7 +1040,7 @@ class KnowledgeTool(BaseTool):
         """List all knowledge suggestions."""
         suggestions = knowledge_store.get_suggestions(status)
         return {
-            "suggestions": [s.to_dict() for s in suggestions],
+            "suggestions": suggestions,
             "total": len(suggestions),
         }
     
@@ -684,7 +1054,7 @@ class KnowledgeTool(BaseTool):
         if not entry:
             return {"error": f"Suggestion not found: {suggestion_id}"}
         return {
-            "entry": entry.to_dict(),
+            "entry": entry,
             "message": "Suggestion accepted and knowledge entry created",
         }
     
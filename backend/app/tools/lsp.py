@@ -1,14 +1,418 @@
 """LSP (Language Server Protocol) tool for code intelligence."""
 
 import asyncio
+import bisect
 import json
+import mmap
 import os
 import re
+import threading
+from array import array
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+    TypeVar,
+)
 
 from app.tools.base import BaseTool
 
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    import tree_sitter_languages
+except ImportError:
+    tree_sitter_languages = None
+
+# One fused pattern per language, matched in MULTILINE mode over a whole file
+# so ^ anchors at each line start. Each alternative captures the symbol name
+# in a group named after its kind, so match.lastgroup gives the kind directly.
+# [^\S\n] is \s without the newline, which keeps every match on one line.
+PY_SYMBOL_RE = re.compile(
+    r"^(?:class[^\S\n]+(?P<class>\w+)"
+    r"|[^\S\n]*(?:async[^\S\n]+)?def[^\S\n]+(?P<function>\w+)"
+    r"|(?P<variable>\w+)[^\S\n]*=)",
+    re.MULTILINE,
+)
+JS_SYMBOL_RE = re.compile(
+    r"^[^\S\n]*(?:export[^\S\n]+)?(?:"
+    r"(?:async[^\S\n]+)?function[^\S\n]+(?P<function>\w+)"
+    r"|class[^\S\n]+(?P<class>\w+)"
+    r"|(?:const|let|var)[^\S\n]+(?P<variable>\w+)"
+    r"|interface[^\S\n]+(?P<interface>\w+)"
+    r"|type[^\S\n]+(?P<type>\w+))",
+    re.MULTILINE,
+)
+GO_SYMBOL_RE = re.compile(
+    r"^(?:func[^\S\n]+(?:\([^)\n]+\)[^\S\n]+)?(?P<function>\w+)"
+    r"|type[^\S\n]+(?P<type>\w+))",
+    re.MULTILINE,
+)
+
+LANGUAGE_MAP: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".ts": "typescript",
+    ".tsx": "typescript",
+    ".jsx": "javascript",
+    ".go": "go",
+    ".rs": "rust",
+    ".java": "java",
+    ".c": "c",
+    ".cpp": "cpp",
+    ".h": "c",
+    ".hpp": "cpp",
+    ".rb": "ruby",
+    ".php": "php",
+    ".swift": "swift",
+    ".kt": "kotlin",
+    ".scala": "scala",
+    ".cs": "csharp",
+}
+
+# Directories never worth scanning, and a cap on the size of scanned files
+SKIP_DIRS = frozenset({"node_modules", ".git", "__pycache__", "venv", ".venv"})
+MAX_SOURCE_FILE_BYTES = 2 * 1024 * 1024
+
+# Files scanned concurrently on the thread pool (also caps open descriptors)
+MAX_CONCURRENT_FILE_SCANS = 64
+
+# Parsed symbol tables kept per file, least recently used evicted first
+SYMBOL_CACHE_MAX_ENTRIES = 4096
+
+# Default cap on references returned by find_references
+MAX_REFERENCE_RESULTS = 100
+
+# Files passed to a single linter process, keeping the command line bounded
+MAX_LINT_FILES_PER_PROCESS = 256
+
+# Long-running language servers used for diagnostics, by language
+LANGUAGE_SERVER_COMMANDS: Dict[str, List[str]] = {
+    "python": ["ruff", "server"],
+}
+LANGUAGE_SERVER_TIMEOUT = 30.0
+
+T = TypeVar("T")
+
+NEWLINE_RE = re.compile("\n")
+
+
+@lru_cache(maxsize=8192)
+def _language_of(file_path: str) -> str:
+    """Map a file path to its language by extension ("unknown" if unmapped)."""
+    dot = file_path.rfind(".")
+    return LANGUAGE_MAP.get(file_path[dot:].lower(), "unknown") if dot >= 0 else "unknown"
+
+
+def _index_lines(content: str) -> array:
+    """Return the offset at which each line of content starts."""
+    starts = array("I", [0])
+    starts.extend(match.end() for match in NEWLINE_RE.finditer(content))
+    return starts
+
+
+def _line_span(content: str, starts: array, first: int, last: int) -> str:
+    """Return lines first to last - 1 (0-based) of content, without the final newline."""
+    end = starts[last] - 1 if last < len(starts) else len(content)
+    return content[starts[first]:end]
+
+
+def _iter_source_files(root: str) -> Iterator[str]:
+    """Yield source files under root, top-down in directory order.
+
+    Only files with a known source extension and at most MAX_SOURCE_FILE_BYTES
+    are yielded; SKIP_DIRS and symlinks are not followed.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            subdirs.append(entry.path)
+                    elif (
+                        entry.is_file(follow_symlinks=False)
+                        and os.path.splitext(entry.name)[1].lower() in LANGUAGE_MAP
+                        and entry.stat(follow_symlinks=False).st_size <= MAX_SOURCE_FILE_BYTES
+                    ):
+                        yield entry.path
+                except OSError:
+                    continue
+    except OSError:
+        return
+    for subdir in subdirs:
+        yield from _iter_source_files(subdir)
+
+
+def _compile_reference_pattern(symbol: str) -> Pattern[str]:
+    """Compile the word-boundary pattern used to find references to symbol.
+
+    RE2 runs in linear time but its \\b only knows ASCII word characters, so it
+    is used for ASCII identifiers only; _scan_file_for_refs drops its matches
+    that touch a non-ASCII letter or digit.
+    """
+    source = rf"\b{re.escape(symbol)}\b"
+    if re2 is not None and symbol.isascii() and symbol.isidentifier():
+        return re2.compile(source)
+    return re.compile(source)
+
+
+def _is_non_ascii_word_char(char: str) -> bool:
+    """Whether char is a word character that RE2's ASCII \\b does not see."""
+    return not char.isascii() and (char.isalnum() or char == "_")
+
+
+LANG_PATTERNS: Dict[str, Pattern[str]] = {
+    "python": PY_SYMBOL_RE,
+    "javascript": JS_SYMBOL_RE,
+    "typescript": JS_SYMBOL_RE,
+    "go": GO_SYMBOL_RE,
+}
+
+# Files larger than this (in characters) are parsed with tree-sitter when it is
+# installed; below it the regex patterns are cheaper than a parse
+TREE_SITTER_MIN_SIZE = 2 * 1024
+
+TREE_SITTER_GRAMMARS: Dict[str, str] = {
+    ".py": "python",
+    ".js": "javascript",
+    ".jsx": "javascript",
+    ".ts": "typescript",
+    ".tsx": "tsx",
+    ".go": "go",
+}
+
+# Syntax node type -> symbol kind, per grammar
+_JS_SYMBOL_NODES = {
+    "function_declaration": "function",
+    "generator_function_declaration": "function",
+    "class_declaration": "class",
+    "abstract_class_declaration": "class",
+    "variable_declarator": "variable",
+    "interface_declaration": "interface",
+    "type_alias_declaration": "type",
+}
+TREE_SITTER_SYMBOL_NODES: Dict[str, Dict[str, str]] = {
+    "python": {"class_definition": "class", "function_definition": "function"},
+    "javascript": _JS_SYMBOL_NODES,
+    "typescript": _JS_SYMBOL_NODES,
+    "tsx": _JS_SYMBOL_NODES,
+    "go": {
+        "function_declaration": "function",
+        "method_declaration": "function",
+        "type_spec": "type",
+    },
+}
+
+# Parsers are not safe to share between threads, so each pool thread keeps its own
+_tree_sitter_local = threading.local()
+
+
+def _tree_sitter_parser(grammar: str) -> Any:
+    """Return this thread's tree-sitter parser for grammar."""
+    parsers = getattr(_tree_sitter_local, "parsers", None)
+    if parsers is None:
+        parsers = _tree_sitter_local.parsers = {}
+    parser = parsers.get(grammar)
+    if parser is None:
+        parser = parsers[grammar] = tree_sitter_languages.get_parser(grammar)
+    return parser
+
+
+def _tree_sitter_symbols(grammar: str, content: str) -> List[Dict[str, Any]]:
+    """Extract symbols with a tree-sitter parse, in the regex parser's schema."""
+    source = content.encode("utf-8")
+    root = _tree_sitter_parser(grammar).parse(source).root_node
+    node_kinds = TREE_SITTER_SYMBOL_NODES[grammar]
+    found = []
+
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        kind = node_kinds.get(node.type)
+        if kind is not None:
+            name = node.child_by_field_name("name")
+            if name is not None and name.type in ("identifier", "type_identifier"):
+                found.append((name, kind))
+        stack.extend(reversed(node.children))
+
+    # Python variables are module-level assignments only, as with the regex
+    if grammar == "python":
+        for statement in root.children:
+            if statement.type == "expression_statement" and statement.named_child_count:
+                assignment = statement.named_children[0]
+                if assignment.type == "assignment":
+                    left = assignment.child_by_field_name("left")
+                    if left is not None and left.type == "identifier":
+                        found.append((left, "variable"))
+
+    symbols = []
+    for name, kind in sorted(found, key=lambda item: item[0].start_byte):
+        row, byte_column = name.start_point
+        line_start = name.start_byte - byte_column
+        symbols.append({
+            "name": source[name.start_byte:name.end_byte].decode("utf-8"),
+            "kind": kind,
+            "line": row + 1,
+            "column": len(source[line_start:name.start_byte].decode("utf-8")) + 1,
+        })
+    return symbols
+
+
+class LanguageServerClient:
+    """Minimal LSP client for a language server speaking JSON-RPC over stdio."""
+
+    def __init__(self, args: List[str]):
+        self.args = args
+        self._process: Optional[asyncio.subprocess.Process] = None
+        self._reader: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._next_id = 0
+        # One batch of open documents at a time
+        self._documents_lock = asyncio.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Whether the server process is alive."""
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        """Spawn the server and run the initialize handshake."""
+        self._process = await asyncio.create_subprocess_exec(
+            *self.args,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        self._reader = asyncio.create_task(self._read_messages())
+        await self.request("initialize", {
+            "processId": os.getpid(),
+            "rootUri": None,
+            "capabilities": {"textDocument": {"diagnostic": {"dynamicRegistration": False}}},
+        })
+        await self.notify("initialized", {})
+
+    async def close(self) -> None:
+        """Shut the server down, killing it if it does not exit cleanly."""
+        if self.running:
+            try:
+                await asyncio.wait_for(self.request("shutdown"), 5)
+                await self.notify("exit")
+                await asyncio.wait_for(self._process.wait(), 5)
+            except (ConnectionError, RuntimeError, asyncio.TimeoutError):
+                pass
+        if self.running:
+            self._process.kill()
+        if self._reader is not None:
+            self._reader.cancel()
+
+    async def request(self, method: str, params: Optional[Any] = None) -> Any:
+        """Send a request and wait for its result."""
+        self._next_id += 1
+        request_id = self._next_id
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            await self._send({
+                "jsonrpc": "2.0", "id": request_id, "method": method, "params": params,
+            })
+            return await asyncio.wait_for(future, LANGUAGE_SERVER_TIMEOUT)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Optional[Any] = None) -> None:
+        """Send a notification."""
+        await self._send({"jsonrpc": "2.0", "method": method, "params": params})
+
+    async def pull_diagnostics(
+        self, documents: Dict[str, str], language_id: str
+    ) -> Dict[str, List[Any]]:
+        """Open documents, pull their diagnostics and close them again.
+
+        Args:
+            documents: Text to check, keyed by file path.
+            language_id: LSP language identifier of every document.
+
+        Returns:
+            The server's diagnostic items, keyed by the given paths.
+        """
+        uris = {path: Path(path).resolve().as_uri() for path in documents}
+        async with self._documents_lock:
+            for path, uri in uris.items():
+                text = documents[path]
+                await self.notify("textDocument/didOpen", {
+                    "textDocument": {
+                        "uri": uri, "languageId": language_id, "version": 1, "text": text,
+                    },
+                })
+            try:
+                reports = await asyncio.gather(*(
+                    self.request("textDocument/diagnostic", {"textDocument": {"uri": uri}})
+                    for uri in uris.values()
+                ))
+            finally:
+                for uri in uris.values():
+                    await self.notify("textDocument/didClose", {"textDocument": {"uri": uri}})
+        return {path: (report or {}).get("items", []) for path, report in zip(uris, reports)}
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        if not self.running:
+            raise ConnectionError("Language server is not running")
+        if message.get("params") is None:
+            message.pop("params", None)
+        body = json.dumps(message).encode("utf-8")
+        self._process.stdin.write(b"Content-Length: %d\r\n\r\n" % len(body) + body)
+        await self._process.stdin.drain()
+
+    async def _read_messages(self) -> None:
+        """Route responses to their pending requests until the server exits."""
+        stdout = self._process.stdout
+        try:
+            while True:
+                header = await stdout.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in header.split(b"\r\n"):
+                    name, _, value = line.partition(b":")
+                    if name.strip().lower() == b"content-length":
+                        length = int(value)
+                message = json.loads(await stdout.readexactly(length))
+
+                if "method" in message:
+                    # Notifications are ignored; requests from the server
+                    # (capability registration etc.) are acknowledged
+                    if "id" in message:
+                        await self._send({"jsonrpc": "2.0", "id": message["id"], "result": None})
+                    continue
+
+                future = self._pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue
+                if "error" in message:
+                    future.set_exception(RuntimeError(message["error"].get("message", "")))
+                else:
+                    future.set_result(message.get("result"))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Language server exited"))
+
 
 class LSPTool(BaseTool):
     """Tool for Language Server Protocol operations."""
@@ -18,166 +422,322 @@ class LSPTool(BaseTool):
 
     def __init__(self):
         self.language_servers: Dict[str, Any] = {}
-
-    async def execute(self, command: str, **kwargs: Any) -> Dict[str, Any]:
-        """Execute an LSP operation."""
-        commands = {
+        # File reads and regex scans are blocking, so workspace walks run on
+        # this pool instead of the event loop.
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+        # path -> ((mtime_ns, size), symbols, NUL-joined lowercase names);
+        # shared by the pool threads
+        self._symbol_cache: OrderedDict[
+            str, Tuple[Tuple[int, int], List[Dict[str, Any]], str]
+        ] = OrderedDict()
+        self._symbol_cache_lock = threading.Lock()
+        # Scans currently running, so identical concurrent requests share one
+        self._inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        # Languages whose server could not be started; they use one-off linter runs
+        self._unavailable_servers: Set[str] = set()
+        self._server_start_lock = asyncio.Lock()
+        # Editor copies of open documents, keyed by absolute path: (text, version).
+        # They take precedence over the files on disk.
+        self.open_docs: Dict[str, Tuple[str, int]] = {}
+        # Absolute path -> (version, symbols, NUL-joined lowercase names)
+        self._open_doc_symbols: Dict[str, Tuple[int, List[Dict[str, Any]], str]] = {}
+        # Command name -> handler, built once rather than on every execute()
+        self._commands: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
             "goto_definition": self.goto_definition,
             "goto_references": self.find_references,
             "hover_symbol": self.hover_symbol,
             "file_diagnostics": self.get_diagnostics,
+            "batch_diagnostics": self.get_diagnostics_batch,
             "document_symbols": self.get_document_symbols,
             "workspace_symbols": self.search_workspace_symbols,
             "completion": self.get_completions,
             "signature_help": self.get_signature_help,
             "rename": self.rename_symbol,
             "format_document": self.format_document,
+            "did_open": self.did_open,
+            "did_change": self.did_change,
+            "did_close": self.did_close,
         }
 
-        if command not in commands:
+    async def close(self) -> None:
+        """Shut down the file-scanning thread pool and any language servers."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        for server in self.language_servers.values():
+            await server.close()
+        self.language_servers.clear()
+
+    async def _language_server(self, language: str) -> Optional[LanguageServerClient]:
+        """Return the running server for language, starting it on first use."""
+        args = LANGUAGE_SERVER_COMMANDS.get(language)
+        if args is None or language in self._unavailable_servers:
+            return None
+        async with self._server_start_lock:
+            server = self.language_servers.get(language)
+            if server is not None and server.running:
+                return server
+            server = LanguageServerClient(args)
+            try:
+                await server.start()
+            except (OSError, RuntimeError, asyncio.TimeoutError):
+                # Not installed, or a version without a server mode
+                await server.close()
+                self._unavailable_servers.add(language)
+                return None
+            self.language_servers[language] = server
+            return server
+
+    async def execute(self, command: str, **kwargs: Any) -> Dict[str, Any]:
+        """Execute an LSP operation."""
+        handler = self._commands.get(command)
+        if handler is None:
             return {"error": f"Unknown command: {command}"}
 
-        return await commands[command](**kwargs)
+        return await handler(**kwargs)
+
+    def _open_document(self, file_path: str) -> Optional[Tuple[str, int]]:
+        """Return the (text, version) of file_path if an editor has it open."""
+        if not self.open_docs:
+            return None
+        return self.open_docs.get(os.path.abspath(file_path))
+
+    def _document_exists(self, file_path: str) -> bool:
+        """Whether file_path is open in an editor or exists on disk."""
+        return self._open_document(file_path) is not None or os.path.exists(file_path)
+
+    def _read_document(self, file_path: str) -> str:
+        """Return the open document's text, or the file's contents on disk."""
+        open_doc = self._open_document(file_path)
+        if open_doc is not None:
+            return open_doc[0]
+        with open(file_path, "r", encoding="utf-8") as f:
+            return f.read()
 
     def _detect_language(self, file_path: str) -> str:
         """Detect programming language from file extension."""
-        ext = Path(file_path).suffix.lower()
-        language_map = {
-            ".py": "python",
-            ".js": "javascript",
-            ".ts": "typescript",
-            ".tsx": "typescript",
-            ".jsx": "javascript",
-            ".go": "go",
-            ".rs": "rust",
-            ".java": "java",
-            ".c": "c",
-            ".cpp": "cpp",
-            ".h": "c",
-            ".hpp": "cpp",
-            ".rb": "ruby",
-            ".php": "php",
-            ".swift": "swift",
-            ".kt": "kotlin",
-            ".scala": "scala",
-            ".cs": "csharp",
-        }
-        return language_map.get(ext, "unknown")
+        return _language_of(file_path)
 
     def _parse_file_for_symbols(self, file_path: str, content: str) -> List[Dict[str, Any]]:
         """Parse file content to extract symbols (basic implementation)."""
-        symbols = []
-        lines = content.split("\n")
         language = self._detect_language(file_path)
+        if language == "unknown":
+            return []
 
-        for line_num, line in enumerate(lines, 1):
-            # Python patterns
-            if language == "python":
-                # Class definitions
-                class_match = re.match(r"^class\s+(\w+)", line)
-                if class_match:
-                    symbols.append({
-                        "name": class_match.group(1),
-                        "kind": "class",
-                        "line": line_num,
-                        "column": line.index("class") + 1,
-                    })
-
-                # Function definitions
-                func_match = re.match(r"^\s*(?:async\s+)?def\s+(\w+)", line)
-                if func_match:
-                    symbols.append({
-                        "name": func_match.group(1),
-                        "kind": "function",
-                        "line": line_num,
-                        "column": line.index("def") + 1,
-                    })
-
-                # Variable assignments at module level
-                var_match = re.match(r"^(\w+)\s*=", line)
-                if var_match and not line.strip().startswith("#"):
-                    symbols.append({
-                        "name": var_match.group(1),
-                        "kind": "variable",
-                        "line": line_num,
-                        "column": 1,
-                    })
-
-            # JavaScript/TypeScript patterns
-            elif language in ["javascript", "typescript"]:
-                # Function declarations
-                func_match = re.match(r"^\s*(?:export\s+)?(?:async\s+)?function\s+(\w+)", line)
-                if func_match:
-                    symbols.append({
-                        "name": func_match.group(1),
-                        "kind": "function",
-                        "line": line_num,
-                        "column": 1,
-                    })
-
-                # Class declarations
-                class_match = re.match(r"^\s*(?:export\s+)?class\s+(\w+)", line)
-                if class_match:
-                    symbols.append({
-                        "name": class_match.group(1),
-                        "kind": "class",
-                        "line": line_num,
-                        "column": 1,
-                    })
-
-                # Const/let/var declarations
-                var_match = re.match(r"^\s*(?:export\s+)?(?:const|let|var)\s+(\w+)", line)
-                if var_match:
-                    symbols.append({
-                        "name": var_match.group(1),
-                        "kind": "variable",
-                        "line": line_num,
-                        "column": 1,
-                    })
+        if tree_sitter_languages is not None and len(content) > TREE_SITTER_MIN_SIZE:
+            grammar = TREE_SITTER_GRAMMARS.get(os.path.splitext(file_path)[1].lower())
+            if grammar is not None:
+                try:
+                    return _tree_sitter_symbols(grammar, content)
+                except Exception:
+                    # A grammar that fails to load or parse (e.g. a py-tree-sitter
+                    # release the bundled grammars don't support) uses the regex path
+                    pass
 
-                # Interface declarations (TypeScript)
-                interface_match = re.match(r"^\s*(?:export\s+)?interface\s+(\w+)", line)
-                if interface_match:
-                    symbols.append({
-                        "name": interface_match.group(1),
-                        "kind": "interface",
-                        "line": line_num,
-                        "column": 1,
-                    })
+        symbols = []
+        pattern = LANG_PATTERNS.get(language)
+        if pattern is None:
+            return symbols
+
+        # One pass over the whole file. Matches always start a line (^), so
+        # line numbers advance by the newlines since the previous match.
+        line_num = 1
+        line_start = 0
+        for match in pattern.finditer(content):
+            start = match.start()
+            line_num += content.count("\n", line_start, start)
+            line_start = start
+            kind = match.lastgroup
+            symbols.append({
+                "name": match.group(kind),
+                "kind": kind,
+                "line": line_num,
+                "column": match.start(kind) - line_start + 1,
+            })
 
-                # Type declarations (TypeScript)
-                type_match = re.match(r"^\s*(?:export\s+)?type\s+(\w+)", line)
-                if type_match:
-                    symbols.append({
-                        "name": type_match.group(1),
-                        "kind": "type",
-                        "line": line_num,
-                        "column": 1,
-                    })
+        return symbols
 
-            # Go patterns
-            elif language == "go":
-                # Function declarations
-                func_match = re.match(r"^func\s+(?:\([^)]+\)\s+)?(\w+)", line)
-                if func_match:
-                    symbols.append({
-                        "name": func_match.group(1),
-                        "kind": "function",
-                        "line": line_num,
-                        "column": 1,
-                    })
+    def _cached_parse(
+        self, file_path: str, content: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Return a file's symbols, reparsing only when its mtime or size changed.
+
+        The returned list is shared with the cache and must not be mutated.
+
+        Args:
+            file_path: Path of the file to parse.
+            content: The file's text, if the caller has already read it.
+        """
+        return self._cached_entry(file_path, content)[0]
+
+    def _cached_entry(
+        self, file_path: str, content: Optional[str] = None, required: Optional[bytes] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+        """Return a file's cached symbols and their NUL-joined lowercase names.
+
+        Args:
+            file_path: Path of the file to parse.
+            content: The file's text, if the caller has already read it.
+            required: Lowercase ASCII bytes the file must contain. If the file is
+                not cached and its ASCII-lowercased bytes lack them, None is
+                returned without parsing.
+        """
+        open_doc = self._open_document(file_path)
+        if open_doc is not None:
+            return self._open_document_entry(file_path, *open_doc)
+
+        stat = os.stat(file_path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        with self._symbol_cache_lock:
+            cached = self._symbol_cache.get(file_path)
+            if cached is not None and cached[0] == stamp:
+                self._symbol_cache.move_to_end(file_path)
+                return cached[1], cached[2]
+
+        if content is None and required is not None:
+            with open(file_path, "rb") as f:
+                data = f.read()
+            if required not in data.lower():
+                return None
+            content = data.decode("utf-8")
+            if "\r" in content:
+                # Same newline handling as reading in text mode
+                content = content.replace("\r\n", "\n").replace("\r", "\n")
+        elif content is None:
+            with open(file_path, "r", encoding="utf-8") as f:
+                content = f.read()
+        symbols = self._parse_file_for_symbols(file_path, content)
+        names_lc = "\0".join(sym["name"] for sym in symbols).lower()
+
+        with self._symbol_cache_lock:
+            self._symbol_cache[file_path] = (stamp, symbols, names_lc)
+            self._symbol_cache.move_to_end(file_path)
+            while len(self._symbol_cache) > SYMBOL_CACHE_MAX_ENTRIES:
+                self._symbol_cache.popitem(last=False)
+        return symbols, names_lc
+
+    def _open_document_entry(
+        self, file_path: str, text: str, version: int
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """Return an open document's symbols, reparsing only when its version changed."""
+        key = os.path.abspath(file_path)
+        with self._symbol_cache_lock:
+            cached = self._open_doc_symbols.get(key)
+            if cached is not None and cached[0] == version:
+                return cached[1], cached[2]
+
+        symbols = self._parse_file_for_symbols(file_path, text)
+        names_lc = "\0".join(sym["name"] for sym in symbols).lower()
+        with self._symbol_cache_lock:
+            self._open_doc_symbols[key] = (version, symbols, names_lc)
+        return symbols, names_lc
+
+    async def _list_source_files(self, root: str) -> List[str]:
+        """Collect the source files under root on the thread pool."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, list, _iter_source_files(root))
+
+    async def _scan_files(self, paths: List[str], scan: Callable[[str], T]) -> List[T]:
+        """Run a blocking per-file scan over paths on the thread pool, in order."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILE_SCANS)
+
+        async def run(file_path: str) -> T:
+            async with semaphore:
+                return await loop.run_in_executor(self._executor, scan, file_path)
+
+        return await asyncio.gather(*(run(file_path) for file_path in paths))
+
+    async def _coalesce(self, key: Tuple[Any, ...], run: Callable[[], Awaitable[T]]) -> T:
+        """Await run(), sharing one in-flight call between concurrent callers with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(run())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller being cancelled does not cancel the others
+        return await asyncio.shield(task)
+
+    def _read_symbols(self, file_path: str) -> List[Dict[str, Any]]:
+        """Read and parse a file's symbols; undecodable or unreadable files have none."""
+        try:
+            return self._cached_parse(file_path)
+        except (UnicodeDecodeError, PermissionError):
+            return []
 
-                # Type declarations
-                type_match = re.match(r"^type\s+(\w+)", line)
-                if type_match:
-                    symbols.append({
-                        "name": type_match.group(1),
-                        "kind": "type",
-                        "line": line_num,
-                        "column": 1,
-                    })
+    def _scan_file_for_symbols_matching(
+        self, file_path: str, query_lower: str, required: Optional[bytes]
+    ) -> List[Dict[str, Any]]:
+        """Return the symbols in a file whose lowercased name contains query_lower.
 
-        return symbols
+        Files not yet cached are only parsed if their bytes contain required.
+        """
+        try:
+            entry = self._cached_entry(file_path, required=required)
+        except (UnicodeDecodeError, PermissionError):
+            return []
+        if entry is None:
+            return []
+        symbols, names_lc = entry
+        # One substring search over all names rules out most files
+        if query_lower not in names_lc:
+            return []
+        return [
+            {**sym, "path": file_path}
+            for sym, name_lc in zip(symbols, names_lc.split("\0"))
+            if query_lower in name_lc
+        ]
+
+    def _scan_file_for_refs(
+        self, file_path: str, symbol: str, pattern: Pattern[str], limit: int
+    ) -> List[Tuple[int, int, str]]:
+        """Return up to limit matches of pattern (the compiled regex for symbol) in a file.
+
+        Each match is a (line, column, context) tuple.
+        """
+        references = []
+
+        open_doc = self._open_document(file_path)
+        if open_doc is not None:
+            content = open_doc[0]
+            if symbol not in content:
+                return references
+        else:
+            # Cheap substring prescan on the raw bytes; most files never
+            # mention the symbol and are skipped without decoding
+            try:
+                with open(file_path, "rb") as f:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        if mm.find(symbol.encode("utf-8")) == -1:
+                            return references
+            except (OSError, ValueError):
+                # ValueError: empty files cannot be mapped
+                return references
+
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except (UnicodeDecodeError, PermissionError):
+                return references
+
+        # One pass over the whole file; line numbers come from the offsets
+        # of each line start
+        line_starts = _index_lines(content)
+        check_edges = not isinstance(pattern, re.Pattern)
+        for match in pattern.finditer(content):
+            if check_edges:
+                start, end = match.span()
+                if (start and _is_non_ascii_word_char(content[start - 1])) or (
+                    end < len(content) and _is_non_ascii_word_char(content[end])
+                ):
+                    continue
+            line_index = bisect.bisect_right(line_starts, match.start()) - 1
+            references.append((
+                line_index + 1,
+                match.start() - line_starts[line_index] + 1,
+                _line_span(content, line_starts, line_index, line_index + 1).strip(),
+            ))
+            if len(references) >= limit:
+                break
+        return references
 
     async def goto_definition(
         self,
@@ -188,14 +748,11 @@ class LSPTool(BaseTool):
     ) -> Dict[str, Any]:
         """Find where a symbol is defined."""
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-
             # Search for definition in the same file
-            symbols = self._parse_file_for_symbols(path, content)
+            symbols = self._cached_parse(path)
             for sym in symbols:
                 if sym["name"] == symbol:
                     return {
@@ -208,35 +765,25 @@ class LSPTool(BaseTool):
                         },
                     }
 
-            # Search in directory for imports/definitions
+            # Search in directory for imports/definitions, in batches so an
+            # early hit skips the rest of the walk
             directory = os.path.dirname(path)
-            for root, dirs, files in os.walk(directory):
-                # Skip common non-source directories
-                dirs[:] = [d for d in dirs if d not in ["node_modules", ".git", "__pycache__", "venv", ".venv"]]
-
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if file_path == path:
-                        continue
-
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            file_content = f.read()
-
-                        file_symbols = self._parse_file_for_symbols(file_path, file_content)
-                        for sym in file_symbols:
-                            if sym["name"] == symbol:
-                                return {
-                                    "success": True,
-                                    "definition": {
-                                        "path": file_path,
-                                        "line": sym["line"],
-                                        "column": sym["column"],
-                                        "kind": sym["kind"],
-                                    },
-                                }
-                    except (UnicodeDecodeError, PermissionError):
-                        continue
+            file_paths = [p for p in await self._list_source_files(directory) if p != path]
+            for start in range(0, len(file_paths), MAX_CONCURRENT_FILE_SCANS):
+                batch = file_paths[start:start + MAX_CONCURRENT_FILE_SCANS]
+                batch_symbols = await self._scan_files(batch, self._read_symbols)
+                for file_path, file_symbols in zip(batch, batch_symbols):
+                    for sym in file_symbols:
+                        if sym["name"] == symbol:
+                            return {
+                                "success": True,
+                                "definition": {
+                                    "path": file_path,
+                                    "line": sym["line"],
+                                    "column": sym["column"],
+                                    "kind": sym["kind"],
+                                },
+                            }
 
             return {
                 "success": False,
@@ -250,48 +797,86 @@ class LSPTool(BaseTool):
         path: str,
         symbol: str,
         line: int,
+        max_results: int = MAX_REFERENCE_RESULTS,
         **kwargs: Any,
     ) -> Dict[str, Any]:
-        """Find all references to a symbol."""
+        """Find references to a symbol, stopping once max_results are found.
+
+        When the result is truncated, total_count is a lower bound.
+        """
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
-            references = []
             directory = os.path.dirname(path)
-
-            # Search for references in all files
-            for root, dirs, files in os.walk(directory):
-                dirs[:] = [d for d in dirs if d not in ["node_modules", ".git", "__pycache__", "venv", ".venv"]]
-
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            lines = f.readlines()
-
-                        for line_num, line_content in enumerate(lines, 1):
-                            # Simple word boundary search
-                            pattern = rf"\b{re.escape(symbol)}\b"
-                            for match in re.finditer(pattern, line_content):
-                                references.append({
-                                    "path": file_path,
-                                    "line": line_num,
-                                    "column": match.start() + 1,
-                                    "context": line_content.strip(),
-                                })
-                    except (UnicodeDecodeError, PermissionError):
-                        continue
-
-            return {
-                "success": True,
-                "symbol": symbol,
-                "references": references[:100],  # Limit to 100 references
-                "total_count": len(references),
-            }
+            return await self._coalesce(
+                ("references", directory, symbol, max_results),
+                partial(self._collect_references, directory, symbol, max_results),
+            )
         except Exception as e:
             return {"error": str(e)}
 
+    async def _walk_references(
+        self,
+        directory: str,
+        symbol: str,
+        max_results: int,
+        on_match: Callable[[str, int, int, str], None],
+    ) -> int:
+        """Report references to symbol under directory, in walk order.
+
+        Args:
+            directory: Directory to scan.
+            symbol: Symbol to look for.
+            max_results: Number of references to report; the walk stops once it has
+                found one more, so callers can tell whether the list was cut short.
+            on_match: Called as on_match(path, line, column, context) for each reference.
+
+        Returns:
+            The number of references found, which exceeds max_results when truncated.
+        """
+        file_paths = await self._list_source_files(directory)
+        pattern = _compile_reference_pattern(symbol)
+        scan = partial(
+            self._scan_file_for_refs, symbol=symbol, pattern=pattern, limit=max_results + 1
+        )
+        found = 0
+        # Scan in batches so passing the cap skips the rest of the walk
+        for start in range(0, len(file_paths), MAX_CONCURRENT_FILE_SCANS):
+            batch = file_paths[start:start + MAX_CONCURRENT_FILE_SCANS]
+            for file_path, file_references in zip(batch, await self._scan_files(batch, scan)):
+                for line, column, context in file_references[:max(0, max_results - found)]:
+                    on_match(file_path, line, column, context)
+                found += len(file_references)
+            if found > max_results:
+                break
+        return found
+
+    async def _collect_references(
+        self, directory: str, symbol: str, max_results: int
+    ) -> Dict[str, Any]:
+        """Scan the source files under directory for references to symbol."""
+        references = []
+
+        def on_match(file_path: str, line: int, column: int, context: str) -> None:
+            references.append({
+                "path": file_path,
+                "line": line,
+                "column": column,
+                "context": context,
+            })
+
+        # Search for references in all files
+        total_count = await self._walk_references(directory, symbol, max_results, on_match)
+
+        return {
+            "success": True,
+            "symbol": symbol,
+            "references": references,
+            "total_count": total_count,
+            "truncated": total_count > max_results,
+        }
+
     async def hover_symbol(
         self,
         path: str,
@@ -301,35 +886,35 @@ class LSPTool(BaseTool):
     ) -> Dict[str, Any]:
         """Get documentation/type info for a symbol."""
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
+            content = self._read_document(path)
 
-            lines = content.split("\n")
+            line_starts = _index_lines(content)
+            line_count = len(line_starts)
             language = self._detect_language(path)
 
             # Find the symbol definition and extract docstring/comments
-            symbols = self._parse_file_for_symbols(path, content)
+            symbols = self._cached_parse(path, content)
             for sym in symbols:
                 if sym["name"] == symbol:
                     # Get surrounding context
                     start_line = max(0, sym["line"] - 2)
-                    end_line = min(len(lines), sym["line"] + 5)
-                    context = "\n".join(lines[start_line:end_line])
+                    end_line = min(line_count, sym["line"] + 5)
+                    context = _line_span(content, line_starts, start_line, end_line)
 
                     # Extract docstring if Python
                     docstring = None
-                    if language == "python" and sym["line"] < len(lines):
-                        next_lines = lines[sym["line"]:sym["line"] + 10]
-                        for i, line_text in enumerate(next_lines):
+                    if language == "python" and sym["line"] < line_count:
+                        last = min(line_count, sym["line"] + 10)
+                        for i in range(sym["line"], last):
+                            line_text = _line_span(content, line_starts, i, i + 1)
                             if '"""' in line_text or "'''" in line_text:
-                                doc_start = i
                                 quote = '"""' if '"""' in line_text else "'''"
-                                for j, doc_line in enumerate(next_lines[i:], i):
-                                    if j > i and quote in doc_line:
-                                        docstring = "\n".join(next_lines[doc_start:j + 1])
+                                for j in range(i + 1, last):
+                                    if quote in _line_span(content, line_starts, j, j + 1):
+                                        docstring = _line_span(content, line_starts, i, j + 1)
                                         break
                                 break
 
@@ -353,6 +938,105 @@ class LSPTool(BaseTool):
         except Exception as e:
             return {"error": str(e)}
 
+    async def _run_linter(
+        self, language: str, paths: List[str]
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """Lint files of one language with a single linter process.
+
+        Args:
+            language: Language of every file in paths.
+            paths: Files to lint.
+
+        Returns:
+            Diagnostics keyed by the given paths; empty when no linter is available.
+        """
+        diagnostics: Dict[str, List[Dict[str, Any]]] = {path: [] for path in paths}
+        server = await self._language_server(language)
+        if server is not None:
+            try:
+                documents = {path: self._read_document(path) for path in paths}
+                items = await server.pull_diagnostics(documents, language)
+            except (ConnectionError, RuntimeError, asyncio.TimeoutError):
+                pass
+            else:
+                for path, path_items in items.items():
+                    diagnostics[path] = sorted(
+                        (self._from_lsp_diagnostic(item) for item in path_items),
+                        key=lambda diagnostic: (diagnostic["line"], diagnostic["column"]),
+                    )
+                return diagnostics
+
+        if language == "python":
+            # Try running ruff or flake8
+            args = ["ruff", "check", "--output-format=json", *paths]
+        elif language in ["javascript", "typescript"]:
+            # Try running eslint
+            args = ["npx", "eslint", "--format=json", *paths]
+        else:
+            return diagnostics
+
+        try:
+            process = await asyncio.create_subprocess_exec(
+                *args,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stdout, _ = await process.communicate()
+        except FileNotFoundError:
+            return diagnostics
+        if not stdout:
+            return diagnostics
+
+        # Linters report absolute file names; route them back to the given paths
+        by_real_path = {os.path.realpath(path): path for path in paths}
+
+        def target(file_name: Optional[str]) -> Optional[str]:
+            if len(paths) == 1:
+                return paths[0]
+            return by_real_path.get(os.path.realpath(file_name)) if file_name else None
+
+        results = json.loads(stdout.decode())
+        if language == "python":
+            for item in results:
+                path = target(item.get("filename"))
+                if path is None:
+                    continue
+                diagnostics[path].append({
+                    "line": item.get("location", {}).get("row", 0),
+                    "column": item.get("location", {}).get("column", 0),
+                    "severity": "error" if item.get("code", "").startswith("E") else "warning",
+                    "message": item.get("message", ""),
+                    "code": item.get("code", ""),
+                })
+        else:
+            for file_result in results:
+                path = target(file_result.get("filePath"))
+                if path is None:
+                    continue
+                for msg in file_result.get("messages", []):
+                    diagnostics[path].append({
+                        "line": msg.get("line", 0),
+                        "column": msg.get("column", 0),
+                        "severity": "error" if msg.get("severity") == 2 else "warning",
+                        "message": msg.get("message", ""),
+                        "code": msg.get("ruleId", ""),
+                    })
+        return diagnostics
+
+    @staticmethod
+    def _from_lsp_diagnostic(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert an LSP diagnostic to the shape the linter runs produce."""
+        start = item.get("range", {}).get("start", {})
+        code = item.get("code") or ""
+        return {
+            "line": start.get("line", 0) + 1,
+            "column": start.get("character", 0) + 1,
+            "severity": "error" if str(code).startswith("E") else "warning",
+            # Servers append fix hints after a blank line; keep the message itself
+            "message": item.get("message", "").split("\n\n", 1)[0],
+            "code": code,
+        }
+
     async def get_diagnostics(
         self,
         path: str,
@@ -360,57 +1044,13 @@ class LSPTool(BaseTool):
     ) -> Dict[str, Any]:
         """Get errors/warnings for a file."""
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
             language = self._detect_language(path)
-            diagnostics = []
 
             # Run language-specific linters
-            if language == "python":
-                # Try running ruff or flake8
-                try:
-                    process = await asyncio.create_subprocess_exec(
-                        "ruff", "check", "--output-format=json", path,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-                    stdout, _ = await process.communicate()
-                    if stdout:
-                        results = json.loads(stdout.decode())
-                        for item in results:
-                            diagnostics.append({
-                                "line": item.get("location", {}).get("row", 0),
-                                "column": item.get("location", {}).get("column", 0),
-                                "severity": "error" if item.get("code", "").startswith("E") else "warning",
-                                "message": item.get("message", ""),
-                                "code": item.get("code", ""),
-                            })
-                except FileNotFoundError:
-                    pass
-
-            elif language in ["javascript", "typescript"]:
-                # Try running eslint
-                try:
-                    process = await asyncio.create_subprocess_exec(
-                        "npx", "eslint", "--format=json", path,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                    )
-                    stdout, _ = await process.communicate()
-                    if stdout:
-                        results = json.loads(stdout.decode())
-                        for file_result in results:
-                            for msg in file_result.get("messages", []):
-                                diagnostics.append({
-                                    "line": msg.get("line", 0),
-                                    "column": msg.get("column", 0),
-                                    "severity": "error" if msg.get("severity") == 2 else "warning",
-                                    "message": msg.get("message", ""),
-                                    "code": msg.get("ruleId", ""),
-                                })
-                except FileNotFoundError:
-                    pass
+            diagnostics = (await self._run_linter(language, [path]))[path]
 
             return {
                 "success": True,
@@ -422,6 +1062,45 @@ class LSPTool(BaseTool):
         except Exception as e:
             return {"error": str(e)}
 
+    async def get_diagnostics_batch(
+        self,
+        paths: List[str],
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Get errors/warnings for several files, running one linter process per language."""
+        try:
+            paths = list(dict.fromkeys(paths))
+            for path in paths:
+                if not self._document_exists(path):
+                    return {"error": f"File not found: {path}"}
+
+            by_language: Dict[str, List[str]] = {}
+            for path in paths:
+                by_language.setdefault(self._detect_language(path), []).append(path)
+
+            diagnostics: Dict[str, List[Dict[str, Any]]] = {}
+            for language, language_paths in by_language.items():
+                for start in range(0, len(language_paths), MAX_LINT_FILES_PER_PROCESS):
+                    batch = language_paths[start:start + MAX_LINT_FILES_PER_PROCESS]
+                    diagnostics.update(await self._run_linter(language, batch))
+
+            files = [
+                {
+                    "path": path,
+                    "language": self._detect_language(path),
+                    "diagnostics": diagnostics[path],
+                    "count": len(diagnostics[path]),
+                }
+                for path in paths
+            ]
+            return {
+                "success": True,
+                "files": files,
+                "count": sum(file["count"] for file in files),
+            }
+        except Exception as e:
+            return {"error": str(e)}
+
     async def get_document_symbols(
         self,
         path: str,
@@ -429,13 +1108,10 @@ class LSPTool(BaseTool):
     ) -> Dict[str, Any]:
         """Get all symbols in a document."""
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-
-            symbols = self._parse_file_for_symbols(path, content)
+            symbols = [dict(sym) for sym in self._cached_parse(path)]
 
             return {
                 "success": True,
@@ -459,22 +1135,16 @@ class LSPTool(BaseTool):
 
             matching_symbols = []
 
-            for root, dirs, files in os.walk(workspace_path):
-                dirs[:] = [d for d in dirs if d not in ["node_modules", ".git", "__pycache__", "venv", ".venv"]]
-
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-
-                        symbols = self._parse_file_for_symbols(file_path, content)
-                        for sym in symbols:
-                            if query.lower() in sym["name"].lower():
-                                sym["path"] = file_path
-                                matching_symbols.append(sym)
-                    except (UnicodeDecodeError, PermissionError):
-                        continue
+            file_paths = await self._list_source_files(workspace_path)
+            query_lower = query.lower()
+            # A raw byte search rules out files that cannot contain a match
+            # before they are parsed; bytes.lower() only folds ASCII
+            required = query_lower.encode() if query_lower.isascii() else None
+            scan = partial(
+                self._scan_file_for_symbols_matching, query_lower=query_lower, required=required
+            )
+            for file_symbols in await self._scan_files(file_paths, scan):
+                matching_symbols.extend(file_symbols)
 
             return {
                 "success": True,
@@ -494,14 +1164,11 @@ class LSPTool(BaseTool):
     ) -> Dict[str, Any]:
         """Get code completions at a position."""
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
-            with open(path, "r", encoding="utf-8") as f:
-                content = f.read()
-
             # Get symbols from current file for basic completions
-            symbols = self._parse_file_for_symbols(path, content)
+            symbols = self._cached_parse(path)
             completions = [
                 {
                     "label": sym["name"],
@@ -528,16 +1195,18 @@ class LSPTool(BaseTool):
     ) -> Dict[str, Any]:
         """Get function signature help."""
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
-            with open(path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
+            content = self._read_document(path)
 
-            if line > len(lines):
+            line_starts = _index_lines(content)
+            # A trailing newline does not start another line
+            line_count = len(line_starts) - (not content or content.endswith("\n"))
+            if line < 1 or line > line_count:
                 return {"error": f"Line {line} out of range"}
 
-            current_line = lines[line - 1]
+            current_line = _line_span(content, line_starts, line - 1, line)
 
             # Find function call
             func_match = re.search(r"(\w+)\s*\(", current_line[:column])
@@ -567,23 +1236,18 @@ class LSPTool(BaseTool):
     ) -> Dict[str, Any]:
         """Rename a symbol across files."""
         try:
-            if not os.path.exists(path):
+            if not self._document_exists(path):
                 return {"error": f"File not found: {path}"}
 
-            # Find all references first
-            refs_result = await self.find_references(path, symbol, line)
-            if "error" in refs_result:
-                return refs_result
+            # Count references per file as the walk finds them
+            files_to_update: Counter = Counter()
 
-            references = refs_result.get("references", [])
+            def on_match(file_path: str, line: int, column: int, context: str) -> None:
+                files_to_update[file_path] += 1
 
-            # Group by file
-            files_to_update: Dict[str, List[Dict[str, Any]]] = {}
-            for ref in references:
-                file_path = ref["path"]
-                if file_path not in files_to_update:
-                    files_to_update[file_path] = []
-                files_to_update[file_path].append(ref)
+            await self._walk_references(
+                os.path.dirname(path), symbol, MAX_REFERENCE_RESULTS, on_match
+            )
 
             # Preview changes
             return {
@@ -591,15 +1255,57 @@ class LSPTool(BaseTool):
                 "symbol": symbol,
                 "new_name": new_name,
                 "files_affected": len(files_to_update),
-                "total_occurrences": len(references),
-                "preview": {
-                    path: len(refs) for path, refs in files_to_update.items()
-                },
+                "total_occurrences": sum(files_to_update.values()),
+                "preview": dict(files_to_update),
                 "message": "Use edit_file tool to apply the rename",
             }
         except Exception as e:
             return {"error": str(e)}
 
+    async def did_open(
+        self,
+        path: str,
+        text: str,
+        version: int = 1,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Start tracking an editor's copy of a document."""
+        key = os.path.abspath(path)
+        self.open_docs[key] = (text, version)
+        with self._symbol_cache_lock:
+            self._open_doc_symbols.pop(key, None)
+        return {"success": True, "path": path, "version": version}
+
+    async def did_change(
+        self,
+        path: str,
+        text: str,
+        version: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Replace the text of an open document (full-document sync)."""
+        key = os.path.abspath(path)
+        current = self.open_docs.get(key)
+        if current is None:
+            return {"error": f"Document not open: {path}"}
+        if version is None:
+            version = current[1] + 1
+        self.open_docs[key] = (text, version)
+        return {"success": True, "path": path, "version": version}
+
+    async def did_close(
+        self,
+        path: str,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Stop tracking a document; later requests read it from disk again."""
+        key = os.path.abspath(path)
+        if self.open_docs.pop(key, None) is None:
+            return {"error": f"Document not open: {path}"}
+        with self._symbol_cache_lock:
+            self._open_doc_symbols.pop(key, None)
+        return {"success": True, "path": path}
+
     async def format_document(
         self,
         path: str,
@@ -1,13 +1,44 @@
 """MCP (Model Context Protocol) tool with marketplace for integrating with external services."""
 
 import asyncio
-import json
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Dict, List, Optional
+from operator import attrgetter
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import orjson
 
 from app.tools.base import BaseTool
 
+try:
+    import fastjsonschema
+except ImportError:
+    fastjsonschema = None
+
+# Identical failing tool calls allowed within the window before further
+# repeats are rejected without being dispatched
+MAX_REPEATED_TOOL_FAILURES = 3
+TOOL_FAILURE_WINDOW = 60.0
+
+# Failure records kept before expired ones are pruned
+TOOL_FAILURE_TRACKER_SIZE = 256
+
+# read_resource responses kept per (server, resource URI)
+RESOURCE_CACHE_MAX_ENTRIES = 1000
+RESOURCE_CACHE_TTL_SECONDS = 3600.0
+
+# Fixed part of the simulated call_tool and read_resource payloads
+SIMULATED_TOOL_NOTE: Dict[str, Any] = {
+    "simulated": True,
+    "note": "This is a simulated response. Connect to actual MCP server for real results.",
+}
+SIMULATED_RESOURCE_NOTE: Dict[str, Any] = {
+    "simulated": True,
+    "note": "This is a simulated response. Connect to actual MCP server for real data.",
+}
+
 
 class MCPCategory(str, Enum):
     """Categories for MCP servers."""
@@ -23,7 +54,10 @@ class MCPCategory(str, Enum):
     OTHER = "other"
 
 
-@dataclass
+# Category lookup by value, without going through Enum.__call__
+CATEGORIES_BY_VALUE: Dict[str, MCPCategory] = {c.value: c for c in MCPCategory}
+
+@dataclass(slots=True)
 class MCPServerConfig:
     """Configuration for an MCP server."""
     id: str
@@ -33,7 +67,9 @@ class MCPServerConfig:
     icon: str
     author: str
     version: str
-    tools: List[Dict[str, str]] = field(default_factory=list)
+    # Each tool has a name and description, plus an optional JSON Schema
+    # for its arguments under "input_schema"
+    tools: List[Dict[str, Any]] = field(default_factory=list)
     resources: List[Dict[str, str]] = field(default_factory=list)
     config_schema: Dict[str, Any] = field(default_factory=dict)
     requires_auth: bool = False
@@ -43,617 +79,658 @@ class MCPServerConfig:
     downloads: int = 0
     rating: float = 0.0
     featured: bool = False
+    _dict_template: Optional[Dict[str, Any]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def to_dict(self) -> Dict[str, Any]:
-        return {
-            "id": self.id,
-            "name": self.name,
-            "description": self.description,
-            "category": self.category.value,
-            "icon": self.icon,
-            "author": self.author,
-            "version": self.version,
-            "tools": self.tools,
-            "resources": self.resources,
-            "config_schema": self.config_schema,
-            "requires_auth": self.requires_auth,
-            "auth_type": self.auth_type,
-            "documentation_url": self.documentation_url,
-            "repository_url": self.repository_url,
-            "downloads": self.downloads,
-            "rating": self.rating,
-            "featured": self.featured,
-        }
+        """Convert to dictionary.
+
+        Marketplace entries are static, so the dictionary is built once and
+        copied on each call.
+        """
+        template = self._dict_template
+        if template is None:
+            template = self._dict_template = {
+                "id": self.id,
+                "name": self.name,
+                "description": self.description,
+                "category": self.category.value,
+                "icon": self.icon,
+                "author": self.author,
+                "version": self.version,
+                "tools": self.tools,
+                "resources": self.resources,
+                "config_schema": self.config_schema,
+                "requires_auth": self.requires_auth,
+                "auth_type": self.auth_type,
+                "documentation_url": self.documentation_url,
+                "repository_url": self.repository_url,
+                "downloads": self.downloads,
+                "rating": self.rating,
+                "featured": self.featured,
+            }
+        return template.copy()
+
+
+# Servers offered by the marketplace
+MARKETPLACE_SERVERS: Tuple[MCPServerConfig, ...] = (
+    MCPServerConfig(
+        id="slack",
+        name="Slack",
+        description="Send messages, manage channels, and interact with Slack workspaces",
+        category=MCPCategory.COMMUNICATION,
+        icon="slack",
+        author="Anthropic",
+        version="1.2.0",
+        tools=[
+            {"name": "send_message", "description": "Send a message to a channel or user"},
+            {"name": "list_channels", "description": "List available channels"},
+            {"name": "get_messages", "description": "Get recent messages from a channel"},
+            {"name": "create_channel", "description": "Create a new channel"},
+            {"name": "upload_file", "description": "Upload a file to a channel"},
+            {"name": "add_reaction", "description": "Add a reaction to a message"},
+        ],
+        resources=[
+            {"uri": "slack://channels", "description": "List of channels"},
+            {"uri": "slack://users", "description": "List of users"},
+            {"uri": "slack://messages/{channel}", "description": "Messages in a channel"},
+        ],
+        config_schema={
+            "bot_token": {"type": "string", "required": True, "secret": True},
+            "app_token": {"type": "string", "required": False, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="oauth",
+        documentation_url="https://api.slack.com/docs",
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/slack",
+        downloads=15420,
+        rating=4.8,
+        featured=True,
+    ),
+    MCPServerConfig(
+        id="github",
+        name="GitHub",
+        description="Manage repositories, pull requests, issues, and GitHub Actions",
+        category=MCPCategory.DEVELOPMENT,
+        icon="github",
+        author="Anthropic",
+        version="1.3.0",
+        tools=[
+            {"name": "create_repository", "description": "Create a new repository"},
+            {"name": "create_pr", "description": "Create a pull request"},
+            {"name": "list_prs", "description": "List pull requests"},
+            {"name": "merge_pr", "description": "Merge a pull request"},
+            {"name": "create_issue", "description": "Create an issue"},
+            {"name": "list_issues", "description": "List repository issues"},
+            {"name": "create_branch", "description": "Create a new branch"},
+            {"name": "get_file", "description": "Get file contents"},
+            {"name": "commit_files", "description": "Commit files to a branch"},
+        ],
+        resources=[
+            {"uri": "github://repos", "description": "List of repositories"},
+            {"uri": "github://repos/{owner}/{repo}", "description": "Repository details"},
+            {"uri": "github://repos/{owner}/{repo}/pulls", "description": "Pull requests"},
+            {"uri": "github://repos/{owner}/{repo}/issues", "description": "Issues"},
+        ],
+        config_schema={
+            "token": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="token",
+        documentation_url="https://docs.github.com/en/rest",
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/github",
+        downloads=28350,
+        rating=4.9,
+        featured=True,
+    ),
+    MCPServerConfig(
+        id="linear",
+        name="Linear",
+        description="Manage issues, projects, and sprints in Linear",
+        category=MCPCategory.PROJECT_MANAGEMENT,
+        icon="linear",
+        author="Anthropic",
+        version="1.1.0",
+        tools=[
+            {"name": "create_issue", "description": "Create a new issue"},
+            {"name": "update_issue", "description": "Update an existing issue"},
+            {"name": "list_issues", "description": "List issues with filters"},
+            {"name": "get_issue", "description": "Get issue details"},
+            {"name": "list_projects", "description": "List projects"},
+            {"name": "create_project", "description": "Create a new project"},
+            {"name": "list_cycles", "description": "List cycles/sprints"},
+        ],
+        resources=[
+            {"uri": "linear://issues", "description": "List of issues"},
+            {"uri": "linear://projects", "description": "List of projects"},
+            {"uri": "linear://teams", "description": "List of teams"},
+        ],
+        config_schema={
+            "api_key": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="api_key",
+        documentation_url="https://developers.linear.app/docs",
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/linear",
+        downloads=12840,
+        rating=4.7,
+        featured=True,
+    ),
+    MCPServerConfig(
+        id="notion",
+        name="Notion",
+        description="Access and edit Notion pages, databases, and workspaces",
+        category=MCPCategory.DOCUMENTATION,
+        icon="notion",
+        author="Anthropic",
+        version="1.0.2",
+        tools=[
+            {"name": "get_page", "description": "Get a Notion page"},
+            {"name": "create_page", "description": "Create a new page"},
+            {"name": "update_page", "description": "Update a page"},
+            {"name": "search", "description": "Search Notion"},
+            {"name": "list_databases", "description": "List databases"},
+            {"name": "query_database", "description": "Query a database"},
+            {"name": "create_database", "description": "Create a database"},
+        ],
+        resources=[
+            {"uri": "notion://pages", "description": "List of pages"},
+            {"uri": "notion://databases", "description": "List of databases"},
+            {"uri": "notion://pages/{id}", "description": "Page content"},
+        ],
+        config_schema={
+            "integration_token": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="token",
+        documentation_url="https://developers.notion.com/docs",
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/notion",
+        downloads=18920,
+        rating=4.6,
+        featured=True,
+    ),
+    MCPServerConfig(
+        id="jira",
+        name="Jira",
+        description="Track issues, sprints, and projects in Jira",
+        category=MCPCategory.PROJECT_MANAGEMENT,
+        icon="jira",
+        author="Atlassian",
+        version="1.0.1",
+        tools=[
+            {"name": "create_issue", "description": "Create a Jira issue"},
+            {"name": "update_issue", "description": "Update an issue"},
+            {"name": "list_issues", "description": "List issues with JQL"},
+            {"name": "get_issue", "description": "Get issue details"},
+            {"name": "list_sprints", "description": "List sprints"},
+            {"name": "add_comment", "description": "Add a comment to an issue"},
+            {"name": "transition_issue", "description": "Transition issue status"},
+        ],
+        resources=[
+            {"uri": "jira://issues", "description": "List of issues"},
+            {"uri": "jira://projects", "description": "List of projects"},
+            {"uri": "jira://boards", "description": "List of boards"},
+        ],
+        config_schema={
+            "domain": {"type": "string", "required": True},
+            "email": {"type": "string", "required": True},
+            "api_token": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="basic",
+        documentation_url="https://developer.atlassian.com/cloud/jira/platform/rest/v3/",
+        downloads=9650,
+        rating=4.5,
+    ),
+    MCPServerConfig(
+        id="confluence",
+        name="Confluence",
+        description="Access and edit Confluence documentation and spaces",
+        category=MCPCategory.DOCUMENTATION,
+        icon="confluence",
+        author="Atlassian",
+        version="1.0.0",
+        tools=[
+            {"name": "get_page", "description": "Get a Confluence page"},
+            {"name": "create_page", "description": "Create a new page"},
+            {"name": "update_page", "description": "Update a page"},
+            {"name": "search", "description": "Search Confluence"},
+            {"name": "list_spaces", "description": "List spaces"},
+        ],
+        resources=[
+            {"uri": "confluence://pages", "description": "List of pages"},
+            {"uri": "confluence://spaces", "description": "List of spaces"},
+        ],
+        config_schema={
+            "domain": {"type": "string", "required": True},
+            "email": {"type": "string", "required": True},
+            "api_token": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="basic",
+        documentation_url="https://developer.atlassian.com/cloud/confluence/rest/v2/",
+        downloads=7230,
+        rating=4.4,
+    ),
+    MCPServerConfig(
+        id="postgres",
+        name="PostgreSQL",
+        description="Query and manage PostgreSQL databases",
+        category=MCPCategory.DATABASE,
+        icon="database",
+        author="Anthropic",
+        version="1.0.0",
+        tools=[
+            {"name": "query", "description": "Execute a SQL query"},
+            {"name": "list_tables", "description": "List database tables"},
+            {"name": "describe_table", "description": "Get table schema"},
+            {"name": "insert", "description": "Insert data into a table"},
+            {"name": "update", "description": "Update data in a table"},
+        ],
+        resources=[
+            {"uri": "postgres://tables", "description": "List of tables"},
+            {"uri": "postgres://schema/{table}", "description": "Table schema"},
+        ],
+        config_schema={
+            "connection_string": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="connection_string",
+        documentation_url="https://www.postgresql.org/docs/",
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/postgres",
+        downloads=11200,
+        rating=4.7,
+        featured=True,
+    ),
+    MCPServerConfig(
+        id="sqlite",
+        name="SQLite",
+        description="Query and manage SQLite databases",
+        category=MCPCategory.DATABASE,
+        icon="database",
+        author="Anthropic",
+        version="1.0.0",
+        tools=[
+            {"name": "query", "description": "Execute a SQL query"},
+            {"name": "list_tables", "description": "List database tables"},
+            {"name": "describe_table", "description": "Get table schema"},
+        ],
+        resources=[
+            {"uri": "sqlite://tables", "description": "List of tables"},
+        ],
+        config_schema={
+            "database_path": {"type": "string", "required": True},
+        },
+        requires_auth=False,
+        documentation_url="https://www.sqlite.org/docs.html",
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/sqlite",
+        downloads=8450,
+        rating=4.6,
+    ),
+    MCPServerConfig(
+        id="filesystem",
+        name="Filesystem",
+        description="Read and write files on the local filesystem",
+        category=MCPCategory.DEVELOPMENT,
+        icon="folder",
+        author="Anthropic",
+        version="1.0.0",
+        tools=[
+            {"name": "read_file", "description": "Read a file"},
+            {"name": "write_file", "description": "Write to a file"},
+            {"name": "list_directory", "description": "List directory contents"},
+            {"name": "create_directory", "description": "Create a directory"},
+            {"name": "delete", "description": "Delete a file or directory"},
+            {"name": "move", "description": "Move/rename a file"},
+        ],
+        resources=[
+            {"uri": "file://{path}", "description": "File contents"},
+        ],
+        config_schema={
+            "allowed_paths": {"type": "array", "required": True},
+        },
+        requires_auth=False,
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/filesystem",
+        downloads=21300,
+        rating=4.8,
+    ),
+    MCPServerConfig(
+        id="brave-search",
+        name="Brave Search",
+        description="Search the web using Brave Search API",
+        category=MCPCategory.OTHER,
+        icon="search",
+        author="Anthropic",
+        version="1.0.0",
+        tools=[
+            {"name": "search", "description": "Search the web"},
+            {"name": "news_search", "description": "Search news articles"},
+        ],
+        resources=[],
+        config_schema={
+            "api_key": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="api_key",
+        documentation_url="https://brave.com/search/api/",
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/brave-search",
+        downloads=6780,
+        rating=4.5,
+    ),
+    MCPServerConfig(
+        id="google-drive",
+        name="Google Drive",
+        description="Access and manage files in Google Drive",
+        category=MCPCategory.CLOUD,
+        icon="google-drive",
+        author="Google",
+        version="1.0.0",
+        tools=[
+            {"name": "list_files", "description": "List files in Drive"},
+            {"name": "get_file", "description": "Get file contents"},
+            {"name": "upload_file", "description": "Upload a file"},
+            {"name": "create_folder", "description": "Create a folder"},
+            {"name": "share_file", "description": "Share a file"},
+            {"name": "search", "description": "Search files"},
+        ],
+        resources=[
+            {"uri": "gdrive://files", "description": "List of files"},
+            {"uri": "gdrive://files/{id}", "description": "File contents"},
+        ],
+        config_schema={
+            "credentials_json": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="oauth",
+        documentation_url="https://developers.google.com/drive/api/guides/about-sdk",
+        downloads=14500,
+        rating=4.6,
+    ),
+    MCPServerConfig(
+        id="aws",
+        name="AWS",
+        description="Interact with AWS services (S3, Lambda, EC2, etc.)",
+        category=MCPCategory.CLOUD,
+        icon="aws",
+        author="Amazon",
+        version="1.0.0",
+        tools=[
+            {"name": "s3_list_buckets", "description": "List S3 buckets"},
+            {"name": "s3_get_object", "description": "Get S3 object"},
+            {"name": "s3_put_object", "description": "Put S3 object"},
+            {"name": "lambda_invoke", "description": "Invoke Lambda function"},
+            {"name": "ec2_list_instances", "description": "List EC2 instances"},
+        ],
+        resources=[
+            {"uri": "aws://s3/buckets", "description": "S3 buckets"},
+            {"uri": "aws://lambda/functions", "description": "Lambda functions"},
+        ],
+        config_schema={
+            "access_key_id": {"type": "string", "required": True, "secret": True},
+            "secret_access_key": {"type": "string", "required": True, "secret": True},
+            "region": {"type": "string", "required": True},
+        },
+        requires_auth=True,
+        auth_type="aws_credentials",
+        documentation_url="https://docs.aws.amazon.com/",
+        downloads=9870,
+        rating=4.5,
+    ),
+    MCPServerConfig(
+        id="sentry",
+        name="Sentry",
+        description="Monitor errors and performance with Sentry",
+        category=MCPCategory.ANALYTICS,
+        icon="sentry",
+        author="Sentry",
+        version="1.0.0",
+        tools=[
+            {"name": "list_issues", "description": "List error issues"},
+            {"name": "get_issue", "description": "Get issue details"},
+            {"name": "resolve_issue", "description": "Resolve an issue"},
+            {"name": "list_projects", "description": "List projects"},
+        ],
+        resources=[
+            {"uri": "sentry://issues", "description": "List of issues"},
+            {"uri": "sentry://projects", "description": "List of projects"},
+        ],
+        config_schema={
+            "auth_token": {"type": "string", "required": True, "secret": True},
+            "organization": {"type": "string", "required": True},
+        },
+        requires_auth=True,
+        auth_type="token",
+        documentation_url="https://docs.sentry.io/api/",
+        downloads=5430,
+        rating=4.4,
+    ),
+    MCPServerConfig(
+        id="datadog",
+        name="Datadog",
+        description="Monitor metrics, logs, and traces with Datadog",
+        category=MCPCategory.ANALYTICS,
+        icon="datadog",
+        author="Datadog",
+        version="1.0.0",
+        tools=[
+            {"name": "query_metrics", "description": "Query metrics"},
+            {"name": "search_logs", "description": "Search logs"},
+            {"name": "list_monitors", "description": "List monitors"},
+            {"name": "create_monitor", "description": "Create a monitor"},
+        ],
+        resources=[
+            {"uri": "datadog://metrics", "description": "Available metrics"},
+            {"uri": "datadog://monitors", "description": "List of monitors"},
+        ],
+        config_schema={
+            "api_key": {"type": "string", "required": True, "secret": True},
+            "app_key": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="api_key",
+        documentation_url="https://docs.datadoghq.com/api/",
+        downloads=4210,
+        rating=4.3,
+    ),
+    MCPServerConfig(
+        id="openai",
+        name="OpenAI",
+        description="Access OpenAI models and APIs",
+        category=MCPCategory.AI_ML,
+        icon="openai",
+        author="OpenAI",
+        version="1.0.0",
+        tools=[
+            {"name": "chat_completion", "description": "Generate chat completions"},
+            {"name": "embeddings", "description": "Generate embeddings"},
+            {"name": "image_generation", "description": "Generate images with DALL-E"},
+            {"name": "speech_to_text", "description": "Transcribe audio"},
+        ],
+        resources=[
+            {"uri": "openai://models", "description": "Available models"},
+        ],
+        config_schema={
+            "api_key": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="api_key",
+        documentation_url="https://platform.openai.com/docs/api-reference",
+        downloads=18900,
+        rating=4.8,
+    ),
+    MCPServerConfig(
+        id="puppeteer",
+        name="Puppeteer",
+        description="Browser automation and web scraping",
+        category=MCPCategory.DEVELOPMENT,
+        icon="chrome",
+        author="Anthropic",
+        version="1.0.0",
+        tools=[
+            {"name": "navigate", "description": "Navigate to a URL"},
+            {"name": "screenshot", "description": "Take a screenshot"},
+            {"name": "click", "description": "Click an element"},
+            {"name": "type", "description": "Type text"},
+            {"name": "evaluate", "description": "Execute JavaScript"},
+        ],
+        resources=[],
+        config_schema={},
+        requires_auth=False,
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/puppeteer",
+        downloads=7650,
+        rating=4.5,
+    ),
+    MCPServerConfig(
+        id="memory",
+        name="Memory",
+        description="Persistent memory storage for conversations",
+        category=MCPCategory.AI_ML,
+        icon="brain",
+        author="Anthropic",
+        version="1.0.0",
+        tools=[
+            {"name": "store", "description": "Store a memory"},
+            {"name": "retrieve", "description": "Retrieve memories"},
+            {"name": "search", "description": "Search memories"},
+            {"name": "delete", "description": "Delete a memory"},
+        ],
+        resources=[
+            {"uri": "memory://all", "description": "All stored memories"},
+        ],
+        config_schema={
+            "storage_path": {"type": "string", "required": False},
+        },
+        requires_auth=False,
+        repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/memory",
+        downloads=12340,
+        rating=4.6,
+    ),
+    MCPServerConfig(
+        id="discord",
+        name="Discord",
+        description="Send messages and manage Discord servers",
+        category=MCPCategory.COMMUNICATION,
+        icon="discord",
+        author="Discord",
+        version="1.0.0",
+        tools=[
+            {"name": "send_message", "description": "Send a message to a channel"},
+            {"name": "list_channels", "description": "List server channels"},
+            {"name": "list_members", "description": "List server members"},
+            {"name": "create_channel", "description": "Create a channel"},
+        ],
+        resources=[
+            {"uri": "discord://servers", "description": "List of servers"},
+            {"uri": "discord://channels", "description": "List of channels"},
+        ],
+        config_schema={
+            "bot_token": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="token",
+        documentation_url="https://discord.com/developers/docs",
+        downloads=6120,
+        rating=4.4,
+    ),
+    MCPServerConfig(
+        id="gitlab",
+        name="GitLab",
+        description="Manage GitLab repositories, merge requests, and CI/CD",
+        category=MCPCategory.DEVELOPMENT,
+        icon="gitlab",
+        author="GitLab",
+        version="1.0.0",
+        tools=[
+            {"name": "create_mr", "description": "Create a merge request"},
+            {"name": "list_mrs", "description": "List merge requests"},
+            {"name": "list_pipelines", "description": "List CI/CD pipelines"},
+            {"name": "create_issue", "description": "Create an issue"},
+            {"name": "list_issues", "description": "List issues"},
+        ],
+        resources=[
+            {"uri": "gitlab://projects", "description": "List of projects"},
+            {"uri": "gitlab://mrs", "description": "Merge requests"},
+        ],
+        config_schema={
+            "token": {"type": "string", "required": True, "secret": True},
+            "base_url": {"type": "string", "required": False},
+        },
+        requires_auth=True,
+        auth_type="token",
+        documentation_url="https://docs.gitlab.com/ee/api/",
+        downloads=5890,
+        rating=4.5,
+    ),
+    MCPServerConfig(
+        id="vercel",
+        name="Vercel",
+        description="Deploy and manage Vercel projects",
+        category=MCPCategory.CLOUD,
+        icon="vercel",
+        author="Vercel",
+        version="1.0.0",
+        tools=[
+            {"name": "list_projects", "description": "List projects"},
+            {"name": "list_deployments", "description": "List deployments"},
+            {"name": "create_deployment", "description": "Create a deployment"},
+            {"name": "get_deployment_logs", "description": "Get deployment logs"},
+        ],
+        resources=[
+            {"uri": "vercel://projects", "description": "List of projects"},
+            {"uri": "vercel://deployments", "description": "List of deployments"},
+        ],
+        config_schema={
+            "token": {"type": "string", "required": True, "secret": True},
+        },
+        requires_auth=True,
+        auth_type="token",
+        documentation_url="https://vercel.com/docs/rest-api",
+        downloads=4560,
+        rating=4.4,
+    ),
+)
 
 
 class MCPMarketplace:
     """MCP Server Marketplace registry."""
 
     def __init__(self):
-        self.registry: Dict[str, MCPServerConfig] = {}
-        self._populate_registry()
-
-    def _populate_registry(self) -> None:
-        """Populate the marketplace with available MCP servers."""
-        servers = [
-            MCPServerConfig(
-                id="slack",
-                name="Slack",
-                description="Send messages, manage channels, and interact with Slack workspaces",
-                category=MCPCategory.COMMUNICATION,
-                icon="slack",
-                author="Anthropic",
-                version="1.2.0",
-                tools=[
-                    {"name": "send_message", "description": "Send a message to a channel or user"},
-                    {"name": "list_channels", "description": "List available channels"},
-                    {"name": "get_messages", "description": "Get recent messages from a channel"},
-                    {"name": "create_channel", "description": "Create a new channel"},
-                    {"name": "upload_file", "description": "Upload a file to a channel"},
-                    {"name": "add_reaction", "description": "Add a reaction to a message"},
-                ],
-                resources=[
-                    {"uri": "slack://channels", "description": "List of channels"},
-                    {"uri": "slack://users", "description": "List of users"},
-                    {"uri": "slack://messages/{channel}", "description": "Messages in a channel"},
-                ],
-                config_schema={
-                    "bot_token": {"type": "string", "required": True, "secret": True},
-                    "app_token": {"type": "string", "required": False, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="oauth",
-                documentation_url="https://api.slack.com/docs",
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/slack",
-                downloads=15420,
-                rating=4.8,
-                featured=True,
-            ),
-            MCPServerConfig(
-                id="github",
-                name="GitHub",
-                description="Manage repositories, pull requests, issues, and GitHub Actions",
-                category=MCPCategory.DEVELOPMENT,
-                icon="github",
-                author="Anthropic",
-                version="1.3.0",
-                tools=[
-                    {"name": "create_repository", "description": "Create a new repository"},
-                    {"name": "create_pr", "description": "Create a pull request"},
-                    {"name": "list_prs", "description": "List pull requests"},
-                    {"name": "merge_pr", "description": "Merge a pull request"},
-                    {"name": "create_issue", "description": "Create an issue"},
-                    {"name": "list_issues", "description": "List repository issues"},
-                    {"name": "create_branch", "description": "Create a new branch"},
-                    {"name": "get_file", "description": "Get file contents"},
-                    {"name": "commit_files", "description": "Commit files to a branch"},
-                ],
-                resources=[
-                    {"uri": "github://repos", "description": "List of repositories"},
-                    {"uri": "github://repos/{owner}/{repo}", "description": "Repository details"},
-                    {"uri": "github://repos/{owner}/{repo}/pulls", "description": "Pull requests"},
-                    {"uri": "github://repos/{owner}/{repo}/issues", "description": "Issues"},
-                ],
-                config_schema={
-                    "token": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="token",
-                documentation_url="https://docs.github.com/en/rest",
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/github",
-                downloads=28350,
-                rating=4.9,
-                featured=True,
-            ),
-            MCPServerConfig(
-                id="linear",
-                name="Linear",
-                description="Manage issues, projects, and sprints in Linear",
-                category=MCPCategory.PROJECT_MANAGEMENT,
-                icon="linear",
-                author="Anthropic",
-                version="1.1.0",
-                tools=[
-                    {"name": "create_issue", "description": "Create a new issue"},
-                    {"name": "update_issue", "description": "Update an existing issue"},
-                    {"name": "list_issues", "description": "List issues with filters"},
-                    {"name": "get_issue", "description": "Get issue details"},
-                    {"name": "list_projects", "description": "List projects"},
-                    {"name": "create_project", "description": "Create a new project"},
-                    {"name": "list_cycles", "description": "List cycles/sprints"},
-                ],
-                resources=[
-                    {"uri": "linear://issues", "description": "List of issues"},
-                    {"uri": "linear://projects", "description": "List of projects"},
-                    {"uri": "linear://teams", "description": "List of teams"},
-                ],
-                config_schema={
-                    "api_key": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="api_key",
-                documentation_url="https://developers.linear.app/docs",
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/linear",
-                downloads=12840,
-                rating=4.7,
-                featured=True,
-            ),
-            MCPServerConfig(
-                id="notion",
-                name="Notion",
-                description="Access and edit Notion pages, databases, and workspaces",
-                category=MCPCategory.DOCUMENTATION,
-                icon="notion",
-                author="Anthropic",
-                version="1.0.2",
-                tools=[
-                    {"name": "get_page", "description": "Get a Notion page"},
-                    {"name": "create_page", "description": "Create a new page"},
-                    {"name": "update_page", "description": "Update a page"},
-                    {"name": "search", "description": "Search Notion"},
-                    {"name": "list_databases", "description": "List databases"},
-                    {"name": "query_database", "description": "Query a database"},
-                    {"name": "create_database", "description": "Create a database"},
-                ],
-                resources=[
-                    {"uri": "notion://pages", "description": "List of pages"},
-                    {"uri": "notion://databases", "description": "List of databases"},
-                    {"uri": "notion://pages/{id}", "description": "Page content"},
-                ],
-                config_schema={
-                    "integration_token": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="token",
-                documentation_url="https://developers.notion.com/docs",
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/notion",
-                downloads=18920,
-                rating=4.6,
-                featured=True,
-            ),
-            MCPServerConfig(
-                id="jira",
-                name="Jira",
-                description="Track issues, sprints, and projects in Jira",
-                category=MCPCategory.PROJECT_MANAGEMENT,
-                icon="jira",
-                author="Atlassian",
-                version="1.0.1",
-                tools=[
-                    {"name": "create_issue", "description": "Create a Jira issue"},
-                    {"name": "update_issue", "description": "Update an issue"},
-                    {"name": "list_issues", "description": "List issues with JQL"},
-                    {"name": "get_issue", "description": "Get issue details"},
-                    {"name": "list_sprints", "description": "List sprints"},
-                    {"name": "add_comment", "description": "Add a comment to an issue"},
-                    {"name": "transition_issue", "description": "Transition issue status"},
-                ],
-                resources=[
-                    {"uri": "jira://issues", "description": "List of issues"},
-                    {"uri": "jira://projects", "description": "List of projects"},
-                    {"uri": "jira://boards", "description": "List of boards"},
-                ],
-                config_schema={
-                    "domain": {"type": "string", "required": True},
-                    "email": {"type": "string", "required": True},
-                    "api_token": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="basic",
-                documentation_url="https://developer.atlassian.com/cloud/jira/platform/rest/v3/",
-                downloads=9650,
-                rating=4.5,
-            ),
-            MCPServerConfig(
-                id="confluence",
-                name="Confluence",
-                description="Access and edit Confluence documentation and spaces",
-                category=MCPCategory.DOCUMENTATION,
-                icon="confluence",
-                author="Atlassian",
-                version="1.0.0",
-                tools=[
-                    {"name": "get_page", "description": "Get a Confluence page"},
-                    {"name": "create_page", "description": "Create a new page"},
-                    {"name": "update_page", "description": "Update a page"},
-                    {"name": "search", "description": "Search Confluence"},
-                    {"name": "list_spaces", "description": "List spaces"},
-                ],
-                resources=[
-                    {"uri": "confluence://pages", "description": "List of pages"},
-                    {"uri": "confluence://spaces", "description": "List of spaces"},
-                ],
-                config_schema={
-                    "domain": {"type": "string", "required": True},
-                    "email": {"type": "string", "required": True},
-                    "api_token": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="basic",
-                documentation_url="https://developer.atlassian.com/cloud/confluence/rest/v2/",
-                downloads=7230,
-                rating=4.4,
-            ),
-            MCPServerConfig(
-                id="postgres",
-                name="PostgreSQL",
-                description="Query and manage PostgreSQL databases",
-                category=MCPCategory.DATABASE,
-                icon="database",
-                author="Anthropic",
-                version="1.0.0",
-                tools=[
-                    {"name": "query", "description": "Execute a SQL query"},
-                    {"name": "list_tables", "description": "List database tables"},
-                    {"name": "describe_table", "description": "Get table schema"},
-                    {"name": "insert", "description": "Insert data into a table"},
-                    {"name": "update", "description": "Update data in a table"},
-                ],
-                resources=[
-                    {"uri": "postgres://tables", "description": "List of tables"},
-                    {"uri": "postgres://schema/{table}", "description": "Table schema"},
-                ],
-                config_schema={
-                    "connection_string": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="connection_string",
-                documentation_url="https://www.postgresql.org/docs/",
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/postgres",
-                downloads=11200,
-                rating=4.7,
-                featured=True,
-            ),
-            MCPServerConfig(
-                id="sqlite",
-                name="SQLite",
-                description="Query and manage SQLite databases",
-                category=MCPCategory.DATABASE,
-                icon="database",
-                author="Anthropic",
-                version="1.0.0",
-                tools=[
-                    {"name": "query", "description": "Execute a SQL query"},
-                    {"name": "list_tables", "description": "List database tables"},
-                    {"name": "describe_table", "description": "Get table schema"},
-                ],
-                resources=[
-                    {"uri": "sqlite://tables", "description": "List of tables"},
-                ],
-                config_schema={
-                    "database_path": {"type": "string", "required": True},
-                },
-                requires_auth=False,
-                documentation_url="https://www.sqlite.org/docs.html",
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/sqlite",
-                downloads=8450,
-                rating=4.6,
-            ),
-            MCPServerConfig(
-                id="filesystem",
-                name="Filesystem",
-                description="Read and write files on the local filesystem",
-                category=MCPCategory.DEVELOPMENT,
-                icon="folder",
-                author="Anthropic",
-                version="1.0.0",
-                tools=[
-                    {"name": "read_file", "description": "Read a file"},
-                    {"name": "write_file", "description": "Write to a file"},
-                    {"name": "list_directory", "description": "List directory contents"},
-                    {"name": "create_directory", "description": "Create a directory"},
-                    {"name": "delete", "description": "Delete a file or directory"},
-                    {"name": "move", "description": "Move/rename a file"},
-                ],
-                resources=[
-                    {"uri": "file://{path}", "description": "File contents"},
-                ],
-                config_schema={
-                    "allowed_paths": {"type": "array", "required": True},
-                },
-                requires_auth=False,
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/filesystem",
-                downloads=21300,
-                rating=4.8,
-            ),
-            MCPServerConfig(
-                id="brave-search",
-                name="Brave Search",
-                description="Search the web using Brave Search API",
-                category=MCPCategory.OTHER,
-                icon="search",
-                author="Anthropic",
-                version="1.0.0",
-                tools=[
-                    {"name": "search", "description": "Search the web"},
-                    {"name": "news_search", "description": "Search news articles"},
-                ],
-                resources=[],
-                config_schema={
-                    "api_key": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="api_key",
-                documentation_url="https://brave.com/search/api/",
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/brave-search",
-                downloads=6780,
-                rating=4.5,
-            ),
-            MCPServerConfig(
-                id="google-drive",
-                name="Google Drive",
-                description="Access and manage files in Google Drive",
-                category=MCPCategory.CLOUD,
-                icon="google-drive",
-                author="Google",
-                version="1.0.0",
-                tools=[
-                    {"name": "list_files", "description": "List files in Drive"},
-                    {"name": "get_file", "description": "Get file contents"},
-                    {"name": "upload_file", "description": "Upload a file"},
-                    {"name": "create_folder", "description": "Create a folder"},
-                    {"name": "share_file", "description": "Share a file"},
-                    {"name": "search", "description": "Search files"},
-                ],
-                resources=[
-                    {"uri": "gdrive://files", "description": "List of files"},
-                    {"uri": "gdrive://files/{id}", "description": "File contents"},
-                ],
-                config_schema={
-                    "credentials_json": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="oauth",
-                documentation_url="https://developers.google.com/drive/api/guides/about-sdk",
-                downloads=14500,
-                rating=4.6,
-            ),
-            MCPServerConfig(
-                id="aws",
-                name="AWS",
-                description="Interact with AWS services (S3, Lambda, EC2, etc.)",
-                category=MCPCategory.CLOUD,
-                icon="aws",
-                author="Amazon",
-                version="1.0.0",
-                tools=[
-                    {"name": "s3_list_buckets", "description": "List S3 buckets"},
-                    {"name": "s3_get_object", "description": "Get S3 object"},
-                    {"name": "s3_put_object", "description": "Put S3 object"},
-                    {"name": "lambda_invoke", "description": "Invoke Lambda function"},
-                    {"name": "ec2_list_instances", "description": "List EC2 instances"},
-                ],
-                resources=[
-                    {"uri": "aws://s3/buckets", "description": "S3 buckets"},
-                    {"uri": "aws://lambda/functions", "description": "Lambda functions"},
-                ],
-                config_schema={
-                    "access_key_id": {"type": "string", "required": True, "secret": True},
-                    "secret_access_key": {"type": "string", "required": True, "secret": True},
-                    "region": {"type": "string", "required": True},
-                },
-                requires_auth=True,
-                auth_type="aws_credentials",
-                documentation_url="https://docs.aws.amazon.com/",
-                downloads=9870,
-                rating=4.5,
-            ),
-            MCPServerConfig(
-                id="sentry",
-                name="Sentry",
-                description="Monitor errors and performance with Sentry",
-                category=MCPCategory.ANALYTICS,
-                icon="sentry",
-                author="Sentry",
-                version="1.0.0",
-                tools=[
-                    {"name": "list_issues", "description": "List error issues"},
-                    {"name": "get_issue", "description": "Get issue details"},
-                    {"name": "resolve_issue", "description": "Resolve an issue"},
-                    {"name": "list_projects", "description": "List projects"},
-                ],
-                resources=[
-                    {"uri": "sentry://issues", "description": "List of issues"},
-                    {"uri": "sentry://projects", "description": "List of projects"},
-                ],
-                config_schema={
-                    "auth_token": {"type": "string", "required": True, "secret": True},
-                    "organization": {"type": "string", "required": True},
-                },
-                requires_auth=True,
-                auth_type="token",
-                documentation_url="https://docs.sentry.io/api/",
-                downloads=5430,
-                rating=4.4,
-            ),
-            MCPServerConfig(
-                id="datadog",
-                name="Datadog",
-                description="Monitor metrics, logs, and traces with Datadog",
-                category=MCPCategory.ANALYTICS,
-                icon="datadog",
-                author="Datadog",
-                version="1.0.0",
-                tools=[
-                    {"name": "query_metrics", "description": "Query metrics"},
-                    {"name": "search_logs", "description": "Search logs"},
-                    {"name": "list_monitors", "description": "List monitors"},
-                    {"name": "create_monitor", "description": "Create a monitor"},
-                ],
-                resources=[
-                    {"uri": "datadog://metrics", "description": "Available metrics"},
-                    {"uri": "datadog://monitors", "description": "List of monitors"},
-                ],
-                config_schema={
-                    "api_key": {"type": "string", "required": True, "secret": True},
-                    "app_key": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="api_key",
-                documentation_url="https://docs.datadoghq.com/api/",
-                downloads=4210,
-                rating=4.3,
-            ),
-            MCPServerConfig(
-                id="openai",
-                name="OpenAI",
-                description="Access OpenAI models and APIs",
-                category=MCPCategory.AI_ML,
-                icon="openai",
-                author="OpenAI",
-                version="1.0.0",
-                tools=[
-                    {"name": "chat_completion", "description": "Generate chat completions"},
-                    {"name": "embeddings", "description": "Generate embeddings"},
-                    {"name": "image_generation", "description": "Generate images with DALL-E"},
-                    {"name": "speech_to_text", "description": "Transcribe audio"},
-                ],
-                resources=[
-                    {"uri": "openai://models", "description": "Available models"},
-                ],
-                config_schema={
-                    "api_key": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="api_key",
-                documentation_url="https://platform.openai.com/docs/api-reference",
-                downloads=18900,
-                rating=4.8,
-            ),
-            MCPServerConfig(
-                id="puppeteer",
-                name="Puppeteer",
-                description="Browser automation and web scraping",
-                category=MCPCategory.DEVELOPMENT,
-                icon="chrome",
-                author="Anthropic",
-                version="1.0.0",
-                tools=[
-                    {"name": "navigate", "description": "Navigate to a URL"},
-                    {"name": "screenshot", "description": "Take a screenshot"},
-                    {"name": "click", "description": "Click an element"},
-                    {"name": "type", "description": "Type text"},
-                    {"name": "evaluate", "description": "Execute JavaScript"},
-                ],
-                resources=[],
-                config_schema={},
-                requires_auth=False,
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/puppeteer",
-                downloads=7650,
-                rating=4.5,
-            ),
-            MCPServerConfig(
-                id="memory",
-                name="Memory",
-                description="Persistent memory storage for conversations",
-                category=MCPCategory.AI_ML,
-                icon="brain",
-                author="Anthropic",
-                version="1.0.0",
-                tools=[
-                    {"name": "store", "description": "Store a memory"},
-                    {"name": "retrieve", "description": "Retrieve memories"},
-                    {"name": "search", "description": "Search memories"},
-                    {"name": "delete", "description": "Delete a memory"},
-                ],
-                resources=[
-                    {"uri": "memory://all", "description": "All stored memories"},
-                ],
-                config_schema={
-                    "storage_path": {"type": "string", "required": False},
-                },
-                requires_auth=False,
-                repository_url="https://github.com/modelcontextprotocol/servers/tree/main/src/memory",
-                downloads=12340,
-                rating=4.6,
-            ),
-            MCPServerConfig(
-                id="discord",
-                name="Discord",
-                description="Send messages and manage Discord servers",
-                category=MCPCategory.COMMUNICATION,
-                icon="discord",
-                author="Discord",
-                version="1.0.0",
-                tools=[
-                    {"name": "send_message", "description": "Send a message to a channel"},
-                    {"name": "list_channels", "description": "List server channels"},
-                    {"name": "list_members", "description": "List server members"},
-                    {"name": "create_channel", "description": "Create a channel"},
-                ],
-                resources=[
-                    {"uri": "discord://servers", "description": "List of servers"},
-                    {"uri": "discord://channels", "description": "List of channels"},
-                ],
-                config_schema={
-                    "bot_token": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="token",
-                documentation_url="https://discord.com/developers/docs",
-                downloads=6120,
-                rating=4.4,
-            ),
-            MCPServerConfig(
-                id="gitlab",
-                name="GitLab",
-                description="Manage GitLab repositories, merge requests, and CI/CD",
-                category=MCPCategory.DEVELOPMENT,
-                icon="gitlab",
-                author="GitLab",
-                version="1.0.0",
-                tools=[
-                    {"name": "create_mr", "description": "Create a merge request"},
-                    {"name": "list_mrs", "description": "List merge requests"},
-                    {"name": "list_pipelines", "description": "List CI/CD pipelines"},
-                    {"name": "create_issue", "description": "Create an issue"},
-                    {"name": "list_issues", "description": "List issues"},
-                ],
-                resources=[
-                    {"uri": "gitlab://projects", "description": "List of projects"},
-                    {"uri": "gitlab://mrs", "description": "Merge requests"},
-                ],
-                config_schema={
-                    "token": {"type": "string", "required": True, "secret": True},
-                    "base_url": {"type": "string", "required": False},
-                },
-                requires_auth=True,
-                auth_type="token",
-                documentation_url="https://docs.gitlab.com/ee/api/",
-                downloads=5890,
-                rating=4.5,
-            ),
-            MCPServerConfig(
-                id="vercel",
-                name="Vercel",
-                description="Deploy and manage Vercel projects",
-                category=MCPCategory.CLOUD,
-                icon="vercel",
-                author="Vercel",
-                version="1.0.0",
-                tools=[
-                    {"name": "list_projects", "description": "List projects"},
-                    {"name": "list_deployments", "description": "List deployments"},
-                    {"name": "create_deployment", "description": "Create a deployment"},
-                    {"name": "get_deployment_logs", "description": "Get deployment logs"},
-                ],
-                resources=[
-                    {"uri": "vercel://projects", "description": "List of projects"},
-                    {"uri": "vercel://deployments", "description": "List of deployments"},
-                ],
-                config_schema={
-                    "token": {"type": "string", "required": True, "secret": True},
-                },
-                requires_auth=True,
-                auth_type="token",
-                documentation_url="https://vercel.com/docs/rest-api",
-                downloads=4560,
-                rating=4.4,
-            ),
+        self.registry: Dict[str, MCPServerConfig] = {s.id: s for s in MARKETPLACE_SERVERS}
+        # Tool definitions keyed by server ID, then tool name
+        self.tool_index: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Compiled input_schema validators keyed by (server ID, tool name)
+        self.tool_validators: Dict[Tuple[str, str], Callable[[Any], Any]] = {}
+        # IDs of the servers providing each tool name, in registry order
+        self.tool_servers: Dict[str, List[str]] = {}
+        self._index_tools()
+        # Every server, most downloaded first
+        self.ranked: List[MCPServerConfig] = sorted(
+            self.registry.values(), key=attrgetter("downloads"), reverse=True
+        )
+        # Servers per category, in the same order
+        self._by_category: Dict[MCPCategory, List[MCPServerConfig]] = {
+            category: [] for category in MCPCategory
+        }
+        for server in self.ranked:
+            self._by_category[server.category].append(server)
+        self._featured = [s for s in self.registry.values() if s.featured]
+        # Lowercased name and description per server, NUL-joined so a query
+        # cannot match across the two
+        self._search_text: List[Tuple[str, MCPServerConfig]] = [
+            (f"{s.name.lower()}\x00{s.description.lower()}", s) for s in self.registry.values()
         ]
 
-        for server in servers:
-            self.registry[server.id] = server
+    def _index_tools(self) -> None:
+        """Index the tools of every registered server."""
+        for server in self.registry.values():
+            self.tool_index[server.id] = {t["name"]: t for t in server.tools}
+            for tool in server.tools:
+                self.tool_servers.setdefault(tool["name"], []).append(server.id)
+                if fastjsonschema is not None and "input_schema" in tool:
+                    self.tool_validators[server.id, tool["name"]] = fastjsonschema.compile(
+                        tool["input_schema"]
+                    )
 
     def get_all(self) -> List[MCPServerConfig]:
         """Get all servers in the registry."""
@@ -664,20 +741,48 @@ class MCPMarketplace:
         return self.registry.get(server_id)
 
     def get_by_category(self, category: MCPCategory) -> List[MCPServerConfig]:
-        """Get servers by category."""
-        return [s for s in self.registry.values() if s.category == category]
+        """Get servers by category, most downloaded first."""
+        return list(self._by_category[category])
+
+    def get_sorted(self, category: Optional[MCPCategory] = None) -> List[MCPServerConfig]:
+        """Get servers, optionally of one category, most downloaded first.
+
+        Returns the marketplace's own list, which callers must not modify.
+        """
+        if category is None:
+            return self.ranked
+        return self._by_category[category]
+
+    def count_by_category(self, category: MCPCategory) -> int:
+        """Count the servers in a category."""
+        return len(self._by_category[category])
 
     def get_featured(self) -> List[MCPServerConfig]:
         """Get featured servers."""
-        return [s for s in self.registry.values() if s.featured]
+        return list(self._featured)
 
     def search(self, query: str) -> List[MCPServerConfig]:
         """Search servers by name or description."""
         query_lower = query.lower()
-        return [
-            s for s in self.registry.values()
-            if query_lower in s.name.lower() or query_lower in s.description.lower()
-        ]
+        return [s for text, s in self._search_text if query_lower in text]
+
+
+mcp_marketplace = MCPMarketplace()
+
+
+def _mask_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Hide the values of config keys that look like credentials."""
+    return {
+        k: "***" if "secret" in k or "token" in k or "key" in k or "password" in k else v
+        for k, v in config.items()
+    }
+
+
+def _server_default(obj: Any) -> Dict[str, Any]:
+    """orjson fallback that renders marketplace server configs."""
+    if isinstance(obj, MCPServerConfig):
+        return obj.to_dict()
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
 
 
 class MCPTool(BaseTool):
@@ -686,20 +791,71 @@ class MCPTool(BaseTool):
     name = "mcp"
     description = "Interact with MCP servers for external service integrations"
 
+    __slots__ = (
+        "marketplace",
+        "installed_servers",
+        "connections",
+        "_installed_listing",
+        "_tool_failures",
+        "_resource_cache",
+        "_resource_cache_hits",
+        "_resource_cache_misses",
+        "_tool_listings",
+        "_tool_listing_prefixes",
+        "_tool_messages",
+        "_commands",
+    )
+
     def __init__(self):
-        self.marketplace = MCPMarketplace()
+        self.marketplace = mcp_marketplace
         self.installed_servers: Dict[str, Dict[str, Any]] = {}
         self.connections: Dict[str, Any] = {}
-
-    async def execute(self, command: str, **kwargs: Any) -> Dict[str, Any]:
-        """Execute an MCP operation."""
-        commands = {
+        # list_installed response, rebuilt after installs or connection changes
+        self._installed_listing: Optional[Dict[str, Any]] = None
+        # (server, tool, args hash) -> (failure count, first failure time)
+        self._tool_failures: Dict[Tuple[str, str, int], Tuple[int, float]] = {}
+        # (server, resource URI) -> (expiry time, response), least recently used first
+        self._resource_cache: OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = (
+            OrderedDict()
+        )
+        self._resource_cache_hits = 0
+        self._resource_cache_misses = 0
+        # Static part of each server's list_tools response. It is shared by every
+        # call, so the catalog lists are tuples that callers cannot extend.
+        self._tool_listings: Dict[str, Dict[str, Any]] = {
+            server_id: {
+                "success": True,
+                "server": server_id,
+                "name": server.name,
+                "tools": tuple(server.tools),
+                "resources": tuple(server.resources),
+            }
+            for server_id, server in self.marketplace.registry.items()
+        }
+        # Simulated call_tool result messages keyed by (server ID, tool name)
+        self._tool_messages: Dict[Tuple[str, str], str] = {
+            (server_id, tool["name"]): f"Tool '{tool['name']}' executed successfully on {server_id}"
+            for server_id, server in self.marketplace.registry.items()
+            for tool in server.tools
+        }
+        # The same listings as JSON, without the closing brace
+        self._tool_listing_prefixes: Dict[str, bytes] = {
+            server_id: orjson.dumps(listing)[:-1]
+            for server_id, listing in self._tool_listings.items()
+        }
+        # Command name -> handler, built once rather than on every execute()
+        self._commands: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
             "list_servers": self.list_servers,
             "list_tools": self.list_tools,
             "call_tool": self.call_tool,
+            "find_tool": self.find_tool,
+            "batch_execute": self.batch_execute,
             "read_resource": self.read_resource,
+            "cache_stats": self.cache_stats,
             "connect": self.connect_server,
             "disconnect": self.disconnect_server,
+            "warmup": self.warmup,
+            "connect_all": self.warmup,
             "marketplace_list": self.marketplace_list,
             "marketplace_search": self.marketplace_search,
             "marketplace_get": self.marketplace_get,
@@ -712,10 +868,53 @@ class MCPTool(BaseTool):
             "list_installed": self.list_installed,
         }
 
-        if command not in commands:
+    async def close(self) -> None:
+        """Drop every pooled server session."""
+        self.connections.clear()
+        self._installed_listing = None
+
+    def _forget_resources(self, server: str) -> None:
+        """Drop cached resource reads for a server."""
+        for key in [k for k in self._resource_cache if k[0] == server]:
+            del self._resource_cache[key]
+
+    def _ensure_connected(self, server: str) -> Dict[str, Any]:
+        """Return the pooled session for an installed server, opening it on first use."""
+        session = self.connections.get(server)
+        if session is None:
+            session = self.connections[server] = {
+                "connected_at": time.monotonic(),
+                "config": self.installed_servers[server].get("config", {}),
+            }
+            self._installed_listing = None
+        return session
+
+    async def _run_command(self, command: str, **kwargs: Any) -> Dict[str, Any]:
+        """Run a command; marketplace server configs are left as objects."""
+        handler = self._commands.get(command)
+        if handler is None:
             return {"error": f"Unknown command: {command}"}
 
-        return await commands[command](**kwargs)
+        return await handler(**kwargs)
+
+    async def execute(self, command: str, **kwargs: Any) -> Dict[str, Any]:
+        """Execute an MCP operation."""
+        result = await self._run_command(command, **kwargs)
+        servers = result.get("servers")
+        if servers and isinstance(servers[0], MCPServerConfig):
+            result["servers"] = [s.to_dict() for s in servers]
+        server = result.get("server")
+        if isinstance(server, MCPServerConfig):
+            result["server"] = server.to_dict()
+        return result
+
+    async def execute_json(self, command: str, **kwargs: Any) -> bytes:
+        """Execute an MCP operation and return the result as JSON bytes.
+
+        Server configs are serialized by orjson in the same pass as the
+        envelope, without building the intermediate list of dicts.
+        """
+        return orjson.dumps(await self._run_command(command, **kwargs), default=_server_default)
 
     async def marketplace_list(
         self,
@@ -726,15 +925,12 @@ class MCPTool(BaseTool):
     ) -> Dict[str, Any]:
         """List all servers in the marketplace."""
         if category:
-            try:
-                cat = MCPCategory(category)
-                servers = self.marketplace.get_by_category(cat)
-            except ValueError:
+            cat = CATEGORIES_BY_VALUE.get(category)
+            if cat is None:
                 return {"error": f"Invalid category: {category}"}
+            servers = self.marketplace.get_sorted(cat)
         else:
-            servers = self.marketplace.get_all()
-
-        servers = sorted(servers, key=lambda s: s.downloads, reverse=True)
+            servers = self.marketplace.get_sorted()
 
         start = (page - 1) * per_page
         end = start + per_page
@@ -742,7 +938,7 @@ class MCPTool(BaseTool):
 
         return {
             "success": True,
-            "servers": [s.to_dict() for s in paginated],
+            "servers": paginated,
             "total": len(servers),
             "page": page,
             "per_page": per_page,
@@ -758,7 +954,7 @@ class MCPTool(BaseTool):
         servers = self.marketplace.search(query)
         return {
             "success": True,
-            "servers": [s.to_dict() for s in servers],
+            "servers": servers,
             "count": len(servers),
             "query": query,
         }
@@ -775,7 +971,7 @@ class MCPTool(BaseTool):
 
         return {
             "success": True,
-            "server": server.to_dict(),
+            "server": server,
             "installed": server_id in self.installed_servers,
             "connected": server_id in self.connections,
         }
@@ -784,11 +980,10 @@ class MCPTool(BaseTool):
         """List all marketplace categories."""
         categories = []
         for cat in MCPCategory:
-            servers = self.marketplace.get_by_category(cat)
             categories.append({
                 "id": cat.value,
                 "name": cat.value.replace("_", " ").title(),
-                "count": len(servers),
+                "count": self.marketplace.count_by_category(cat),
             })
 
         return {
@@ -801,7 +996,7 @@ class MCPTool(BaseTool):
         servers = self.marketplace.get_featured()
         return {
             "success": True,
-            "servers": [s.to_dict() for s in servers],
+            "servers": servers,
             "count": len(servers),
         }
 
@@ -824,11 +1019,16 @@ class MCPTool(BaseTool):
                 "already_installed": True,
             }
 
+        config = config or {}
         self.installed_servers[server_id] = {
             "server": server.to_dict(),
-            "config": config or {},
+            "config": config,
+            # Rebuilt whenever config changes, so reads never rescan the keys
+            "masked_config": _mask_config(config),
             "enabled": True,
         }
+        self._installed_listing = None
+        self._tool_failures.clear()
 
         return {
             "success": True,
@@ -849,9 +1049,11 @@ class MCPTool(BaseTool):
 
         if server_id in self.connections:
             del self.connections[server_id]
+        self._forget_resources(server_id)
 
         server_info = self.installed_servers[server_id]
         del self.installed_servers[server_id]
+        self._installed_listing = None
 
         return {
             "success": True,
@@ -870,16 +1072,18 @@ class MCPTool(BaseTool):
         if server_id not in self.installed_servers:
             return {"error": f"Server not installed: {server_id}"}
 
-        self.installed_servers[server_id]["config"].update(config)
+        info = self.installed_servers[server_id]
+        info["config"].update(config)
+        info["masked_config"] = _mask_config(info["config"])
+        self._installed_listing = None
+        self._tool_failures.clear()
+        self._forget_resources(server_id)
 
         return {
             "success": True,
             "server_id": server_id,
             "message": "Configuration updated",
-            "config": {
-                k: "***" if "secret" in k or "token" in k or "key" in k or "password" in k else v
-                for k, v in self.installed_servers[server_id]["config"].items()
-            },
+            "config": info["masked_config"],
         }
 
     async def get_server_config(
@@ -892,23 +1096,20 @@ class MCPTool(BaseTool):
             return {"error": f"Server not installed: {server_id}"}
 
         server = self.marketplace.get_by_id(server_id)
-        config = self.installed_servers[server_id]["config"]
-
-        masked_config = {
-            k: "***" if "secret" in k or "token" in k or "key" in k or "password" in k else v
-            for k, v in config.items()
-        }
 
         return {
             "success": True,
             "server_id": server_id,
-            "config": masked_config,
+            "config": self.installed_servers[server_id]["masked_config"],
             "config_schema": server.config_schema if server else {},
             "enabled": self.installed_servers[server_id].get("enabled", True),
         }
 
     async def list_installed(self, **kwargs: Any) -> Dict[str, Any]:
         """List all installed MCP servers."""
+        if self._installed_listing is not None:
+            return self._installed_listing
+
         installed = []
         for server_id, info in self.installed_servers.items():
             installed.append({
@@ -921,11 +1122,12 @@ class MCPTool(BaseTool):
                 "configured": bool(info.get("config")),
             })
 
-        return {
+        self._installed_listing = {
             "success": True,
             "servers": installed,
             "count": len(installed),
         }
+        return self._installed_listing
 
     async def list_servers(self, **kwargs: Any) -> Dict[str, Any]:
         """List all installed MCP servers (for backward compatibility)."""
@@ -937,79 +1139,281 @@ class MCPTool(BaseTool):
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """List all tools and resources available on an MCP server."""
-        server_config = self.marketplace.get_by_id(server)
-        if not server_config:
+        listing = self._tool_listings.get(server)
+        if listing is None:
             return {"error": f"Server not found: {server}"}
 
+        return {**listing, "installed": server in self.installed_servers}
+
+    def list_tools_raw(self, server: str) -> Optional[bytes]:
+        """Return the list_tools response for a server as JSON bytes.
+
+        The static part is serialized once, so only the installed flag is
+        appended per call. Returns None for unknown servers.
+        """
+        prefix = self._tool_listing_prefixes.get(server)
+        if prefix is None:
+            return None
+        if server in self.installed_servers:
+            return prefix + b',"installed":true}'
+        return prefix + b',"installed":false}'
+
+    async def find_tool(
+        self,
+        tool_name: str,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """List the servers that provide a tool."""
+        servers = self.marketplace.tool_servers.get(tool_name, [])
         return {
             "success": True,
-            "server": server,
-            "name": server_config.name,
-            "tools": server_config.tools,
-            "resources": server_config.resources,
-            "installed": server in self.installed_servers,
+            "tool": tool_name,
+            "servers": [
+                {
+                    "id": server_id,
+                    "installed": server_id in self.installed_servers,
+                    "connected": server_id in self.connections,
+                }
+                for server_id in servers
+            ],
+            "count": len(servers),
         }
 
+    def _route_tool(self, tool_name: str) -> Optional[str]:
+        """Pick a server for a tool, preferring connected over installed ones."""
+        candidates = self.marketplace.tool_servers.get(tool_name, ())
+        for server_id in candidates:
+            if server_id in self.connections:
+                return server_id
+        for server_id in candidates:
+            if server_id in self.installed_servers:
+                return server_id
+        return None
+
     async def call_tool(
         self,
-        server: str,
         tool_name: str,
+        server: Optional[str] = None,
         tool_args: Optional[str] = None,
         **kwargs: Any,
     ) -> Dict[str, Any]:
-        """Execute a specific tool on an MCP server."""
+        """Execute a specific tool on an MCP server.
+
+        Without a server the tool is routed to a connected, or failing that an
+        installed, server that provides it.
+
+        A call that keeps failing with the same arguments is rejected without
+        being dispatched once it has failed MAX_REPEATED_TOOL_FAILURES times
+        within TOOL_FAILURE_WINDOW seconds, so agents cannot retry it forever.
+        """
+        if server is None:
+            server = self._route_tool(tool_name)
+            if server is None:
+                return {"error": f"No installed server provides tool: {tool_name}"}
+
+        key = (server, tool_name, hash(str(tool_args)))
+        now = time.monotonic()
+        failures = self._tool_failures.get(key)
+        if failures is not None and now - failures[1] >= TOOL_FAILURE_WINDOW:
+            failures = None
+        if failures is not None and failures[0] >= MAX_REPEATED_TOOL_FAILURES:
+            return {
+                "error": (
+                    f"Aborted: {tool_name} on {server} failed {failures[0]} times "
+                    "with the same arguments. Change the arguments before retrying."
+                ),
+                "loop_detected": True,
+            }
+
+        result = self._run_tool(server, tool_name, tool_args)
+        if "error" not in result:
+            self._tool_failures.pop(key, None)
+            return result
+
+        if failures is None:
+            if len(self._tool_failures) >= TOOL_FAILURE_TRACKER_SIZE:
+                self._tool_failures = {
+                    k: v for k, v in self._tool_failures.items()
+                    if now - v[1] < TOOL_FAILURE_WINDOW
+                }
+            self._tool_failures[key] = (1, now)
+        else:
+            self._tool_failures[key] = (failures[0] + 1, failures[1])
+        return result
+
+    def _run_tool(
+        self,
+        server: str,
+        tool_name: str,
+        tool_args: Optional[str],
+    ) -> Dict[str, Any]:
+        """Validate and dispatch a single tool call."""
         if server not in self.installed_servers:
             return {"error": f"Server not installed: {server}. Install it first using the marketplace."}
 
-        server_config = self.marketplace.get_by_id(server)
-        if not server_config:
+        tools = self.marketplace.tool_index.get(server)
+        if tools is None:
             return {"error": f"Server not found: {server}"}
 
-        tools = {t["name"]: t for t in server_config.tools}
         if tool_name not in tools:
             return {"error": f"Tool not found: {tool_name} on server {server}"}
 
         args = {}
         if tool_args:
             try:
-                args = json.loads(tool_args)
-            except json.JSONDecodeError:
+                args = orjson.loads(tool_args)
+            except orjson.JSONDecodeError:
                 return {"error": f"Invalid JSON in tool_args: {tool_args}"}
 
+        validate = self.marketplace.tool_validators.get((server, tool_name))
+        if validate is not None:
+            try:
+                args = validate(args)
+            except fastjsonschema.JsonSchemaException as e:
+                return {"error": f"Invalid tool_args for {tool_name}: {e.message}"}
+
+        self._ensure_connected(server)
+
         return {
             "success": True,
             "server": server,
             "tool": tool_name,
             "args": args,
             "result": {
-                "message": f"Tool '{tool_name}' executed successfully on {server}",
-                "simulated": True,
-                "note": "This is a simulated response. Connect to actual MCP server for real results.",
+                "message": self._tool_messages[server, tool_name],
+                **SIMULATED_TOOL_NOTE,
             },
         }
 
+    async def batch_execute(
+        self,
+        operations: List[Dict[str, Any]],
+        max_concurrent: int = 8,
+        stop_on_error: bool = False,
+        timeout_ms: Optional[int] = None,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Execute several independent tool calls concurrently.
+
+        Args:
+            operations: List of {server, tool_name, tool_args} dicts.
+            max_concurrent: Maximum number of calls in flight at once.
+            stop_on_error: Cancel the remaining calls after the first failure.
+            timeout_ms: Optional per-call timeout in milliseconds.
+
+        Returns:
+            Per-operation results in the order the operations were given.
+        """
+        if not isinstance(operations, list):
+            return {"error": "operations must be a list of tool calls"}
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+        timeout = timeout_ms / 1000 if timeout_ms else None
+
+        async def run(op: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                return await asyncio.wait_for(self.call_tool(**op), timeout)
+
+        def entry(index: int, outcome: Any) -> Dict[str, Any]:
+            op = operations[index]
+            tool = op.get("tool_name") if isinstance(op, dict) else None
+            if isinstance(outcome, asyncio.TimeoutError):
+                error = f"Timed out after {timeout_ms}ms"
+            elif isinstance(outcome, BaseException):
+                error = str(outcome) or type(outcome).__name__
+            elif "error" in outcome:
+                error = outcome["error"]
+            else:
+                return {"index": index, "tool": tool, "success": True, "result": outcome}
+            return {"index": index, "tool": tool, "success": False, "error": error}
+
+        if not stop_on_error:
+            outcomes = await asyncio.gather(
+                *(run(op) for op in operations), return_exceptions=True
+            )
+            results = [entry(i, outcome) for i, outcome in enumerate(outcomes)]
+        else:
+            tasks = {asyncio.ensure_future(run(op)): i for i, op in enumerate(operations)}
+            finished: Dict[int, Dict[str, Any]] = {}
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    index = tasks[task]
+                    outcome = task.exception() or task.result()
+                    finished[index] = entry(index, outcome)
+                if any(not r["success"] for r in finished.values()):
+                    for task in pending:
+                        task.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    for task in pending:
+                        index = tasks[task]
+                        finished[index] = entry(
+                            index, {"error": "Cancelled after an earlier operation failed"}
+                        )
+                    break
+            results = [finished[i] for i in sorted(finished)]
+
+        return {
+            "success": True,
+            "results": results,
+            "count": len(results),
+            "failed": sum(1 for r in results if not r["success"]),
+        }
+
     async def read_resource(
         self,
         server: str,
         resource_uri: str,
         **kwargs: Any,
     ) -> Dict[str, Any]:
-        """Read a specific resource from an MCP server."""
+        """Read a specific resource from an MCP server.
+
+        Successful reads are cached for RESOURCE_CACHE_TTL_SECONDS.
+        """
         if server not in self.installed_servers:
             return {"error": f"Server not installed: {server}. Install it first using the marketplace."}
 
+        key = (server, resource_uri)
+        now = time.monotonic()
+        cached = self._resource_cache.get(key)
+        if cached is not None and cached[0] > now:
+            self._resource_cache.move_to_end(key)
+            self._resource_cache_hits += 1
+            return cached[1]
+        self._resource_cache_misses += 1
+
         server_config = self.marketplace.get_by_id(server)
         if not server_config:
             return {"error": f"Server not found: {server}"}
 
-        return {
+        self._ensure_connected(server)
+
+        response = {
             "success": True,
             "server": server,
             "resource_uri": resource_uri,
             "content": {
                 "message": f"Resource '{resource_uri}' read successfully",
-                "simulated": True,
-                "note": "This is a simulated response. Connect to actual MCP server for real data.",
+                **SIMULATED_RESOURCE_NOTE,
+            },
+        }
+        self._resource_cache[key] = (now + RESOURCE_CACHE_TTL_SECONDS, response)
+        self._resource_cache.move_to_end(key)
+        if len(self._resource_cache) > RESOURCE_CACHE_MAX_ENTRIES:
+            self._resource_cache.popitem(last=False)
+        return response
+
+    async def cache_stats(self, **kwargs: Any) -> Dict[str, Any]:
+        """Report resource cache usage."""
+        return {
+            "success": True,
+            "resource_cache": {
+                "entries": len(self._resource_cache),
+                "max_entries": RESOURCE_CACHE_MAX_ENTRIES,
+                "ttl_seconds": RESOURCE_CACHE_TTL_SECONDS,
+                "hits": self._resource_cache_hits,
+                "misses": self._resource_cache_misses,
             },
         }
 
@@ -1030,10 +1434,9 @@ class MCPTool(BaseTool):
                 "message": "Already connected",
             }
 
-        self.connections[server] = {
-            "connected_at": asyncio.get_event_loop().time(),
-            "config": config or self.installed_servers[server].get("config", {}),
-        }
+        session = self._ensure_connected(server)
+        if config:
+            session["config"] = config
 
         server_config = self.marketplace.get_by_id(server)
         name = server_config.name if server_config else server
@@ -1044,6 +1447,40 @@ class MCPTool(BaseTool):
             "message": f"Connected to {name}",
         }
 
+    async def warmup(
+        self,
+        server_ids: Optional[List[str]] = None,
+        max_concurrent: int = 4,
+        **kwargs: Any,
+    ) -> Dict[str, Any]:
+        """Open sessions for several installed servers up front.
+
+        Args:
+            server_ids: Servers to connect; defaults to every installed server.
+            max_concurrent: Maximum number of connections opened at once.
+
+        Returns:
+            The connect result for each server.
+        """
+        if server_ids is None:
+            server_ids = list(self.installed_servers)
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrent))
+
+        async def connect(server_id: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.connect_server(server_id)
+                except Exception as e:
+                    return {"error": str(e)}
+
+        results = await asyncio.gather(*(connect(s) for s in server_ids))
+        return {
+            "success": True,
+            "results": dict(zip(server_ids, results)),
+            "connected": sum(1 for r in results if r.get("success")),
+        }
+
     async def disconnect_server(
         self,
         server: str,
@@ -1058,6 +1495,7 @@ class MCPTool(BaseTool):
             }
 
         del self.connections[server]
+        self._installed_listing = None
 
         server_config = self.marketplace.get_by_id(server)
         name = server_config.name if server_config else server
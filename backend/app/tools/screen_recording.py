@@ -2,13 +2,52 @@
 
 import asyncio
 import os
+import shutil
 import uuid
+from asyncio.subprocess import Process
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from app.tools.base import BaseTool
 
+try:
+    import mss
+    import mss.tools
+except ImportError:
+    mss = None
+
+# Hardware H.264 encoders in order of preference, as
+# (name, args before the input, args after the input)
+HW_ENCODERS: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("h264_nvenc", (), ("-c:v", "h264_nvenc", "-preset", "p1", "-tune", "ll")),
+    ("h264_qsv", (), ("-c:v", "h264_qsv", "-preset", "veryfast")),
+    (
+        "h264_vaapi",
+        ("-vaapi_device", "/dev/dri/renderD128"),
+        ("-vf", "format=nv12,hwupload", "-c:v", "h264_vaapi"),
+    ),
+)
+
+# CPU fallback when no hardware encoder is usable
+SOFTWARE_ENCODER: Tuple[str, Tuple[str, ...], Tuple[str, ...]] = (
+    "libx264", (), ("-c:v", "libx264", "-preset", "ultrafast", "-crf", "23"),
+)
+
+
+@lru_cache(maxsize=None)
+def _which(program: str) -> Optional[str]:
+    """Resolve an executable on PATH once per process."""
+    return shutil.which(program)
+
+
+def _grab_screen(display: str, output: str) -> None:
+    """Capture the whole X display to a PNG over MIT-SHM, without a subprocess."""
+    with mss.mss(display=display) as sct:
+        image = sct.grab(sct.monitors[0])
+        mss.tools.to_png(image.rgb, image.size, output=output)
+
 
 class ScreenRecordingTool(BaseTool):
     """Tool for recording screen/browser interactions."""
@@ -20,10 +59,14 @@ class ScreenRecordingTool(BaseTool):
         self.recordings_dir = Path("/tmp/kevin-recordings")
         self.recordings_dir.mkdir(parents=True, exist_ok=True)
         self.active_recordings: Dict[str, Dict[str, Any]] = {}
-
-    async def execute(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
-        """Execute a screen recording operation."""
-        operations = {
+        # ffmpeg handles kept apart so active_recordings stays serializable
+        self._processes: Dict[str, Process] = {}
+        # recording_id -> file, so lookups don't rescan the directory
+        self._recording_paths: Dict[str, Path] = {}
+        # Encoder picked by the first recording, reused for the rest
+        self._encoder: Optional[Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = None
+        # Operation name -> handler, built once rather than on every execute()
+        self._operations: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {
             "start": self.start_recording,
             "stop": self.stop_recording,
             "status": self.get_status,
@@ -33,10 +76,50 @@ class ScreenRecordingTool(BaseTool):
             "screenshot": self.take_screenshot,
         }
 
-        if operation not in operations:
+    async def execute(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
+        """Execute a screen recording operation."""
+        handler = self._operations.get(operation)
+        if handler is None:
             return {"error": f"Unknown operation: {operation}"}
 
-        return await operations[operation](**kwargs)
+        return await handler(**kwargs)
+
+    async def _select_encoder(
+        self, ffmpeg: str
+    ) -> Tuple[str, Tuple[str, ...], Tuple[str, ...]]:
+        """Pick the first hardware encoder that can actually encode a frame."""
+        if self._encoder is not None:
+            return self._encoder
+
+        self._encoder = SOFTWARE_ENCODER
+        process = await asyncio.create_subprocess_exec(
+            ffmpeg, "-hide_banner", "-encoders",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+        )
+        stdout, _ = await process.communicate()
+        available = stdout.decode(errors="replace")
+
+        for encoder in HW_ENCODERS:
+            name, input_args, output_args = encoder
+            if f" {name} " not in available:
+                continue
+            # Being compiled in doesn't mean the device is present; try one frame
+            probe = await asyncio.create_subprocess_exec(
+                ffmpeg, "-hide_banner",
+                *input_args,
+                "-f", "lavfi", "-i", "color=size=256x256",
+                "-frames:v", "1",
+                *output_args,
+                "-f", "null", "-",
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            if await probe.wait() == 0:
+                self._encoder = encoder
+                break
+
+        return self._encoder
 
     async def start_recording(
         self,
@@ -61,33 +144,29 @@ class ScreenRecordingTool(BaseTool):
             filepath = self.recordings_dir / filename
 
             # Check if ffmpeg is available
-            check_process = await asyncio.create_subprocess_exec(
-                "which", "ffmpeg",
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await check_process.communicate()
-
-            if check_process.returncode != 0:
+            ffmpeg = _which("ffmpeg")
+            if ffmpeg is None:
                 return {
                     "error": "ffmpeg not installed. Screen recording requires ffmpeg.",
                     "suggestion": "Install ffmpeg with: apt-get install ffmpeg",
                 }
 
+            encoder, input_args, output_args = await self._select_encoder(ffmpeg)
+
             # Start ffmpeg recording process
             # Using x11grab for X11 display capture
             process = await asyncio.create_subprocess_exec(
-                "ffmpeg",
+                ffmpeg,
                 "-y",  # Overwrite output
+                *input_args,
                 "-f", "x11grab",
                 "-framerate", str(framerate),
                 "-i", display,
-                "-c:v", "libx264",
-                "-preset", "ultrafast",
-                "-crf", "23",
+                *output_args,
                 str(filepath),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                # Nothing reads these; a full pipe would stall ffmpeg mid-recording
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.DEVNULL,
             )
 
             self.active_recordings[recording_id] = {
@@ -98,10 +177,12 @@ class ScreenRecordingTool(BaseTool):
                 "filename": filename,
                 "started_at": datetime.utcnow().isoformat(),
                 "status": "recording",
-                "process": process,
                 "display": display,
                 "framerate": framerate,
+                "encoder": encoder,
             }
+            self._processes[recording_id] = process
+            self._recording_paths[recording_id] = filepath
 
             return {
                 "success": True,
@@ -133,10 +214,10 @@ class ScreenRecordingTool(BaseTool):
                 recording = self.active_recordings[recording_id]
             else:
                 # Stop most recent recording
-                recording_id = list(self.active_recordings.keys())[-1]
+                recording_id = next(reversed(self.active_recordings))
                 recording = self.active_recordings[recording_id]
 
-            process = recording.get("process")
+            process = self._processes.pop(recording_id, None)
             if process:
                 # Send 'q' to ffmpeg to stop gracefully
                 try:
@@ -148,7 +229,6 @@ class ScreenRecordingTool(BaseTool):
 
             recording["status"] = "completed"
             recording["stopped_at"] = datetime.utcnow().isoformat()
-            del recording["process"]
 
             # Check if file was created
             filepath = Path(recording["filepath"])
@@ -186,17 +266,10 @@ class ScreenRecordingTool(BaseTool):
             if recording_id:
                 if recording_id in self.active_recordings:
                     recording = self.active_recordings[recording_id].copy()
-                    if "process" in recording:
-                        del recording["process"]
                     return {"success": True, "recording": recording}
                 return {"error": f"Recording not found: {recording_id}"}
 
-            active = []
-            for rid, rec in self.active_recordings.items():
-                rec_copy = rec.copy()
-                if "process" in rec_copy:
-                    del rec_copy["process"]
-                active.append(rec_copy)
+            active = [rec.copy() for rec in self.active_recordings.values()]
 
             return {
                 "success": True,
@@ -217,19 +290,25 @@ class ScreenRecordingTool(BaseTool):
             session_id: Filter by session ID (optional)
         """
         try:
-            recordings = []
-            for filepath in self.recordings_dir.glob("*.mp4"):
-                stat = filepath.stat()
-                recording = {
-                    "filename": filepath.name,
-                    "filepath": str(filepath),
+            # scandir hands back the stat from the directory walk itself
+            with os.scandir(self.recordings_dir) as entries:
+                found = [
+                    (entry.stat(), entry)
+                    for entry in entries
+                    if entry.name.endswith(".mp4") and entry.is_file()
+                ]
+
+            # Sort by creation time, newest first, on the raw timestamp
+            found.sort(key=lambda item: item[0].st_ctime, reverse=True)
+            recordings = [
+                {
+                    "filename": entry.name,
+                    "filepath": entry.path,
                     "size": stat.st_size,
                     "created_at": datetime.fromtimestamp(stat.st_ctime).isoformat(),
                 }
-                recordings.append(recording)
-
-            # Sort by creation time, newest first
-            recordings.sort(key=lambda x: x["created_at"], reverse=True)
+                for stat, entry in found
+            ]
 
             return {
                 "success": True,
@@ -240,6 +319,20 @@ class ScreenRecordingTool(BaseTool):
         except Exception as e:
             return {"error": str(e)}
 
+    def _find_recording(self, recording_id: str) -> Optional[Path]:
+        """Find the recording file with recording_id in its name."""
+        filepath = self._recording_paths.get(recording_id)
+        if filepath is not None and filepath.exists():
+            return filepath
+
+        # Not indexed yet (e.g. recorded before a restart): scan once and remember it
+        with os.scandir(self.recordings_dir) as entries:
+            for entry in entries:
+                if recording_id in entry.name and entry.name.endswith(".mp4"):
+                    filepath = self._recording_paths[recording_id] = Path(entry.path)
+                    return filepath
+        return None
+
     async def get_recording(
         self,
         recording_id: Optional[str] = None,
@@ -256,11 +349,9 @@ class ScreenRecordingTool(BaseTool):
             if filename:
                 filepath = self.recordings_dir / filename
             elif recording_id:
-                # Search for file with recording_id in name
-                matches = list(self.recordings_dir.glob(f"*{recording_id}*.mp4"))
-                if not matches:
+                filepath = self._find_recording(recording_id)
+                if filepath is None:
                     return {"error": f"Recording not found: {recording_id}"}
-                filepath = matches[0]
             else:
                 return {"error": "Provide recording_id or filename"}
 
@@ -294,10 +385,9 @@ class ScreenRecordingTool(BaseTool):
             if filename:
                 filepath = self.recordings_dir / filename
             elif recording_id:
-                matches = list(self.recordings_dir.glob(f"*{recording_id}*.mp4"))
-                if not matches:
+                filepath = self._find_recording(recording_id)
+                if filepath is None:
                     return {"error": f"Recording not found: {recording_id}"}
-                filepath = matches[0]
             else:
                 return {"error": "Provide recording_id or filename"}
 
@@ -305,6 +395,8 @@ class ScreenRecordingTool(BaseTool):
                 return {"error": f"File not found: {filepath}"}
 
             filepath.unlink()
+            if recording_id:
+                self._recording_paths.pop(recording_id, None)
             return {
                 "success": True,
                 "message": f"Deleted: {filepath.name}",
@@ -330,38 +422,56 @@ class ScreenRecordingTool(BaseTool):
             filename = f"screenshot_{timestamp}_{screenshot_id}.png"
             filepath = self.recordings_dir / filename
 
-            # Try using scrot or import (ImageMagick)
-            for cmd in [["scrot", str(filepath)], ["import", "-window", "root", str(filepath)]]:
+            # In-process capture first; PNG encoding is CPU work, so keep it off the loop
+            if mss is not None:
                 try:
-                    process = await asyncio.create_subprocess_exec(
-                        *cmd,
-                        stdout=asyncio.subprocess.PIPE,
-                        stderr=asyncio.subprocess.PIPE,
-                        env={**os.environ, "DISPLAY": display},
-                    )
-                    await process.communicate()
-                    if process.returncode == 0 and filepath.exists():
-                        return {
-                            "success": True,
-                            "filename": filename,
-                            "filepath": str(filepath),
-                            "size": filepath.stat().st_size,
-                        }
-                except FileNotFoundError:
+                    await asyncio.to_thread(_grab_screen, display, str(filepath))
+                except mss.exception.ScreenShotError:
+                    pass
+                else:
+                    return {
+                        "success": True,
+                        "filename": filename,
+                        "filepath": str(filepath),
+                        "size": filepath.stat().st_size,
+                    }
+
+            # Try using scrot or import (ImageMagick)
+            for program, *args in [["scrot"], ["import", "-window", "root"]]:
+                executable = _which(program)
+                if executable is None:
                     continue
+                process = await asyncio.create_subprocess_exec(
+                    executable,
+                    *args,
+                    str(filepath),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    env={**os.environ, "DISPLAY": display},
+                )
+                await process.communicate()
+                if process.returncode == 0 and filepath.exists():
+                    return {
+                        "success": True,
+                        "filename": filename,
+                        "filepath": str(filepath),
+                        "size": filepath.stat().st_size,
+                    }
 
             # Fallback: try ffmpeg single frame capture
-            process = await asyncio.create_subprocess_exec(
-                "ffmpeg",
-                "-y",
-                "-f", "x11grab",
-                "-i", display,
-                "-frames:v", "1",
-                str(filepath),
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
-            await process.communicate()
+            ffmpeg = _which("ffmpeg")
+            if ffmpeg is not None:
+                process = await asyncio.create_subprocess_exec(
+                    ffmpeg,
+                    "-y",
+                    "-f", "x11grab",
+                    "-i", display,
+                    "-frames:v", "1",
+                    str(filepath),
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                )
+                await process.communicate()
 
             if filepath.exists():
                 return {
@@ -372,7 +482,7 @@ class ScreenRecordingTool(BaseTool):
                 }
 
             return {
-                "error": "Failed to take screenshot. Install scrot, imagemagick, or ffmpeg.",
+                "error": "Failed to take screenshot. Install mss, scrot, imagemagick, or ffmpeg.",
             }
         except Exception as e:
             return {"error": str(e)}
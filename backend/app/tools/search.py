@@ -2,12 +2,150 @@
 
 import asyncio
 import fnmatch
+import heapq
+import mmap
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 from app.tools.base import BaseTool
 
+# Bytes read from ripgrep's stdout per await
+RG_READ_CHUNK_SIZE = 64 * 1024
+
+# Leading bytes checked for NUL to decide a file is binary, like rg does
+BINARY_SNIFF_SIZE = 8192
+
+# Paths returned by glob_search
+MAX_GLOB_RESULTS = 1000
+
+# Files scanned concurrently on the thread pool (also caps open descriptors)
+MAX_CONCURRENT_FILE_SCANS = 64
+
+# Pattern syntax whose bytes form differs from the str form on non-ASCII text
+# (any char, Unicode classes and word boundaries, negated sets)
+_UNICODE_SYNTAX_RE = re.compile(r"\.|\\[wWbBsSdD]|\[\^")
+
+
+@lru_cache(maxsize=256)
+def _glob_matcher(pattern: str) -> Callable[[str], Optional["re.Match[str]"]]:
+    """Compile a glob pattern to a name matcher; the same few patterns recur."""
+    return re.compile(fnmatch.translate(pattern)).match
+
+
+def _walk_entries(root: str) -> Iterator[os.DirEntry]:
+    """Yield every entry under root, using dirent types instead of stat.
+
+    Directories are descended into; symlinks to directories are yielded but not followed.
+    """
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    yield entry
+        except OSError:
+            continue
+
+
+def _walk_files(root: str) -> Iterator[str]:
+    """Yield every regular file under root."""
+    for entry in _walk_entries(root):
+        if entry.is_file(follow_symlinks=False):
+            yield entry.path
+
+
+def _glob_paths(root: str, pattern: str) -> List[str]:
+    """Return the first MAX_GLOB_RESULTS paths under root matching pattern, sorted."""
+    if "**" in pattern:
+        # Use pathlib glob for ** patterns
+        paths = (str(match) for match in Path(root).glob(pattern))
+    else:
+        # Match file and directory names anywhere under root
+        match_name = _glob_matcher(pattern)
+        paths = (entry.path for entry in _walk_entries(root) if match_name(entry.name))
+    # Bounded heap, so only MAX_GLOB_RESULTS paths are held however many match
+    return heapq.nsmallest(MAX_GLOB_RESULTS, paths)
+
+
+def _candidate_files(path: str, glob_pattern: Optional[str]) -> List[str]:
+    """List the files the Python grep fallback should search."""
+    base_path = Path(path)
+    if base_path.is_file():
+        return [path]
+    if glob_pattern and ("/" in glob_pattern or "**" in glob_pattern):
+        return [str(f) for f in base_path.glob(glob_pattern) if f.is_file()]
+    if glob_pattern:
+        # Bare name patterns match at any depth, as with rg --glob
+        match_name = _glob_matcher(glob_pattern)
+        return [f for f in _walk_files(path) if match_name(os.path.basename(f))]
+    return list(_walk_files(path))
+
+
+def _needs_text_regex(pattern: str, case_insensitive: bool) -> bool:
+    """Whether pattern must run on decoded text to match as the str regex would."""
+    return (
+        case_insensitive
+        or not pattern.isascii()
+        or _UNICODE_SYNTAX_RE.search(pattern) is not None
+    )
+
+
+def _scan_file(file_path: str, regex: "re.Pattern", output_mode: str) -> List[str]:
+    """Search one file in place through mmap, decoding only the lines that match.
+
+    A str regex is run over the decoded file instead, after the same binary check.
+    """
+    try:
+        with open(file_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return []
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(b"\0", 0, BINARY_SNIFF_SIZE) != -1:
+                    return []
+
+                text = isinstance(regex.pattern, str)
+                buf = mm[:].decode("utf-8", errors="replace") if text else mm
+                newline = "\n" if text else b"\n"
+
+                if output_mode == "files_with_matches":
+                    return [file_path] if regex.search(buf) else []
+                if output_mode == "count":
+                    count = sum(1 for _ in regex.finditer(buf))
+                    return [f"{file_path}:{count}"] if count else []
+
+                # The whole-buffer search only finds candidate lines: a hit may span
+                # newlines, so each line is re-checked on its own, as rg matches per line
+                results: List[str] = []
+                line_no = 1
+                counted_to = 0
+                pos = 0
+                while pos <= len(buf):  # search() clamps pos, so bound it here
+                    match = regex.search(buf, pos)
+                    if match is None:
+                        break
+                    start = match.start()
+                    line_start = buf.rfind(newline, 0, start) + 1
+                    line_end = buf.find(newline, start)
+                    if line_end == -1:
+                        line_end = len(buf)
+                    pos = line_end + 1  # Resume on the next line
+                    line = buf[line_start:line_end]
+                    if regex.search(line) is None:
+                        continue
+                    line_no += buf[counted_to:line_start].count(newline)
+                    counted_to = line_start
+                    if not text:
+                        line = line.decode("utf-8", errors="replace")
+                    results.append(f"{file_path}:{line_no}:{line}")
+                return results
+    except (OSError, ValueError):
+        return []
+
 
 class SearchTool(BaseTool):
     """Tool for searching files and content."""
@@ -15,6 +153,14 @@ class SearchTool(BaseTool):
     name = "search"
     description = "Search for files and content using glob and grep"
 
+    def __init__(self):
+        # The Python grep fallback walks and reads files; keep that off the event loop
+        self._executor = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+    async def close(self) -> None:
+        """Shut down the file-scanning thread pool."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     async def execute(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
         """Execute a search operation."""
         if operation == "glob":
@@ -34,22 +180,11 @@ class SearchTool(BaseTool):
             if not base_path.exists():
                 return {"error": f"Path not found: {path}"}
 
-            matches: List[str] = []
-
-            # Handle patterns without **
-            if "**" not in pattern:
-                # Search anywhere in the path
-                for root, dirs, files in os.walk(base_path):
-                    for name in files + dirs:
-                        if fnmatch.fnmatch(name, pattern):
-                            matches.append(os.path.join(root, name))
-            else:
-                # Use pathlib glob for ** patterns
-                for match in base_path.glob(pattern):
-                    matches.append(str(match))
-
-            # Sort and limit results
-            matches = sorted(matches)[:1000]
+            # Walk off the event loop; results come back sorted and limited
+            loop = asyncio.get_running_loop()
+            matches = await loop.run_in_executor(
+                self._executor, _glob_paths, str(base_path), pattern
+            )
 
             return {
                 "pattern": pattern,
@@ -86,6 +221,9 @@ class SearchTool(BaseTool):
                 cmd.append("-c")
             else:
                 cmd.append("-n")  # Show line numbers for content mode
+                if head_limit:
+                    # No file can contribute more than head_limit lines anyway
+                    cmd.extend(["-m", str(head_limit)])
                 if context_before > 0:
                     cmd.extend(["-B", str(context_before)])
                 if context_after > 0:
@@ -100,22 +238,38 @@ class SearchTool(BaseTool):
             process = await asyncio.create_subprocess_exec(
                 *cmd,
                 stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
+                # stderr is never reported, so don't let it fill a pipe
+                stderr=asyncio.subprocess.DEVNULL,
             )
 
-            stdout, stderr = await process.communicate()
-            output = stdout.decode("utf-8", errors="replace")
+            # Stream stdout and stop rg as soon as head_limit lines are in
+            chunks: List[bytes] = []
+            newlines = 0
+            truncated = False
+            while chunk := await process.stdout.read(RG_READ_CHUNK_SIZE):
+                chunks.append(chunk)
+                newlines += chunk.count(b"\n")
+                if head_limit and newlines >= head_limit:
+                    truncated = True
+                    try:
+                        process.terminate()
+                    except ProcessLookupError:
+                        pass
+                    break
+            await process.wait()
 
-            # Apply head limit
+            output = b"".join(chunks)
+
+            # Apply head limit on the raw bytes, then decode only what is kept
             if head_limit:
-                lines = output.split("\n")
-                output = "\n".join(lines[:head_limit])
+                output = b"\n".join(output.split(b"\n", head_limit)[:head_limit])
 
             return {
                 "pattern": pattern,
                 "path": path,
-                "output": output,
-                "return_code": process.returncode,
+                "output": output.decode("utf-8", errors="replace"),
+                # rg had matches when we cut it off; don't report the signal
+                "return_code": 0 if truncated else process.returncode,
             }
         except FileNotFoundError:
             # Fallback to Python-based grep if ripgrep not available
@@ -135,36 +289,32 @@ class SearchTool(BaseTool):
     ) -> Dict[str, Any]:
         """Fallback Python-based grep implementation."""
         try:
-            flags = re.IGNORECASE if case_insensitive else 0
-            regex = re.compile(pattern, flags)
+            # Bytes pattern so files are searched in place; MULTILINE keeps ^/$ per line.
+            # Case folding, non-ASCII literals and Unicode classes need the str pattern.
+            flags = re.MULTILINE | (re.IGNORECASE if case_insensitive else 0)
+            if _needs_text_regex(pattern, case_insensitive):
+                regex = re.compile(pattern, flags)
+            else:
+                regex = re.compile(pattern.encode("utf-8"), flags)
 
-            base_path = Path(path)
-            results: List[str] = []
+            loop = asyncio.get_running_loop()
+            files = await loop.run_in_executor(
+                self._executor, _candidate_files, path, glob_pattern
+            )
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_FILE_SCANS)
 
-            if base_path.is_file():
-                files = [base_path]
-            else:
-                if glob_pattern:
-                    files = list(base_path.glob(glob_pattern))
-                else:
-                    files = [f for f in base_path.rglob("*") if f.is_file()]
-
-            for file_path in files:
-                try:
-                    with open(file_path, "r", encoding="utf-8") as f:
-                        content = f.read()
-                        if regex.search(content):
-                            if output_mode == "files_with_matches":
-                                results.append(str(file_path))
-                            elif output_mode == "count":
-                                count = len(regex.findall(content))
-                                results.append(f"{file_path}:{count}")
-                            else:
-                                for i, line in enumerate(content.split("\n"), 1):
-                                    if regex.search(line):
-                                        results.append(f"{file_path}:{i}:{line}")
-                except (UnicodeDecodeError, PermissionError):
-                    continue
+            async def scan(file_path: str) -> List[str]:
+                async with semaphore:
+                    return await loop.run_in_executor(
+                        self._executor, _scan_file, file_path, regex, output_mode
+                    )
+
+            # gather keeps results in file order
+            results = [
+                line
+                for lines in await asyncio.gather(*(scan(file_path) for file_path in files))
+                for line in lines
+            ]
 
             return {
                 "pattern": pattern,
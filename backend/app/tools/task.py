@@ -1,9 +1,13 @@
 """Task management tool (todos)."""
 
+from collections import OrderedDict
 from typing import Any, Dict, List, Optional
 from app.tools.base import BaseTool
 from app.models.session import Todo, TodoStatus
 
+# Sessions whose todo lists are kept; the least recently used is dropped first
+MAX_TODO_SESSIONS = 1024
+
 
 class TaskTool(BaseTool):
     """Tool for task/todo management."""
@@ -12,7 +16,11 @@ class TaskTool(BaseTool):
     description = "Manage todos and tasks"
 
     def __init__(self):
-        self.todos: Dict[str, List[Todo]] = {}  # session_id -> todos
+        self.todos: OrderedDict[str, List[Todo]] = OrderedDict()  # session_id -> todos
+        # session_id -> {todo id: todo}, alongside the ordered list
+        self._todo_index: Dict[str, Dict[str, Todo]] = {}
+        # session_id -> get_todos response, rebuilt after the list changes
+        self._listings: Dict[str, Dict[str, Any]] = {}
 
     async def execute(
         self, operation: str, session_id: str, **kwargs: Any
@@ -41,6 +49,14 @@ class TaskTool(BaseTool):
                 new_todos.append(todo)
 
             self.todos[session_id] = new_todos
+            # Built back to front so the first todo wins if ids repeat, as a scan would
+            self._todo_index[session_id] = {t.id: t for t in reversed(new_todos)}
+            self._listings.pop(session_id, None)
+            self.todos.move_to_end(session_id)
+            if len(self.todos) > MAX_TODO_SESSIONS:
+                evicted, _ = self.todos.popitem(last=False)
+                self._todo_index.pop(evicted, None)
+                self._listings.pop(evicted, None)
 
             return {
                 "success": True,
@@ -56,18 +72,25 @@ class TaskTool(BaseTool):
     async def get_todos(self, session_id: str) -> Dict[str, Any]:
         """Get the current todo list."""
         todos = self.todos.get(session_id, [])
-        return {
-            "todos": [
-                {
-                    "id": t.id,
-                    "content": t.content,
-                    "status": t.status.value,
-                    "created_at": t.created_at.isoformat(),
-                }
-                for t in todos
-            ],
-            "count": len(todos),
-        }
+        if not todos:
+            return {"todos": [], "count": 0}
+        self.todos.move_to_end(session_id)
+
+        listing = self._listings.get(session_id)
+        if listing is None:
+            listing = self._listings[session_id] = {
+                "todos": [
+                    {
+                        "id": t.id,
+                        "content": t.content,
+                        "status": t.status.value,
+                        "created_at": t.created_at.isoformat(),
+                    }
+                    for t in todos
+                ],
+                "count": len(todos),
+            }
+        return listing
 
     async def update_todo(
         self,
@@ -78,21 +101,21 @@ class TaskTool(BaseTool):
         **kwargs: Any,
     ) -> Dict[str, Any]:
         """Update a specific todo."""
-        todos = self.todos.get(session_id, [])
-
-        for todo in todos:
-            if todo.id == todo_id:
-                if status:
-                    todo.status = TodoStatus(status)
-                if content:
-                    todo.content = content
-                return {
-                    "success": True,
-                    "todo": {
-                        "id": todo.id,
-                        "content": todo.content,
-                        "status": todo.status.value,
-                    },
-                }
+        todo = self._todo_index.get(session_id, {}).get(todo_id)
+        if todo is None:
+            return {"error": f"Todo not found: {todo_id}"}
+        self.todos.move_to_end(session_id)
 
-        return {"error": f"Todo not found: {todo_id}"}
+        if status:
+            todo.status = TodoStatus(status)
+        if content:
+            todo.content = content
+        self._listings.pop(session_id, None)
+        return {
+            "success": True,
+            "todo": {
+                "id": todo.id,
+                "content": todo.content,
+                "status": todo.status.value,
+            },
+        }
@@ -1,10 +1,28 @@
 """Thinking tool for reasoning and reflection."""
 
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+import time
+from collections import OrderedDict, deque
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Deque, Dict, Optional
 
 from app.tools.base import BaseTool
 
+# Thoughts kept per session; the oldest are dropped first
+MAX_THOUGHTS_PER_SESSION = 10000
+# Sessions with thought logs kept; the least recently used is dropped first
+MAX_THOUGHT_SESSIONS = 256
+
+
+def _render_thought(entry: Dict[str, Any]) -> Dict[str, Any]:
+    """Turn a stored thought into its response form, formatting the timestamp."""
+    return {
+        "id": entry["id"],
+        "thought": entry["thought"],
+        "category": entry["category"],
+        "timestamp": datetime.fromtimestamp(entry["ts_ns"] / 1e9, timezone.utc).isoformat(),
+    }
+
 
 class ThinkingTool(BaseTool):
     """Tool for recording thoughts and reasoning."""
@@ -13,7 +31,7 @@ class ThinkingTool(BaseTool):
     description = "Record thoughts, reasoning, and reflections during task execution"
 
     def __init__(self):
-        self.thought_logs: Dict[str, List[Dict[str, Any]]] = {}
+        self.thought_logs: OrderedDict[str, Deque[Dict[str, Any]]] = OrderedDict()
 
     async def execute(
         self,
@@ -26,17 +44,24 @@ class ThinkingTool(BaseTool):
         try:
             session_key = session_id or "default"
 
-            if session_key not in self.thought_logs:
-                self.thought_logs[session_key] = []
+            log = self.thought_logs.get(session_key)
+            if log is None:
+                log = self.thought_logs[session_key] = deque(maxlen=MAX_THOUGHTS_PER_SESSION)
+                if len(self.thought_logs) > MAX_THOUGHT_SESSIONS:
+                    self.thought_logs.popitem(last=False)
+            else:
+                self.thought_logs.move_to_end(session_key)
 
             thought_entry = {
-                "id": len(self.thought_logs[session_key]) + 1,
+                # Follows the newest entry, so ids stay unique once old ones are dropped
+                "id": log[-1]["id"] + 1 if log else 1,
                 "thought": thought,
                 "category": category or "general",
-                "timestamp": datetime.utcnow().isoformat(),
+                # Formatted only when read back; most thoughts never are
+                "ts_ns": time.time_ns(),
             }
 
-            self.thought_logs[session_key].append(thought_entry)
+            log.append(thought_entry)
 
             return {
                 "success": True,
@@ -57,15 +82,23 @@ class ThinkingTool(BaseTool):
         """Get recorded thoughts."""
         try:
             session_key = session_id or "default"
-            thoughts = self.thought_logs.get(session_key, [])
+            log = self.thought_logs.get(session_key, ())
+            if log:
+                self.thought_logs.move_to_end(session_key)
 
             if category:
-                thoughts = [t for t in thoughts if t["category"] == category]
+                thoughts = [t for t in log if t["category"] == category]
+                total_count = len(thoughts)
+                thoughts = thoughts[-limit:]
+            else:
+                total_count = len(log)
+                # Only the newest `limit` entries are copied
+                thoughts = list(islice(reversed(log), limit))[::-1] if limit > 0 else list(log)
 
             return {
                 "success": True,
-                "thoughts": thoughts[-limit:],
-                "total_count": len(thoughts),
+                "thoughts": [_render_thought(t) for t in thoughts],
+                "total_count": total_count,
             }
         except Exception as e:
             return {"error": str(e)}
@@ -78,8 +111,7 @@ class ThinkingTool(BaseTool):
         """Clear recorded thoughts."""
         try:
             session_key = session_id or "default"
-            count = len(self.thought_logs.get(session_key, []))
-            self.thought_logs[session_key] = []
+            count = len(self.thought_logs.pop(session_key, ()))
 
             return {
                 "success": True,
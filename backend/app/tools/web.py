@@ -1,10 +1,62 @@
 """Web search and content fetching tools."""
 
 import asyncio
-from typing import Any, Dict, List
+import re
+import time
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, List, Tuple
 import httpx
 from app.tools.base import BaseTool
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# DuckDuckGo HTML result links: (href, title)
+_RESULT_RE = re.compile(r'<a rel="nofollow" class="result__a" href="([^"]+)"[^>]*>([^<]+)</a>')
+# Script and style elements, removed with their contents in one pass
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# Characters of page content returned per URL
+MAX_CONTENT_CHARS = 10000
+# Raw HTML read per page: plenty to yield MAX_CONTENT_CHARS of text, but
+# multi-megabyte pages are not downloaded in full
+MAX_HTML_BYTES = 1024 * 1024
+# Raw JSON read per page; MAX_CONTENT_CHARS can't need more than 4 bytes each
+MAX_JSON_BYTES = MAX_CONTENT_CHARS * 4
+
+# Page fetches in flight across all get_contents calls, kept under the pool size
+MAX_CONCURRENT_FETCHES = 20
+# Page fetches in flight to a single host within one get_contents call
+MAX_FETCHES_PER_HOST = 4
+
+# Parsed search results kept per query, so retries don't go back to DuckDuckGo
+SEARCH_CACHE_MAX_ENTRIES = 128
+SEARCH_CACHE_TTL_SECONDS = 300.0
+
+
+def _parse_results(html: str) -> List[Tuple[str, str]]:
+    """Extract (url, title) pairs from a DuckDuckGo HTML results page."""
+    if LexborHTMLParser is None:
+        return _RESULT_RE.findall(html)
+    return [
+        (node.attributes.get("href") or "", node.text())
+        for node in LexborHTMLParser(html).css("a.result__a")
+    ]
+
+
+async def _read_text(response: httpx.Response, limit: int) -> str:
+    """Read at most limit bytes of a streamed response body and decode them."""
+    buffer = bytearray()
+    async for chunk in response.aiter_bytes():
+        buffer += chunk
+        if len(buffer) >= limit:
+            break
+    return buffer[:limit].decode(response.encoding or "utf-8", errors="replace")
+
 
 class WebTool(BaseTool):
     """Tool for web search and content fetching."""
@@ -13,13 +65,23 @@ class WebTool(BaseTool):
     description = "Search the web and fetch content"
 
     def __init__(self):
+        # HTTP/2 multiplexes fetches to the same host over one kept-alive connection
         self.client = httpx.AsyncClient(
-            timeout=30.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=50, max_connections=100, keepalive_expiry=30.0
+            ),
+            timeout=httpx.Timeout(30.0, connect=5.0),
             follow_redirects=True,
             headers={
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
             },
         )
+        self._fetch_semaphore = asyncio.Semaphore(MAX_CONCURRENT_FETCHES)
+        # query -> (expires_at, [(url, title), ...])
+        self._search_cache: OrderedDict[str, Tuple[float, List[Tuple[str, str]]]] = (
+            OrderedDict()
+        )
 
     async def execute(self, operation: str, **kwargs: Any) -> Dict[str, Any]:
         """Execute a web operation."""
@@ -36,26 +98,40 @@ class WebTool(BaseTool):
         num_results: int = 5,
         **kwargs: Any,
     ) -> Dict[str, Any]:
-        """Search the web using DuckDuckGo."""
+        """Search the web using DuckDuckGo.
+
+        Successful searches are cached for SEARCH_CACHE_TTL_SECONDS.
+        """
         try:
-            # Use DuckDuckGo HTML search
-            url = "https://html.duckduckgo.com/html/"
-            data = {"q": query}
+            now = time.monotonic()
+            cached = self._search_cache.get(query)
+            if cached is not None and cached[0] > now:
+                self._search_cache.move_to_end(query)
+                matches = cached[1]
+            else:
+                # Use DuckDuckGo HTML search
+                url = "https://html.duckduckgo.com/html/"
+                data = {"q": query}
+
+                response = await self.client.post(url, data=data)
+                response.raise_for_status()
 
-            response = await self.client.post(url, data=data)
-            response.raise_for_status()
+                # Parse results (simplified)
+                html = response.text
 
-            # Parse results (simplified)
-            html = response.text
-            results = []
+                # Extract result links and titles; parsing a full results page is CPU
+                # work, so it runs in a thread and other fetches keep going meanwhile
+                matches = await asyncio.to_thread(_parse_results, html)
 
-            # Extract result links and titles (basic parsing)
-            import re
-
-            # Find result blocks
-            result_pattern = r'<a rel="nofollow" class="result__a" href="([^"]+)"[^>]*>([^<]+)</a>'
-            matches = re.findall(result_pattern, html)
+                # An empty page is more likely a block or markup change than a real
+                # answer, so it is not cached
+                if matches:
+                    self._search_cache[query] = (now + SEARCH_CACHE_TTL_SECONDS, matches)
+                    self._search_cache.move_to_end(query)
+                    if len(self._search_cache) > SEARCH_CACHE_MAX_ENTRIES:
+                        self._search_cache.popitem(last=False)
 
+            results = []
             for i, (link, title) in enumerate(matches[:num_results]):
                 results.append(
                     {
@@ -78,38 +154,50 @@ class WebTool(BaseTool):
     ) -> Dict[str, Any]:
         """Fetch content from URLs."""
         results = []
+        host_semaphores: Dict[str, asyncio.Semaphore] = defaultdict(
+            lambda: asyncio.Semaphore(MAX_FETCHES_PER_HOST)
+        )
 
         async def fetch_url(url: str) -> Dict[str, Any]:
             try:
-                response = await self.client.get(url)
-                response.raise_for_status()
-
-                content_type = response.headers.get("content-type", "")
-
-                if "text/html" in content_type:
-                    # Extract text from HTML
-                    html = response.text
-                    text = self._extract_text(html)
-                    return {
-                        "url": url,
-                        "success": True,
-                        "content": text[:10000],  # Limit content
-                        "content_type": content_type,
-                    }
-                elif "application/json" in content_type:
-                    return {
-                        "url": url,
-                        "success": True,
-                        "content": response.text[:10000],
-                        "content_type": content_type,
-                    }
-                else:
-                    return {
-                        "url": url,
-                        "success": True,
-                        "content": f"Binary content ({content_type})",
-                        "content_type": content_type,
-                    }
+                host = httpx.URL(url).host
+                # Streamed so only the part of the body we return is downloaded. The host
+                # slot is taken first so a global slot is only held while a request runs.
+                async with (
+                    host_semaphores[host],
+                    self._fetch_semaphore,
+                    self.client.stream("GET", url) as response,
+                ):
+                    response.raise_for_status()
+
+                    content_type = response.headers.get("content-type", "")
+
+                    if "text/html" in content_type:
+                        # Extract text from HTML
+                        html = await _read_text(response, MAX_HTML_BYTES)
+                        text = await asyncio.to_thread(self._extract_text, html)
+                        return {
+                            "url": url,
+                            "success": True,
+                            "content": text[:MAX_CONTENT_CHARS],  # Limit content
+                            "content_type": content_type,
+                        }
+                    elif "application/json" in content_type:
+                        text = await _read_text(response, MAX_JSON_BYTES)
+                        return {
+                            "url": url,
+                            "success": True,
+                            "content": text[:MAX_CONTENT_CHARS],
+                            "content_type": content_type,
+                        }
+                    else:
+                        # The body is never read
+                        return {
+                            "url": url,
+                            "success": True,
+                            "content": f"Binary content ({content_type})",
+                            "content_type": content_type,
+                        }
             except Exception as e:
                 return {"url": url, "success": False, "error": str(e)}
 
@@ -121,20 +209,18 @@ class WebTool(BaseTool):
 
     def _extract_text(self, html: str) -> str:
         """Extract text from HTML."""
-        import re
-
-        # Remove script and style elements
-        html = re.sub(r"<script[^>]*>.*?</script>", "", html, flags=re.DOTALL)
-        html = re.sub(r"<style[^>]*>.*?</style>", "", html, flags=re.DOTALL)
-
-        # Remove HTML tags
-        text = re.sub(r"<[^>]+>", " ", html)
+        if LexborHTMLParser is not None:
+            # One C parse; drop script and style nodes and read the text nodes
+            tree = LexborHTMLParser(html)
+            for node in tree.css("script, style"):
+                node.decompose()
+            text = tree.root.text(separator=" ") if tree.root else ""
+        else:
+            # Remove script and style elements, then the remaining tags
+            text = _TAG_RE.sub(" ", _SCRIPT_STYLE_RE.sub("", html))
 
         # Clean up whitespace
-        text = re.sub(r"\s+", " ", text)
-        text = text.strip()
-
-        return text
+        return _WHITESPACE_RE.sub(" ", text).strip()
 
     async def close(self) -> None:
         """Close the HTTP client."""